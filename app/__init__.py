@@ -58,6 +58,9 @@ def create_app():
     app.register_blueprint(auth)
     app.register_blueprint(admin)
 
+    from app.cli import data_cli
+    app.cli.add_command(data_cli)
+
     @app.context_processor
     def inject_auth_state():
         account = current_account()
@@ -0,0 +1,34 @@
+# app/cli.py
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+data_cli = AppGroup("data", help="Release data commands.")
+
+
+@data_cli.command("compile")
+@click.option("--source", "source_path", help="Release weeds.db. Defaults to the release the app is serving.")
+@click.option("--geojson-dir", help="Release GeoJSON directory. Defaults to the app's GEOJSON_DIR.")
+@click.option(
+    "--output",
+    "output_path",
+    help="Serving database to write. Defaults to the installed path under DATA_CACHE_DIR the app reads from.",
+)
+@click.option("--force", is_flag=True, help="Rebuild even if the output is current.")
+def compile_command(source_path, geojson_dir, output_path, force):
+    """Compile the serving database for a release."""
+    data_manager = current_app.extensions["data_manager"]
+    try:
+        output_path, rebuilt = data_manager.compile_release(
+            source_path=source_path,
+            geojson_dir=geojson_dir,
+            output_path=output_path,
+            force=force,
+        )
+    except Exception as exc:
+        raise click.ClickException(f"Compile failed: {exc}") from exc
+
+    if rebuilt:
+        click.echo(f"Compiled serving database at {output_path}")
+    else:
+        click.echo(f"Serving database at {output_path} is already current")
@@ -35,6 +35,15 @@ class Config:
    RECAPTCHA_SITE_KEY = os.environ.get('RECAPTCHA_SITE_KEY')
    RECAPTCHA_SECRET_KEY = os.environ.get('RECAPTCHA_SECRET_KEY')
 
+   # Per-IP rate limits (Flask-Limiter). Off only for local load tests, which
+   # send everything from one address.
+   RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', '1').strip().lower() in {
+      '1',
+      'true',
+      'yes',
+      'on',
+   }
+
    # Site configuration
    SITE_NAME = "Regulated Plants Database"
    SITE_AUTHOR = "Regulated Plants Database Team"
@@ -103,12 +112,64 @@ class Config:
 
    # Data service configuration
    DATA_MODE = os.getenv('DATA_MODE', 'local_sample')
+   # file (default) reads the release database from disk; memory copies it into a
+   # shared in-memory SQLite database in each worker when the release is applied.
+   DATA_SERVING_MODE = os.getenv('DATA_SERVING_MODE', 'file')
    DATA_REMOTE_BASE_URL = os.getenv('DATA_REMOTE_BASE_URL')
    DATA_REMOTE_TOKEN = os.getenv('DATA_REMOTE_TOKEN')
    DATA_MANIFEST_PATH = os.getenv('DATA_MANIFEST_PATH', '/manifest.json')
    DATA_MANIFEST_TTL_SECONDS = int(os.getenv('DATA_MANIFEST_TTL_SECONDS', '0'))
    DATA_CACHE_DIR = os.getenv('DATA_CACHE_DIR', 'data_cache')
    DATA_REMOTE_TIMEOUT_SECONDS = int(os.getenv('DATA_REMOTE_TIMEOUT_SECONDS', '90'))
+   # Build an installed copy of each release (precomputed tables, indexes) under
+   # DATA_CACHE_DIR/installed and serve from it. The release file itself is untouched.
+   DATA_INSTALL_ENABLED = os.getenv('DATA_INSTALL_ENABLED', '1').strip().lower() in {
+      '1',
+      'true',
+      'yes',
+      'on',
+   }
+   # Upper bound on geo_region_ids per /api/regions call.
+   REGION_BATCH_MAX_IDS = int(os.getenv('REGION_BATCH_MAX_IDS', '1000'))
+   # The same bound for callers who are not signed in.
+   REGION_BATCH_MAX_IDS_ANONYMOUS = int(os.getenv('REGION_BATCH_MAX_IDS_ANONYMOUS', '100'))
+   # Largest page a signed-in /api/region?limit=&cursor= request may ask for.
+   REGION_PAGE_MAX_LIMIT = int(os.getenv('REGION_PAGE_MAX_LIMIT', '500'))
+   # Open release databases with SQLite's immutable=1 (no locking or change checks).
+   # Releases are swapped in as new files, never edited in place; turn off only when
+   # editing DATABASE_PATH by hand while the app runs.
+   DATABASE_IMMUTABLE = os.getenv('DATABASE_IMMUTABLE', '1').strip().lower() in {
+      '1',
+      'true',
+      'yes',
+      'on',
+   }
+   # SQLite serving profile applied to every release connection.
+   SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', '268435456'))
+   # Negative values are KiB (SQLite convention): -65536 is a 64 MiB page cache.
+   SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))
+   SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'memory')
+   SQLITE_QUERY_ONLY = os.getenv('SQLITE_QUERY_ONLY', '1').strip().lower() in {
+      '1',
+      'true',
+      'yes',
+      'on',
+   }
+   # Answer species and region-detail lookups from an in-process regulation matrix
+   # built once per release (SQL stays the fallback).
+   REGULATION_MATRIX_ENABLED = os.getenv('REGULATION_MATRIX_ENABLED', '1').strip().lower() in {
+      '1',
+      'true',
+      'yes',
+      'on',
+   }
+   # Species search: trigram (in-process index built once per release), fts5 (the
+   # installed copy's species_search_fts; word-prefix matching with diacritics
+   # folded, bm25 within each priority tier) or like (LIKE scan of plants; also
+   # the fallback for queries containing % or _ and releases without an index).
+   SPECIES_SEARCH_BACKEND = os.getenv('SPECIES_SEARCH_BACKEND', 'trigram').strip().lower()
+   # Largest page /species/api/suggest?limit= may ask for.
+   SPECIES_SUGGEST_MAX_LIMIT = int(os.getenv('SPECIES_SUGGEST_MAX_LIMIT', '20'))
    LOCAL_SAMPLE_DB_PATH = os.getenv(
       'LOCAL_SAMPLE_DB_PATH',
       os.path.join('app', 'static', 'data', 'sample', 'weeds_sample.db')
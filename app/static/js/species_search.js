@@ -19,11 +19,12 @@ document.addEventListener('DOMContentLoaded', function () {
     /******************************
      * SELECT2 SEARCH
      ******************************/
+    // Suggestions carry names only; the full row is loaded once one is picked.
     $('#weedSearch').select2({
         placeholder: 'Start typing a common or scientific name...',
         minimumInputLength: 2,
         ajax: {
-            url: '/species/api/search',
+            url: '/species/api/suggest',
             dataType: 'json',
             delay: 250,
             data: function (params) {
@@ -31,27 +32,24 @@ document.addEventListener('DOMContentLoaded', function () {
             },
             processResults: function (data) {
                 return {
-                    results: data.map(weed => {
-                        let displayCommonName = getPrimaryCommonName(weed.common_name);
+                    results: data.map(suggestion => {
+                        let displayCommonName = getPrimaryCommonName(suggestion.common_name);
                         if (!displayCommonName || displayCommonName.includes('No English common names available')) {
                             displayCommonName = null;
                         }
 
                         return {
-                            id: weed.species_id || weed.usage_key,
+                            // Search rows stand in while the suggest index warms
+                            // and on releases without species_id (the sample).
+                            id: suggestion.species_id || suggestion.usage_key,
                             text: displayCommonName
-                                ? `${displayCommonName} (${weed.canonical_name})`
-                                : `(${weed.canonical_name})`,
-                            common_name: displayCommonName || weed.canonical_name,
-                            canonical_name: weed.canonical_name,
-                            family_name: weed.family_name,
-                            synonyms: weed.synonyms,
-                            species_id: weed.species_id,
-                            usage_key: weed.usage_key,
-                            lifeform_final: weed.lifeform_final,
-                            lifespan_final: weed.lifespan_final,
-                            habitat_final: weed.habitat_final,
-                            woodiness_final: weed.woodiness_final
+                                ? `${displayCommonName} (${suggestion.canonical_name})`
+                                : `(${suggestion.canonical_name})`,
+                            common_name: displayCommonName || suggestion.canonical_name,
+                            canonical_name: suggestion.canonical_name,
+                            matched_name: suggestion.matched_name,
+                            species_id: suggestion.species_id,
+                            row: suggestion
                         };
                     })
                 };
@@ -79,13 +77,29 @@ document.addEventListener('DOMContentLoaded', function () {
                 .text(commonName ? canonicalName : `(${canonicalName})`)
                 .appendTo(container);
 
+            // A synonym or secondary common name matched: show which one.
+            const matchedName = String(weed.matched_name || '').trim();
+            const shownNames = [commonName, canonicalName].map(name => name.toLowerCase());
+            if (matchedName && !shownNames.includes(matchedName.toLowerCase())) {
+                $('<div>')
+                    .addClass('matched-name text-muted small')
+                    .text(`Also known as ${matchedName}`)
+                    .appendTo(container);
+            }
+
             return container;
         }
     });
 
     $('#weedSearch').on('select2:select', function (e) {
-        const selectedWeed = e.params.data;
-        displayWeedDetails(selectedWeed);
+        const picked = e.params.data;
+        if (picked.species_id) {
+            loadWeedDetails(picked.species_id);
+        } else {
+            // No species_id to look up: the search row already has the details.
+            detailsRequestToken++;
+            displayWeedDetails(formatWeed(picked.row));
+        }
     });
 
     $('#weedSearch').on('select2:clear', function () {
@@ -321,7 +335,7 @@ document.addEventListener('DOMContentLoaded', function () {
         renderGallery(selectedWeed.usage_key, selectedWeed.canonical_name);
 
         // Fetch regulation jurisdictions by stable species_id. GBIF is not unique.
-        const speciesLookupId = selectedWeed.species_id || selectedWeed.id;
+        const speciesLookupId = selectedWeed.species_id;
         const statesUrl = speciesLookupId
             ? `/species/api/weed-states/by-species-id/${encodeURIComponent(speciesLookupId)}`
             : `/species/api/weed-states/by-key/${selectedWeed.usage_key}`;
@@ -423,15 +437,13 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     }
 
-    function selectAndDisplayWeed(weedData) {
-        if (!weedData) return;
-
+    function formatWeed(weedData) {
         let displayCommonName = getPrimaryCommonName(weedData.common_name);
         if (!displayCommonName || displayCommonName.includes('No English common names available')) {
             displayCommonName = null;
         }
 
-        const formattedData = {
+        return {
             id: weedData.species_id || weedData.usage_key,
             text: displayCommonName
                 ? `${displayCommonName} (${weedData.canonical_name})`
@@ -447,13 +459,40 @@ document.addEventListener('DOMContentLoaded', function () {
             habitat_final: weedData.habitat_final,
             woodiness_final: weedData.woodiness_final
         };
+    }
+
+    function selectAndDisplayWeed(weedData) {
+        if (!weedData) return;
 
+        const formattedData = formatWeed(weedData);
         const newOption = new Option(formattedData.text, formattedData.id, true, true);
         $('#weedSearch').append(newOption).trigger('change');
 
         displayWeedDetails(formattedData);
     }
 
+    // Guards against the row of an earlier pick landing after a later one.
+    let detailsRequestToken = 0;
+
+    function loadWeedDetails(speciesId) {
+        if (!speciesId) return;
+
+        const token = ++detailsRequestToken;
+
+        fetch(`/species/api/by-species-id/${encodeURIComponent(speciesId)}`)
+            .then(response => {
+                if (!response.ok) throw new Error('Network response was not ok');
+                return response.json();
+            })
+            .then(weedData => {
+                if (token !== detailsRequestToken) return;
+                displayWeedDetails(formatWeed(weedData));
+            })
+            .catch(error => {
+                console.error('Error fetching plant data:', error);
+            });
+    }
+
     /******************************
      * AUTOLOAD BY URL ?species_id= or ?name=
      ******************************/
@@ -2,12 +2,22 @@ import hashlib
 import json
 import os
 import socket
+import sqlite3
+import subprocess
+import sys
 import threading
 import time
 import uuid
 import urllib.error
 import urllib.parse
 import urllib.request
+from pathlib import Path
+
+from app.utils.database_base import DatabaseBase, serving_profile
+from app.utils.regulation_matrix import SharedRegulationMatrix
+from app.utils.release_install import install_release, installed_is_current
+from app.utils.species_search_index import SharedSpeciesSearchIndex
+from app.utils.species_suggest_index import SharedSpeciesSuggestIndex
 
 
 class DataManager:
@@ -21,6 +31,8 @@ class DataManager:
         cache_dir: str,
         manifest_ttl_seconds: int = 3600,
         remote_timeout_seconds: int = 90,
+        install_enabled: bool = True,
+        serving_mode: str = "file",
     ):
         self.app = app
         self.mode = (mode or "local_sample").strip()
@@ -30,10 +42,17 @@ class DataManager:
         self.cache_dir = cache_dir or "data_cache"
         self.manifest_ttl_seconds = max(0, int(manifest_ttl_seconds or 0))
         self.remote_timeout_seconds = max(1, int(remote_timeout_seconds or 0))
+        self.install_enabled = bool(install_enabled)
+        self.serving_mode = (serving_mode or "file").strip().lower()
+        # Keeps the shared in-memory release copy alive (DATA_SERVING_MODE=memory).
+        self.memory_connection = None
+        self.memory_source_path = None
         self.last_checked = 0.0
         self.current_version = None
         self.lock = threading.Lock()
         self.refresh_in_progress = False
+        # (data_paths, manifest, pid) of the release whose install runs in the background.
+        self.pending_install = None
 
     @classmethod
     def from_app(cls, app):
@@ -46,11 +65,13 @@ class DataManager:
             cache_dir=app.config.get("DATA_CACHE_DIR", "data_cache"),
             manifest_ttl_seconds=app.config.get("DATA_MANIFEST_TTL_SECONDS", 3600),
             remote_timeout_seconds=app.config.get("DATA_REMOTE_TIMEOUT_SECONDS", 90),
+            install_enabled=app.config.get("DATA_INSTALL_ENABLED", True),
+            serving_mode=app.config.get("DATA_SERVING_MODE", "file"),
         )
 
     def ensure_ready(self, force: bool = False):
         if self.mode != "remote_production":
-            data_paths = self._local_paths()
+            data_paths = self._install_release(self._local_paths())
             self._apply_data_paths(data_paths, version="local_sample")
             return data_paths
 
@@ -66,7 +87,7 @@ class DataManager:
         if cache_ready:
             local_manifest = self._read_json(cache_paths["manifest"])
             version = self._manifest_version(local_manifest) or "cached"
-            data_paths = self._paths_from_cache(cache_paths)
+            data_paths = self._install_release(self._paths_from_cache(cache_paths))
             with self.lock:
                 self._apply_data_paths(data_paths, version=version, changed=False, manifest=local_manifest)
             if force or not self._within_ttl():
@@ -82,6 +103,12 @@ class DataManager:
         return data_paths
 
     def maybe_refresh(self):
+        pending = self.pending_install
+        if pending is not None and pending[2] != os.getpid():
+            # Started in a parent that forked (gunicorn --preload): the install
+            # thread did not survive the fork. If the parent finished the copy,
+            # the new thread finds it current and only switches over.
+            self._resume_install()
         if self.mode != "remote_production" or self.manifest_ttl_seconds <= 0:
             return
         if self._within_ttl():
@@ -174,7 +201,23 @@ class DataManager:
     def _apply_data_paths(self, data_paths: dict, version: str = None, changed: bool = False, manifest: dict = None):
         if not data_paths:
             return
+        swapped = (
+            changed
+            or version != self.current_version
+            or data_paths["database_path"] != self.app.config.get("DATABASE_PATH")
+        )
+        # Whatever is applied now supersedes an install still running for an
+        # earlier apply; this one's own install starts once it is applied.
+        self.pending_install = None
+        previous_memory_connection = None
+        if self.serving_mode == "memory" and (swapped or self.memory_source_path != data_paths["database_path"]):
+            previous_memory_connection = self.memory_connection
+            self._load_into_memory(data_paths["database_path"])
+
         self.app.config["DATABASE_PATH"] = data_paths["database_path"]
+        self.app.config["DATA_SOURCE_DATABASE_PATH"] = (
+            data_paths.get("source_database_path") or data_paths["database_path"]
+        )
         self.app.config["REGULATORY_SOURCES_PATH"] = data_paths.get("regulatory_sources_path")
         self.app.config["GEOJSON_DIR"] = data_paths["geojson_dir"]
         self.app.config["GEOJSON_URL_PATH"] = data_paths.get("geojson_url_path", "/data/geojson/")
@@ -195,11 +238,111 @@ class DataManager:
         else:
             self.app.config.pop("DATA_RELEASE_HISTORY", None)
 
-        if changed or version != self.current_version:
-            self.app.extensions.pop("state_db", None)
-            self.app.extensions.pop("species_db", None)
+        if swapped or previous_memory_connection is not None:
+            self._replace_release_instances(data_paths["database_path"], previous_memory_connection)
 
         self.current_version = version
+        if data_paths.get("install_pending"):
+            self._start_install(data_paths, manifest)
+
+    def _replace_release_instances(self, database_path: str, previous_memory_connection=None):
+        # Shared per-release structures are replaced before the database
+        # instances: an instance created in between must not be bound to the
+        # previous release's structures.
+        self._publish_release_structures(database_path)
+        for key in ("state_db", "species_db"):
+            db = self.app.extensions.pop(key, None)
+            if db is not None:
+                db.close_connections()
+        if previous_memory_connection is not None:
+            # The old copy is freed once the last request still reading it finishes.
+            previous_memory_connection.close()
+        self._report_serving_profile(database_path)
+
+    def _publish_release_structures(self, database_path: str):
+        """
+        Install fresh shared structures for the release just applied: the
+        regulation matrix and the species search and suggest indexes. Each is
+        built in the background (see SharedReleaseStructure.warm); requests use
+        SQL, or get no suggestions, until it is ready.
+        """
+        structures = {
+            "regulation_matrix": (
+                SharedRegulationMatrix if self.app.config.get("REGULATION_MATRIX_ENABLED", True) else None
+            ),
+            "species_search_index": (
+                SharedSpeciesSearchIndex
+                if self.app.config.get("SPECIES_SEARCH_BACKEND", "trigram") == "trigram"
+                else None
+            ),
+            "species_suggest_index": SharedSpeciesSuggestIndex,
+        }
+        for key, holder_class in structures.items():
+            if holder_class is None:
+                self.app.extensions.pop(key, None)
+                continue
+            holder = holder_class()
+            # One instance per build thread: each closes its connections when done.
+            holder.warm(
+                DatabaseBase(
+                    db_path=database_path,
+                    immutable=self.app.config.get("DATABASE_IMMUTABLE", True),
+                    pragmas=serving_profile(self.app.config),
+                    memory_uri=self.app.config.get("DATABASE_MEMORY_URI"),
+                )
+            )
+            self.app.extensions[key] = holder
+
+    def _load_into_memory(self, database_path: str):
+        """
+        Copy the release into a shared in-memory database with the backup API
+        and point DATABASE_MEMORY_URI at it. Falls back to file serving on failure.
+        """
+        memory_uri = f"file:release-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        try:
+            started = time.time()
+            memory_connection = sqlite3.connect(memory_uri, uri=True, check_same_thread=False)
+            try:
+                source = sqlite3.connect(f"{Path(os.path.abspath(database_path)).as_uri()}?mode=ro", uri=True)
+                try:
+                    source.backup(memory_connection)
+                finally:
+                    source.close()
+            except Exception:
+                memory_connection.close()
+                raise
+        except Exception as exc:
+            self.app.logger.warning(f"Unable to load {database_path} into memory, serving the file: {exc}")
+            self.memory_connection = None
+            self.memory_source_path = None
+            self.app.config.pop("DATABASE_MEMORY_URI", None)
+            return
+
+        self.memory_connection = memory_connection
+        self.memory_source_path = database_path
+        self.app.config["DATABASE_MEMORY_URI"] = memory_uri
+        self.app.logger.info(f"Loaded {database_path} into memory in {time.time() - started:.2f}s")
+
+    def _report_serving_profile(self, database_path: str):
+        """Log the SQLite settings connections to this release will actually run with."""
+        db = DatabaseBase(
+            db_path=database_path,
+            immutable=self.app.config.get("DATABASE_IMMUTABLE", True),
+            pragmas=serving_profile(self.app.config),
+            memory_uri=self.app.config.get("DATABASE_MEMORY_URI"),
+        )
+        try:
+            applied = db.applied_pragmas()
+        except Exception as exc:
+            self.app.logger.warning(f"Unable to read SQLite serving profile for {database_path}: {exc}")
+            return
+        finally:
+            db.close_connections()
+        settings = ", ".join(f"{name}={value}" for name, value in applied.items())
+        self.app.logger.info(
+            f"SQLite serving profile for {database_path} "
+            f"(immutable={bool(db.immutable and not db.memory_uri)}, in_memory={bool(db.memory_uri)}): {settings}"
+        )
 
     def _manifest_version(self, manifest: dict) -> str:
         if not isinstance(manifest, dict):
@@ -211,7 +354,7 @@ class DataManager:
             or "remote"
         )
 
-    def _sync_remote_data(self, cache_paths: dict = None):
+    def _sync_remote_data(self, cache_paths: dict = None, wait_for_install: bool = False):
         if cache_paths is None:
             cache_dir = self._resolve_path(self.cache_dir)
             os.makedirs(cache_dir, exist_ok=True)
@@ -228,7 +371,137 @@ class DataManager:
         if changed:
             self._write_json(cache_paths["manifest"], manifest)
 
-        return self._paths_from_cache(cache_paths), version, changed, manifest
+        data_paths = self._install_release(self._paths_from_cache(cache_paths), wait=wait_for_install)
+        return data_paths, version, changed, manifest
+
+    def _installed_database_path(self) -> str:
+        filename = "weeds.db" if self.mode == "remote_production" else "local_sample.db"
+        return os.path.join(self._resolve_path(self.cache_dir), "installed", filename)
+
+    def compile_release(
+        self,
+        source_path: str = None,
+        geojson_dir: str = None,
+        output_path: str = None,
+        force: bool = False,
+    ):
+        """
+        Compile the serving database for a release (see release_install).
+        Defaults to the release currently applied and the installed path the
+        app reads from. Returns (output_path, rebuilt).
+        """
+        source_path = source_path or self.app.config.get("DATA_SOURCE_DATABASE_PATH")
+        if geojson_dir is None:
+            geojson_dir = self.app.config.get("GEOJSON_DIR")
+        output_path = output_path or self._installed_database_path()
+        if not source_path or not os.path.exists(source_path):
+            raise FileNotFoundError(f"Release database not found: {source_path}")
+
+        started = time.time()
+        rebuilt = install_release(source_path, output_path, geojson_dir=geojson_dir, force=force)
+        if rebuilt:
+            self.app.logger.info(
+                f"Compiled serving database {output_path} from {source_path} in {time.time() - started:.2f}s"
+            )
+        return output_path, rebuilt
+
+    def _install_release(self, data_paths: dict, wait: bool = False) -> dict:
+        """
+        Point data_paths at the serving database (installed copy) of the
+        release when it is current. Otherwise, with installs enabled, compile
+        it (see _run_install_process): waiting for it with `wait` (refresh
+        thread), else from a background thread started once the release is
+        applied, serving the release file directly until the copy is ready.
+        Compiling takes minutes on a production-sized release, far longer than
+        gunicorn lets a booting worker take. With installs disabled, a serving
+        database compiled ahead of time (`flask data compile`) is still
+        preferred when it matches the release.
+        """
+        source_path = data_paths.get("database_path")
+        if not source_path or not os.path.exists(source_path):
+            return data_paths
+
+        installed_path = self._installed_database_path()
+        geojson_dir = data_paths.get("geojson_dir")
+        if not installed_is_current(source_path, installed_path, geojson_dir):
+            if not self.install_enabled:
+                return data_paths
+            if not wait:
+                return dict(data_paths, install_pending=True)
+            try:
+                self._run_install_process(source_path, geojson_dir, installed_path)
+            except Exception as exc:
+                self.app.logger.warning(f"Release install failed, serving {source_path} directly: {exc}")
+                return data_paths
+
+        installed_paths = dict(data_paths)
+        installed_paths["database_path"] = installed_path
+        installed_paths["source_database_path"] = source_path
+        return installed_paths
+
+    def _run_install_process(self, source_path: str, geojson_dir: str, installed_path: str):
+        """
+        Compile in a process of its own session, so the build survives this
+        worker being killed (a slow request past gunicorn's timeout) and the
+        next worker finds it done or still holding the install lock. Every
+        worker starts one; the lock makes all but the first find the copy
+        current and exit.
+        """
+        # Not `-m app.utils.release_install`: importing the app package loads that module first.
+        command = [
+            sys.executable,
+            "-c",
+            "from app.utils.release_install import main; raise SystemExit(main())",
+            source_path,
+            installed_path,
+        ]
+        if geojson_dir:
+            command += ["--geojson-dir", geojson_dir]
+        started = time.time()
+        subprocess.run(command, cwd=self._project_root(), check=True, start_new_session=True)
+        if not installed_is_current(source_path, installed_path, geojson_dir):
+            raise RuntimeError(f"{installed_path} is not current after the install process exited")
+        self.app.logger.info(f"Serving database {installed_path} ready after {time.time() - started:.2f}s")
+
+    def _start_install(self, data_paths: dict, manifest: dict = None):
+        pending = (data_paths, manifest, os.getpid())
+        self.pending_install = pending
+        threading.Thread(target=self._install_worker, args=(pending,), daemon=True).start()
+
+    def _resume_install(self):
+        with self.lock:
+            pending = self.pending_install
+            if pending is not None and pending[2] != os.getpid():
+                # A copy the parent finished building is switched to before this request.
+                if not self._switch_to_installed(pending):
+                    self._start_install(pending[0], pending[1])
+
+    def _switch_to_installed(self, pending) -> bool:
+        """Apply the installed copy of a pending release if it is current. Call with self.lock held."""
+        data_paths, manifest, _ = pending
+        installed_paths = self._install_release({**data_paths, "install_pending": False})
+        if installed_paths.get("source_database_path") != data_paths["database_path"]:
+            return False
+        self._apply_data_paths(installed_paths, version=self.current_version, manifest=manifest)
+        self.app.logger.info(f"Serving installed copy {installed_paths['database_path']}")
+        return True
+
+    def _install_worker(self, pending):
+        """
+        Wait for the serving database of a release applied from its release
+        file, then switch to it unless another apply came in between.
+        """
+        data_paths = pending[0]
+        source_path = data_paths["database_path"]
+        try:
+            self._run_install_process(source_path, data_paths.get("geojson_dir"), self._installed_database_path())
+        except Exception as exc:
+            self.app.logger.warning(f"Release install failed, serving {source_path} directly: {exc}")
+            return
+
+        with self.lock:
+            if self.pending_install is pending:
+                self._switch_to_installed(pending)
 
     def _download_artifacts(self, manifest: dict, cache_paths: dict):
         cache_dir = cache_paths["cache_dir"]
@@ -433,7 +706,12 @@ class DataManager:
             cache_dir = self._resolve_path(self.cache_dir)
             os.makedirs(cache_dir, exist_ok=True)
             cache_paths = self._cache_paths(cache_dir)
-            data_paths, version, changed, manifest = self._sync_remote_data(cache_paths=cache_paths)
+            # Already off the request path, so the install runs inline: the new
+            # release is applied once, with its serving database.
+            data_paths, version, changed, manifest = self._sync_remote_data(
+                cache_paths=cache_paths,
+                wait_for_install=True,
+            )
             with self.lock:
                 self._apply_data_paths(data_paths, version=version, changed=changed, manifest=manifest)
         except Exception as exc:
@@ -1,4 +1,41 @@
+import os
 import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# PRAGMAs a serving profile may set, in the order they are applied.
+SERVING_PRAGMAS = ("mmap_size", "cache_size", "temp_store", "query_only")
+_TEMP_STORE_VALUES = {"default": 0, "file": 1, "memory": 2}
+
+
+def serving_profile(config) -> Dict[str, int]:
+    """
+    SQLite PRAGMAs for release databases from app config. mmap lets every
+    worker read pages straight from the shared OS page cache.
+    """
+    temp_store = str(config.get("SQLITE_TEMP_STORE", "memory")).strip().lower()
+    if temp_store not in _TEMP_STORE_VALUES:
+        raise ValueError(f"SQLITE_TEMP_STORE must be one of {sorted(_TEMP_STORE_VALUES)}, got {temp_store!r}")
+    return {
+        "mmap_size": max(0, int(config.get("SQLITE_MMAP_SIZE", 268435456))),
+        "cache_size": int(config.get("SQLITE_CACHE_SIZE", -65536)),
+        "temp_store": _TEMP_STORE_VALUES[temp_store],
+        "query_only": 1 if config.get("SQLITE_QUERY_ONLY", True) else 0,
+    }
+
+
+class _ReusableConnection(sqlite3.Connection):
+    """
+    Read-only connection kept open for its thread. Callers keep their
+    try/finally close() pattern; close() just hands it back for reuse.
+    """
+
+    def close(self):
+        pass
+
+    def dispose(self):
+        super().close()
 
 
 class DatabaseBase:
@@ -6,14 +43,119 @@ class DatabaseBase:
     New-schema only.
 
     Provides:
-      - DB connection
+      - DB connection (read-only, reused per thread, with an optional
+        serving profile of PRAGMAs; see serving_profile)
+      - EXPLAIN QUERY PLAN helper
+
+    Release files are replaced on a data swap, never edited in place, so
+    instances serving them may open with `immutable=True`, which lets SQLite
+    skip file locking and change detection. With `memory_uri`, connections
+    read a shared in-memory copy instead; `db_path` still names the file the
+    copy came from.
+
+    With a `regulation_matrix` (a SharedRegulationMatrix for the same release),
+    subclasses answer scoped-regulation lookups from memory and fall back to
+    SQL when the release cannot be represented.
+
+    Subclass SQL filters scoped regulations with `+r.is_webapp_scoped = 1`.
+    A release file carries no ANALYZE statistics, and without them SQLite
+    drives lookups from the release's is_webapp_scoped index, reading nearly
+    every regulation per lookup; the unary `+` takes that index out of play.
+    Lookups filtering plants or jurisdictions on columns a release file does
+    not index name that table first with CROSS JOIN, which SQLite does not
+    reorder, so they read it rather than regulations in full.
     """
 
-    def __init__(self, db_path: str = "weeds.db", geojson_dir=None):
+    def __init__(
+        self,
+        db_path: str = "weeds.db",
+        geojson_dir=None,
+        immutable: bool = False,
+        pragmas: Optional[Dict[str, int]] = None,
+        memory_uri: Optional[str] = None,
+        regulation_matrix=None,
+    ):
         self.db_path = db_path
         self.geojson_dir = geojson_dir
+        self.immutable = immutable
+        self.memory_uri = memory_uri
+        self.regulation_matrix = regulation_matrix
+        self.pragmas = dict(pragmas or {})
+        unknown = set(self.pragmas) - set(SERVING_PRAGMAS)
+        if unknown:
+            raise ValueError(f"Unsupported serving PRAGMAs: {sorted(unknown)}")
+        self._local = threading.local()
+        self._table_names_cache: Optional[set] = None
+
+    def _connection_uri(self) -> str:
+        if self.memory_uri:
+            # Shared in-memory copy of db_path loaded by DataManager (DATA_SERVING_MODE=memory).
+            return self.memory_uri
+        uri = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
 
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._connection_uri(),
+                uri=True,
+                factory=_ReusableConnection,
+            )
+            conn.row_factory = sqlite3.Row
+            for name in SERVING_PRAGMAS:
+                if name in self.pragmas:
+                    conn.execute(f"PRAGMA {name} = {int(self.pragmas[name])}")
+            self._local.conn = conn
         return conn
+
+    def _matrix(self):
+        """The release's RegulationMatrix, or None to use SQL."""
+        if self.regulation_matrix is None:
+            return None
+        return self.regulation_matrix.get(self.get_connection())
+
+    def _table_exists(self, conn, table_name: str) -> bool:
+        if self.immutable and conn is self.get_connection():
+            if self._table_names_cache is None:
+                rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+                self._table_names_cache = {row["name"] for row in rows}
+            return table_name in self._table_names_cache
+        row = conn.execute(
+            """
+            SELECT 1
+            FROM sqlite_master
+            WHERE type = 'table' AND name = ?
+            LIMIT 1
+            """,
+            (table_name,),
+        ).fetchone()
+        return bool(row)
+
+    def applied_pragmas(self) -> Dict[str, int]:
+        """Values SQLite actually uses (mmap_size is capped by the build, for example)."""
+        conn = self.get_connection()
+        applied = {}
+        for name in SERVING_PRAGMAS:
+            # In-memory databases report nothing for mmap_size.
+            row = conn.execute(f"PRAGMA {name}").fetchone()
+            applied[name] = row[0] if row else None
+        return applied
+
+    def close_connections(self):
+        """
+        Close this thread's handle and forget the rest; other threads' handles
+        close once their in-flight requests drop the old thread-local state.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.dispose()
+        self._local = threading.local()
+
+    @staticmethod
+    def query_plan(conn, sql: str, params=()) -> List[str]:
+        """Detail lines of EXPLAIN QUERY PLAN for `sql`, e.g. 'SEARCH j USING INDEX ...'."""
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return [row[3] for row in rows]
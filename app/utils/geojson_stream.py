@@ -0,0 +1,184 @@
+"""Incremental reader for GeoJSON feature properties.
+
+Region discovery only needs ``features[].properties``; the geometry arrays are
+most of a boundary file. ``iter_feature_properties`` reads the file in chunks
+and yields each feature's properties, skipping geometry (and every other
+member) with a regex scan over brackets and strings, so memory stays at one
+chunk plus the properties being decoded and time is linear in file size.
+
+Malformed files raise ValueError, like ``json.load`` would.
+"""
+
+import json
+import re
+from typing import Dict, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+# A run of innermost arrays such as coordinate pairs: "[x, y], [x, y], ..."
+_FLAT_ARRAYS = re.compile(r'(?:\[[^\[\]{}"]*\][\s,]*)+')
+_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(r'[^,\]}\s]*')
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _Scanner:
+    def __init__(self, handle, chunk_size: int = CHUNK_SIZE):
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._mark = None
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        keep_from = self._pos if self._mark is None else min(self._pos, self._mark)
+        if keep_from:
+            self._buffer = self._buffer[keep_from:]
+            self._pos -= keep_from
+            if self._mark is not None:
+                self._mark -= keep_from
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of GeoJSON")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}")
+        self._pos += 1
+
+    def _skip_string(self):
+        # self._pos is just past the opening quote.
+        while True:
+            match = _STRING_END.match(self._buffer, self._pos)
+            if match:
+                self._pos = match.end()
+                return
+            if not self._fill():
+                raise ValueError("Unterminated string in GeoJSON")
+
+    def _skip_scalar(self):
+        while True:
+            end = _SCALAR.match(self._buffer, self._pos).end()
+            if end < len(self._buffer) or not self._fill():
+                if end == self._pos:
+                    raise ValueError(f"Expected a value at offset {self._pos}")
+                self._pos = end
+                return
+
+    def skip_value(self):
+        first = self.peek()
+        if first == '"':
+            self._pos += 1
+            self._skip_string()
+            return
+        if first not in "[{":
+            self._skip_scalar()
+            return
+
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self._buffer, self._pos)
+            if not match:
+                self._pos = len(self._buffer)
+                if not self._fill():
+                    raise ValueError("Unexpected end of GeoJSON")
+                continue
+            char = match.group()
+            if char == "[" and depth:
+                flat = _FLAT_ARRAYS.match(self._buffer, match.start())
+                if flat:
+                    self._pos = flat.end()
+                    continue
+            self._pos = match.end()
+            if char == '"':
+                self._skip_string()
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def read_value(self):
+        start = self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        self._mark = start
+        try:
+            self.skip_value()
+            start = self._mark
+            return json.loads(self._buffer[start:self._pos])
+        finally:
+            self._mark = None
+
+    def read_string(self) -> str:
+        if self.peek() != '"':
+            raise ValueError(f"Expected a member name at offset {self._pos}")
+        return self.read_value()
+
+    def object_members(self) -> Iterator[str]:
+        """Yield member names; the caller must consume each member's value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def array_items(self) -> Iterator[None]:
+        """Yield once per element; the caller must consume each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_feature_properties(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """Yield ``properties`` (``{}`` when missing or null) for each feature in `path`."""
+    with open(path, "r", encoding="utf-8") as handle:
+        scanner = _Scanner(handle, chunk_size)
+        if scanner.peek() != "{":
+            raise ValueError("GeoJSON root is not an object")
+        for key in scanner.object_members():
+            if key != "features":
+                scanner.skip_value()
+                continue
+            if scanner.peek() != "[":
+                raise ValueError("GeoJSON features is not an array")
+            for _ in scanner.array_items():
+                if scanner.peek() != "{":
+                    raise ValueError("GeoJSON feature is not an object")
+                properties = None
+                for member in scanner.object_members():
+                    if member == "properties":
+                        properties = scanner.read_value()
+                    else:
+                        scanner.skip_value()
+                yield properties or {}
@@ -0,0 +1,100 @@
+"""Compact plant-id sets for union counting.
+
+Plant ids are mapped once per data version to dense ordinals (0..n-1) by
+PlantOrdinals. A PlantBitmap then stores a set of ordinals in whichever form is
+smaller:
+
+  - sparse: a sorted ``array('I')`` of ordinals (4 bytes per member)
+  - dense:  a Python int used as a bitmap (1 bit per ordinal up to the highest)
+
+Union cardinality ORs the int bitmaps together and counts bits when any
+operand is dense. When every operand is sparse, the arrays are small by
+construction (at most one member per 32 ordinals), so their members are
+counted with a single set union instead.
+"""
+
+from array import array
+from typing import Dict, Iterable, List
+
+
+class PlantOrdinals:
+    """Assigns dense ordinals to plant ids in first-seen order."""
+
+    def __init__(self):
+        self._ordinals: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def ordinal(self, plant_id: int) -> int:
+        value = self._ordinals.get(plant_id)
+        if value is None:
+            value = len(self._ordinals)
+            self._ordinals[plant_id] = value
+        return value
+
+
+class PlantBitmap:
+    __slots__ = ("_members", "_bits", "_size")
+
+    def __init__(self, members: array = None, bits: int = None, size: int = 0):
+        self._members = members
+        self._bits = bits
+        self._size = size
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Iterable[int]) -> "PlantBitmap":
+        unique = sorted(set(ordinals))
+        if not unique:
+            return cls(members=array("I"), size=0)
+        dense_bytes = (unique[-1] >> 3) + 1
+        if len(unique) * 4 <= dense_bytes:
+            return cls(members=array("I", unique), size=len(unique))
+        return cls(bits=_bits_from_ordinals(unique, dense_bytes), size=len(unique))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __contains__(self, ordinal: int) -> bool:
+        if self._bits is not None:
+            return ordinal >= 0 and bool((self._bits >> ordinal) & 1)
+        members = self._members
+        lo, hi = 0, len(members)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if members[mid] < ordinal:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < len(members) and members[lo] == ordinal
+
+    def bits(self) -> int:
+        if self._bits is not None:
+            return self._bits
+        if not self._members:
+            return 0
+        return _bits_from_ordinals(self._members, (self._members[-1] >> 3) + 1)
+
+    @staticmethod
+    def union_count(bitmaps: Iterable["PlantBitmap"]) -> int:
+        present: List[PlantBitmap] = [bitmap for bitmap in bitmaps if bitmap]
+        if not present:
+            return 0
+        if len(present) == 1:
+            return len(present[0])
+        if all(bitmap._bits is None for bitmap in present):
+            return len(set().union(*(bitmap._members for bitmap in present)))
+        combined = 0
+        for bitmap in present:
+            combined |= bitmap.bits()
+        return combined.bit_count()
+
+
+def _bits_from_ordinals(ordinals: Iterable[int], size_bytes: int) -> int:
+    buffer = bytearray(size_bytes)
+    for ordinal in ordinals:
+        buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buffer, "little")
@@ -0,0 +1,246 @@
+"""In-process regulation matrix for one data release.
+
+Web-app scoped regulations are held as a sparse plant x jurisdiction matrix:
+
+  - CSR (by plant):        plant_indptr[p] .. plant_indptr[p + 1] index the
+    entries of plant ordinal p; entry_jurisdiction[e] is the jurisdiction
+    ordinal and classification/note hold the entry's attributes.
+  - CSC (by jurisdiction): jurisdiction_indptr[j] .. jurisdiction_indptr[j + 1]
+    index jurisdiction_entries, the CSR entry numbers for jurisdiction j.
+
+Plants and jurisdictions referenced by at least one scoped regulation get dense
+ordinals (in id order) and columnar attributes, so the species and region read
+paths become array walks instead of regulations x plants x jurisdictions joins.
+Entries keep regulation id order within a plant or jurisdiction.
+
+The SQL methods remain the fallback and the reference:
+scripts/check_regulation_matrix.py compares both for every species and region.
+"""
+
+import string
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utils.release_structures import SharedReleaseStructure, has_columns
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def sql_lower(value) -> str:
+    """SQLite LOWER(): ASCII letters only."""
+    return value.translate(_ASCII_LOWER) if isinstance(value, str) else value
+
+
+def sql_trim(value):
+    """SQLite TRIM(): spaces only."""
+    return value.strip(" ") if isinstance(value, str) else value
+
+
+def sql_sort_key(value):
+    """ORDER BY position for TEXT columns: NULLs first, then BINARY order."""
+    return (value is not None, value if value is not None else "")
+
+
+class RegulationMatrix:
+    PLANT_COLUMNS = ("id", "species_id", "gbif_usage_key", "canonical_name", "english_name", "family_name", "synonyms")
+    JURISDICTION_COLUMNS = (
+        "id",
+        "country",
+        "region",
+        "jurisdiction_type",
+        "jurisdiction_group",
+        "authority_name",
+        "jurisdiction_uid",
+    )
+
+    def __init__(self):
+        self.plants: Dict[str, list] = {}
+        self.jurisdictions: Dict[str, list] = {}
+        self.plant_indptr = array("I", [0])
+        self.entry_plant = array("I")
+        self.entry_jurisdiction = array("I")
+        self.regulation_id = array("q")
+        self.classification: List = []
+        self.note: List = []
+        self.jurisdiction_indptr = array("I", [0])
+        self.jurisdiction_entries = array("I")
+        self._indexes: Dict[Tuple[str, str], Dict] = {}
+
+    @classmethod
+    def supports(cls, conn) -> bool:
+        """Whether the release schema has every column the matrix reads."""
+        return has_columns(conn, "plants", cls.PLANT_COLUMNS) and has_columns(
+            conn, "jurisdictions", set(cls.JURISDICTION_COLUMNS) - {"jurisdiction_uid"}
+        )
+
+    @classmethod
+    def from_connection(cls, conn) -> Optional["RegulationMatrix"]:
+        """
+        Build from an open release connection; None if the schema lacks a needed
+        column. Compiled serving databases are read from their denormalized
+        serving_regulations table, anything else from the normalized tables.
+        """
+        has_serving_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'serving_regulations'"
+        ).fetchone()
+        if has_serving_table:
+            entry_sql = """
+                SELECT plant_id, jurisdiction_id, regulation_id, classification, note
+                FROM serving_regulations
+                ORDER BY plant_id, regulation_id
+            """
+            plant_columns = {name: ("plant_id" if name == "id" else name) for name in cls.PLANT_COLUMNS}
+            jurisdiction_columns = {
+                name: ("jurisdiction_id" if name == "id" else name) for name in cls.JURISDICTION_COLUMNS
+            }
+            plant_table = jurisdiction_table = "serving_regulations"
+        elif cls.supports(conn):
+            entry_sql = """
+                SELECT r.plant_id, r.jurisdiction_id, r.id, r.classification, r.note
+                FROM regulations r
+                JOIN plants p ON p.id = r.plant_id
+                JOIN jurisdictions j ON j.id = r.jurisdiction_id
+                WHERE r.is_webapp_scoped = 1
+                ORDER BY r.plant_id, r.id
+            """
+            available = {row[1] for row in conn.execute("PRAGMA table_info(jurisdictions)").fetchall()}
+            plant_columns = {name: name for name in cls.PLANT_COLUMNS}
+            jurisdiction_columns = {name: name for name in cls.JURISDICTION_COLUMNS if name in available}
+            plant_table, jurisdiction_table = "plants", "jurisdictions"
+        else:
+            return None
+
+        matrix = cls()
+        rows = conn.execute(entry_sql).fetchall()
+
+        plant_ids = sorted({row[0] for row in rows})
+        jurisdiction_ids = sorted({row[1] for row in rows})
+        plant_ordinal = {plant_id: index for index, plant_id in enumerate(plant_ids)}
+        jurisdiction_ordinal = {jurisdiction_id: index for index, jurisdiction_id in enumerate(jurisdiction_ids)}
+
+        matrix.plants = cls._load_columns(conn, plant_table, cls.PLANT_COLUMNS, plant_columns, plant_ordinal)
+        matrix.jurisdictions = cls._load_columns(
+            conn, jurisdiction_table, cls.JURISDICTION_COLUMNS, jurisdiction_columns, jurisdiction_ordinal
+        )
+
+        per_jurisdiction = [[] for _ in jurisdiction_ids]
+        for entry, (plant_id, jurisdiction_id, regulation_id, classification, note) in enumerate(rows):
+            p = plant_ordinal[plant_id]
+            while len(matrix.plant_indptr) <= p:
+                matrix.plant_indptr.append(entry)
+            j = jurisdiction_ordinal[jurisdiction_id]
+            matrix.entry_plant.append(p)
+            matrix.entry_jurisdiction.append(j)
+            matrix.regulation_id.append(regulation_id)
+            matrix.classification.append(classification)
+            matrix.note.append(note)
+            per_jurisdiction[j].append(entry)
+        while len(matrix.plant_indptr) <= len(plant_ids):
+            matrix.plant_indptr.append(len(rows))
+
+        # Entries are numbered in (plant, regulation id) order, so regulation ids
+        # within a jurisdiction need sorting to match the jurisdiction index order.
+        for entries in per_jurisdiction:
+            entries.sort(key=matrix.regulation_id.__getitem__)
+            matrix.jurisdiction_entries.extend(entries)
+            matrix.jurisdiction_indptr.append(len(matrix.jurisdiction_entries))
+        return matrix
+
+    @staticmethod
+    def _load_columns(conn, table: str, wanted, expressions: Dict[str, str], ordinals: Dict) -> Dict[str, list]:
+        """
+        Column lists for `wanted` (the first one is the key), filled from
+        `table` via `expressions` (name -> SQL column). Missing columns stay None.
+        """
+        columns = {name: [None] * len(ordinals) for name in wanted}
+        selected = [name for name in wanted if name in expressions]
+        for row in conn.execute(f"SELECT {', '.join(expressions[name] for name in selected)} FROM {table}"):
+            index = ordinals.get(row[0])
+            if index is None:
+                continue
+            for name, value in zip(selected, row):
+                columns[name][index] = value
+        return columns
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+    def __len__(self) -> int:
+        return len(self.entry_plant)
+
+    @staticmethod
+    def _value_index(cells: list) -> Dict[object, List[int]]:
+        index = defaultdict(list)
+        for ordinal, cell in enumerate(cells):
+            index[cell].append(ordinal)
+        return dict(index)
+
+    def plants_where(self, column: str, value) -> List[int]:
+        """Plant ordinals whose `column` equals `value`."""
+        key = ("plants", column)
+        if key not in self._indexes:
+            self._indexes[key] = self._value_index(self.plants[column])
+        return self._indexes[key].get(value, [])
+
+    def jurisdictions_where(self, column: str, value) -> List[int]:
+        """Jurisdiction ordinals whose `column` equals `value`."""
+        key = ("jurisdictions", column)
+        if key not in self._indexes:
+            self._indexes[key] = self._value_index(self.jurisdictions[column])
+        return self._indexes[key].get(value, [])
+
+    def plants_named(self, name: str) -> List[int]:
+        """
+        Plant ordinals matching LOWER(COALESCE(english_name, '')) = LOWER(name)
+        OR LOWER(canonical_name) = LOWER(name), in ordinal order.
+        """
+        key = ("plants", "name")
+        if key not in self._indexes:
+            index = defaultdict(set)
+            for ordinal, (english, canonical) in enumerate(
+                zip(self.plants["english_name"], self.plants["canonical_name"])
+            ):
+                index[sql_lower(english or "")].add(ordinal)
+                if canonical is not None:
+                    index[sql_lower(canonical)].add(ordinal)
+            self._indexes[key] = {name_key: sorted(ordinals) for name_key, ordinals in index.items()}
+        return self._indexes[key].get(sql_lower(name), [])
+
+    def jurisdictions_by_uid(self, uid: str) -> List[int]:
+        """Jurisdiction ordinals whose LOWER(TRIM(jurisdiction_uid)) equals LOWER(TRIM(uid))."""
+        key = ("jurisdictions", "uid_norm")
+        if key not in self._indexes:
+            index = defaultdict(list)
+            for ordinal, cell in enumerate(self.jurisdictions["jurisdiction_uid"]):
+                if cell is not None:
+                    index[sql_lower(sql_trim(cell))].append(ordinal)
+            self._indexes[key] = dict(index)
+        return self._indexes[key].get(sql_lower(sql_trim(uid)), [])
+
+    def plant_entries(self, plant_ordinals: Iterable[int]) -> List[int]:
+        """Entries of the given plants: plant order, then regulation id."""
+        entries = []
+        for p in plant_ordinals:
+            entries.extend(range(self.plant_indptr[p], self.plant_indptr[p + 1]))
+        return entries
+
+    def jurisdiction_entries_for(self, jurisdiction_ordinals: Iterable[int]) -> List[int]:
+        """Entries of the given jurisdictions: jurisdiction order, then regulation id."""
+        entries = []
+        for j in jurisdiction_ordinals:
+            entries.extend(self.jurisdiction_entries[self.jurisdiction_indptr[j]:self.jurisdiction_indptr[j + 1]])
+        return entries
+
+    def in_regulation_order(self, entries: Iterable[int]) -> List[int]:
+        return sorted(entries, key=self.regulation_id.__getitem__)
+
+
+class SharedRegulationMatrix(SharedReleaseStructure):
+    """
+    Holds the matrix for one release and shares it between the state and
+    species databases; see SharedReleaseStructure.
+    """
+
+    structure = RegulationMatrix
+    label = "Regulation matrix"
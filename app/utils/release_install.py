@@ -0,0 +1,273 @@
+"""Install step for data releases.
+
+A release ``weeds.db`` is served exactly as the ingestion pipeline produced it:
+the remote cache copy must keep matching its manifest checksum, and the local
+sample is a tracked file. Serving-time derivations (precomputed tables, indexes)
+are therefore written into a separate *installed copy*, which the app reads from
+once it exists.
+
+The installed copy is the release's *serving database*: it adds denormalized
+``serving_regulations`` rows, precomputed aggregates, the ``plant_names``
+lookup table, the species search FTS5 index and planner statistics on top of
+the release tables. ``flask data compile`` (app/cli.py) builds one ahead of
+time; DataManager builds or reuses one whenever a release is applied.
+
+The public surface is::
+
+    install_release(source_path, dest_path, geojson_dir=None, force=False) -> bool
+    installed_is_current(source_path, dest_path, geojson_dir=None) -> bool
+
+``main()`` (arguments ``SOURCE DEST [--geojson-dir DIR]``) runs
+``install_release`` in a process of its own; DataManager starts one so a build
+outlives a worker that gunicorn kills.
+
+``install_release`` rebuilds ``dest_path`` only when the source database, the
+GeoJSON directory or the install steps themselves have changed (or `force`),
+and swaps the new copy into place atomically so running workers never see a
+half-built file. Builds of one ``dest_path`` are serialized across processes
+with a lock file next to it, so N workers applying the same release build it
+once; the others find it current when they get the lock.
+"""
+
+import argparse
+import glob
+import logging
+import os
+import re
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from app.utils.species_database import SpeciesDatabase
+from app.utils.state_database import StateDatabase
+
+# Bump whenever an install step changes so existing installed copies are rebuilt.
+INSTALL_FORMAT_VERSION = 9
+
+logger = logging.getLogger(__name__)
+
+_JURISDICTION_SCAN = re.compile(r"^SCAN j\b")
+
+# Composite indexes for the request-time predicates: (name, table, columns).
+# Created when the table has every column; existing indexes are left alone.
+SERVING_INDEXES = (
+    ("idx_regulations_jurisdiction_scoped_plant", "regulations", ("jurisdiction_id", "is_webapp_scoped", "plant_id")),
+    ("idx_regulations_plant_scoped_jurisdiction", "regulations", ("plant_id", "is_webapp_scoped", "jurisdiction_id")),
+    ("idx_jurisdictions_type_country_region", "jurisdictions", ("jurisdiction_type", "country", "region")),
+    ("idx_jurisdictions_type_group", "jurisdictions", ("jurisdiction_type", "jurisdiction_group")),
+    ("idx_plants_species_id", "plants", ("species_id",)),
+    ("idx_plants_usage_key", "plants", ("gbif_usage_key",)),
+)
+
+
+def _read_only_uri(path: str) -> str:
+    return f"{Path(os.path.abspath(path)).as_uri()}?mode=ro"
+
+
+def release_signature(source_path: str, geojson_dir: str = None) -> str:
+    stat = os.stat(source_path)
+    parts = [
+        f"format={INSTALL_FORMAT_VERSION}",
+        f"db={os.path.abspath(source_path)}:{stat.st_size}:{stat.st_mtime_ns}",
+    ]
+    if geojson_dir and os.path.isdir(geojson_dir):
+        for name in sorted(os.listdir(geojson_dir)):
+            if not name.lower().endswith(".geojson"):
+                continue
+            try:
+                file_stat = os.stat(os.path.join(geojson_dir, name))
+            except OSError:
+                continue
+            parts.append(f"{name}={file_stat.st_size}:{file_stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def installed_signature(dest_path: str) -> Optional[str]:
+    if not dest_path or not os.path.exists(dest_path):
+        return None
+    try:
+        conn = sqlite3.connect(_read_only_uri(dest_path), uri=True)
+        try:
+            row = conn.execute(
+                "SELECT value FROM release_install WHERE key = 'signature'"
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def installed_is_current(source_path: str, dest_path: str, geojson_dir: str = None) -> bool:
+    """Whether `dest_path` is a serving database built from this exact release."""
+    return installed_signature(dest_path) == release_signature(source_path, geojson_dir)
+
+
+@contextmanager
+def install_lock(dest_path: str):
+    """
+    Exclusive lock on `dest_path`.lock, held across processes until the block
+    exits. Without fcntl (Windows) builds are not serialized.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+    with open(f"{dest_path}.lock", "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _persist_discovered_geo_regions(conn, db_path: str, geojson_dir: str):
+    StateDatabase(db_path=db_path, geojson_dir=geojson_dir).materialize_discovered_geo_regions(conn)
+
+
+def _normalize_jurisdiction_uids(conn, db_path: str, geojson_dir: str):
+    tables = StateDatabase.normalize_jurisdiction_uids(conn)
+    if "jurisdictions" not in tables:
+        return
+    conn.commit()
+
+    # Prove the uid lookups are now index seeks rather than jurisdiction scans.
+    state_db = StateDatabase(db_path=db_path, geojson_dir=geojson_dir)
+    for name, (sql, params) in state_db.uid_match_queries(conn).items():
+        if name == "geo_region_join" and "geo_regions" not in tables:
+            continue
+        plan = StateDatabase.query_plan(conn, sql, params)
+        if any(_JURISDICTION_SCAN.match(detail) for detail in plan):
+            logger.warning("Release install: %s scans jurisdictions: %s", name, "; ".join(plan))
+
+
+def _create_serving_indexes(conn, db_path: str, geojson_dir: str):
+    for name, table, columns in SERVING_INDEXES:
+        available = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        if not set(columns) <= available:
+            logger.info("Release install: skipping %s, %s lacks %s", name, table, sorted(set(columns) - available))
+            continue
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+
+def _materialize_region_weed_counts(conn, db_path: str, geojson_dir: str):
+    StateDatabase(db_path=db_path, geojson_dir=geojson_dir).materialize_region_weed_counts(conn)
+
+
+def _materialize_highlight_metrics(conn, db_path: str, geojson_dir: str):
+    StateDatabase(db_path=db_path, geojson_dir=geojson_dir).materialize_highlight_metrics(conn)
+
+
+def _materialize_serving_regulations(conn, db_path: str, geojson_dir: str):
+    SpeciesDatabase(db_path=db_path, geojson_dir=geojson_dir).materialize_serving_regulations(conn)
+
+
+def _materialize_plant_names(conn, db_path: str, geojson_dir: str):
+    SpeciesDatabase(db_path=db_path, geojson_dir=geojson_dir).materialize_plant_names(conn)
+
+
+def _build_species_search_fts(conn, db_path: str, geojson_dir: str):
+    try:
+        SpeciesDatabase(db_path=db_path, geojson_dir=geojson_dir).materialize_species_search_fts(conn)
+    except sqlite3.OperationalError as exc:
+        # SQLite without FTS5: SPECIES_SEARCH_BACKEND=fts5 falls back to LIKE.
+        logger.warning("Release install: skipping species_search_fts: %s", exc)
+
+
+def _analyze(conn, db_path: str, geojson_dir: str):
+    # Planner statistics for the release tables and everything added above.
+    conn.execute("ANALYZE")
+
+
+# Run in order against the installed copy. Each step receives the open write
+# connection, the copy's path (for read helpers that open their own
+# connections) and the release GeoJSON directory.
+INSTALL_STEPS = (
+    _persist_discovered_geo_regions,
+    _normalize_jurisdiction_uids,
+    _create_serving_indexes,
+    _materialize_region_weed_counts,
+    _materialize_highlight_metrics,
+    _materialize_serving_regulations,
+    _materialize_plant_names,
+    _build_species_search_fts,
+    _analyze,
+)
+
+
+def install_release(source_path: str, dest_path: str, geojson_dir: str = None, force: bool = False) -> bool:
+    """
+    Build the installed copy of `source_path` at `dest_path` if it is missing or
+    stale (always with `force`). Returns True when a new copy was written.
+    """
+    signature = release_signature(source_path, geojson_dir)
+    if not force and installed_signature(dest_path) == signature:
+        return False
+
+    with install_lock(dest_path):
+        # Another process may have built it while this one waited for the lock.
+        if not force and installed_signature(dest_path) == signature:
+            return False
+        # Left by a build that was killed; nothing else writes them while the lock is held.
+        for stale_path in glob.glob(f"{glob.escape(dest_path)}.*.tmp"):
+            os.remove(stale_path)
+        _build_installed_copy(source_path, dest_path, geojson_dir, signature)
+    return True
+
+
+def _build_installed_copy(source_path: str, dest_path: str, geojson_dir: str, signature: str):
+    tmp_path = f"{dest_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        source = sqlite3.connect(_read_only_uri(source_path), uri=True)
+        try:
+            target = sqlite3.connect(tmp_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+
+        conn = sqlite3.connect(tmp_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            for step in INSTALL_STEPS:
+                step(conn, tmp_path, geojson_dir)
+                conn.commit()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS release_install (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO release_install (key, value) VALUES ('signature', ?)",
+                (signature,),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the serving database (installed copy) of a release.")
+    parser.add_argument("source", help="Release weeds.db.")
+    parser.add_argument("dest", help="Serving database to write.")
+    parser.add_argument("--geojson-dir", help="Release GeoJSON directory.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if install_release(args.source, args.dest, geojson_dir=args.geojson_dir):
+        logger.info("Compiled serving database %s from %s", args.dest, args.source)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
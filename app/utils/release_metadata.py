@@ -3,7 +3,7 @@ from datetime import datetime
 
 
 def _database_last_modified_iso(app) -> str:
-    db_path = app.config.get("DATABASE_PATH") or "weeds.db"
+    db_path = app.config.get("DATA_SOURCE_DATABASE_PATH") or app.config.get("DATABASE_PATH") or "weeds.db"
     absolute_db_path = db_path if os.path.isabs(db_path) else os.path.abspath(db_path)
     if os.path.exists(absolute_db_path):
         return datetime.fromtimestamp(os.path.getmtime(absolute_db_path)).isoformat()
@@ -0,0 +1,111 @@
+"""Per-release in-memory structures shared between requests.
+
+A structure (the regulation matrix, the species search and suggest indexes) is
+built from one release and never changes, so one holder per release is shared
+by every request of a worker. DataManager creates fresh holders and calls
+warm() whenever it applies a release: the build runs in a background thread and
+get() returns None, so callers use their SQL path, until it is done. Builds take
+seconds to tens of seconds on a production-sized release, longer than a request
+may hold a worker. Holders that are never warmed (scripts) build on first get().
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def has_columns(conn, table: str, columns: Iterable[str]) -> bool:
+    """Whether `table` has every one of `columns`."""
+    available = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+    return set(columns) <= available
+
+
+# Holders alive in this process; their locks are replaced in a forked child,
+# where a lock held by the parent's build thread would never be released.
+_HOLDERS = weakref.WeakSet()
+
+
+def _reset_locks_after_fork():
+    for holder in list(_HOLDERS):
+        holder._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+class SharedReleaseStructure:
+    """
+    Holds `structure.from_connection(conn)` for one release. Holds None when
+    the release cannot be represented (from_connection returned None or the
+    build failed), in which case callers use SQL.
+    """
+
+    # The structure class (with from_connection) and its name for log lines.
+    structure = None
+    label = "Release structure"
+
+    def __init__(self):
+        self._value = None
+        self._built = False
+        self._lock = threading.Lock()
+        self._warm_db = None
+        self._warming_pid = None
+        _HOLDERS.add(self)
+
+    def build(self, conn):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    try:
+                        self._value = self.structure.from_connection(conn)
+                    except sqlite3.Error as exc:
+                        logger.warning("%s unavailable: %s", self.label, exc)
+                        self._value = None
+                    self._built = True
+        return self._value
+
+    def warm(self, db):
+        """
+        Build in a daemon thread from `db` (a DatabaseBase for the release; its
+        build-thread connection is closed afterwards). Until the build
+        finishes, get() answers None instead of building.
+        """
+        self._warm_db = db
+        self._warming_pid = os.getpid()
+        threading.Thread(target=self._warm_worker, daemon=True).start()
+
+    def _warm_worker(self):
+        started = time.time()
+        try:
+            try:
+                value = self.build(self._warm_db.get_connection())
+            finally:
+                self._warm_db.close_connections()
+        except Exception as exc:
+            logger.warning("%s build failed: %s", self.label, exc)
+            with self._lock:
+                self._value = None
+                self._built = True
+            return
+        if value is not None:
+            logger.info("%s ready in %.2fs (%d entries)", self.label, time.time() - started, len(value))
+
+    def get(self, conn) -> Optional[object]:
+        if self._built:
+            return self._value
+        if self._warm_db is None:
+            return self.build(conn)
+        if self._warming_pid != os.getpid():
+            # Warmed in a parent that forked (gunicorn --preload) before the
+            # build finished: the thread did not survive the fork.
+            with self._lock:
+                if self._warming_pid != os.getpid():
+                    self.warm(self._warm_db)
+        return None
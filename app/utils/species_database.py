@@ -1,12 +1,40 @@
-from typing import Dict, List
+import re
+from typing import Dict, Iterable, List, Optional
 from app.utils.database_base import DatabaseBase
+from app.utils.regulation_matrix import RegulationMatrix, sql_lower, sql_sort_key, sql_trim
 
 
 class SpeciesDatabase(DatabaseBase):
     """Species search and per-species jurisdiction lookups."""
 
-    def __init__(self, db_path: str = "weeds.db", geojson_dir: str = None):
-        super().__init__(db_path=db_path, geojson_dir=geojson_dir)
+    def __init__(
+        self,
+        db_path: str = "weeds.db",
+        geojson_dir: str = None,
+        immutable: bool = False,
+        pragmas: Optional[Dict[str, int]] = None,
+        memory_uri: Optional[str] = None,
+        regulation_matrix=None,
+        search_index=None,
+        search_backend: str = "like",
+        suggest_index=None,
+    ):
+        super().__init__(
+            db_path=db_path,
+            geojson_dir=geojson_dir,
+            immutable=immutable,
+            pragmas=pragmas,
+            memory_uri=memory_uri,
+            regulation_matrix=regulation_matrix,
+        )
+        # SharedSpeciesSearchIndex for the same release (SPECIES_SEARCH_BACKEND=trigram).
+        self.search_index = search_index
+        # fts5 searches species_search_fts where the installed copy has it; anything
+        # else, and every query the trigram index cannot answer, uses LIKE.
+        self.search_backend = search_backend
+        # SharedSpeciesSuggestIndex for the same release, read by suggest_species.
+        self.suggest_index = suggest_index
+        self._plant_columns_cache: Optional[set] = None
 
     @staticmethod
     def _primary_common_name(value: str, fallback: str = None) -> str:
@@ -16,9 +44,207 @@ class SpeciesDatabase(DatabaseBase):
         parts = [part.strip() for part in raw.split(",") if part.strip()]
         return parts[0] if parts else (fallback or raw)
 
+    def materialize_serving_regulations(self, conn) -> int:
+        """
+        Write serving_regulations on `conn`: one denormalized row per web-app
+        scoped regulation with its plant and jurisdiction attributes, trimmed
+        names, the primary common name, the species-lookup country key and the
+        source authority label precomputed. Run at release compile; skipped for
+        schemas the regulation matrix cannot read.
+        """
+        conn.execute("DROP TABLE IF EXISTS serving_regulations")
+        if not RegulationMatrix.supports(conn):
+            return 0
+
+        jurisdiction_columns = {row[1] for row in conn.execute("PRAGMA table_info(jurisdictions)").fetchall()}
+        uid_expr = "j.jurisdiction_uid" if "jurisdiction_uid" in jurisdiction_columns else "NULL"
+        conn.execute(
+            """
+            CREATE TABLE serving_regulations (
+                regulation_id INTEGER PRIMARY KEY,
+                plant_id INTEGER NOT NULL,
+                jurisdiction_id INTEGER NOT NULL,
+                species_id TEXT,
+                gbif_usage_key INTEGER,
+                canonical_name TEXT,
+                english_name TEXT,
+                common_name TEXT,
+                family_name TEXT,
+                synonyms TEXT,
+                country TEXT,
+                region TEXT,
+                jurisdiction_type TEXT,
+                jurisdiction_group TEXT,
+                country_key TEXT,
+                authority_name TEXT,
+                source_authority TEXT,
+                jurisdiction_uid TEXT,
+                classification TEXT,
+                note TEXT
+            )
+            """
+        )
+        rows = conn.execute(
+            f"""
+            SELECT
+                r.id AS regulation_id,
+                r.plant_id,
+                r.jurisdiction_id,
+                p.species_id,
+                p.gbif_usage_key,
+                p.canonical_name,
+                p.english_name,
+                COALESCE(NULLIF(TRIM(p.english_name), ''), p.canonical_name) AS common_name,
+                p.family_name,
+                p.synonyms,
+                j.country,
+                j.region,
+                j.jurisdiction_type,
+                j.jurisdiction_group,
+                CASE
+                    WHEN j.jurisdiction_type = 'international'
+                         AND TRIM(COALESCE(j.jurisdiction_group, '')) != ''
+                    THEN j.jurisdiction_group
+                    ELSE j.country
+                END AS country_key,
+                j.authority_name,
+                COALESCE(NULLIF(TRIM(j.authority_name), ''), 'Unknown') AS source_authority,
+                {uid_expr} AS jurisdiction_uid,
+                r.classification,
+                r.note
+            FROM regulations r
+            JOIN plants p ON p.id = r.plant_id
+            JOIN jurisdictions j ON j.id = r.jurisdiction_id
+            WHERE +r.is_webapp_scoped = 1
+            """
+        ).fetchall()
+        values = []
+        for row in rows:
+            data = dict(row)
+            data["common_name"] = self._primary_common_name(data["common_name"], data["canonical_name"])
+            values.append(tuple(data.values()))
+        conn.executemany(
+            f"INSERT INTO serving_regulations VALUES ({', '.join('?' for _ in range(20))})",
+            values,
+        )
+        conn.execute("CREATE INDEX idx_serving_regulations_plant ON serving_regulations(plant_id, regulation_id)")
+        conn.execute("CREATE INDEX idx_serving_regulations_species ON serving_regulations(species_id)")
+        conn.execute("CREATE INDEX idx_serving_regulations_usage_key ON serving_regulations(gbif_usage_key)")
+        conn.execute(
+            "CREATE INDEX idx_serving_regulations_jurisdiction ON serving_regulations(jurisdiction_id, regulation_id)"
+        )
+        return len(values)
+
+    def materialize_plant_names(self, conn) -> int:
+        """
+        Write plant_names on `conn`: one row per (name_norm, plant_id), indexed
+        by name_norm, holding LOWER(COALESCE(english_name, '')) and
+        LOWER(canonical_name) of every plant, so get_states_by_weed is an index
+        seek that matches exactly what its join and the regulation matrix
+        match, empty names included. Run at release compile.
+        """
+        conn.execute("DROP TABLE IF EXISTS plant_names")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(plants)").fetchall()}
+        if not {"id", "canonical_name", "english_name"} <= columns:
+            return 0
+        conn.execute(
+            """
+            CREATE TABLE plant_names (
+                name_norm TEXT NOT NULL,
+                plant_id INTEGER NOT NULL
+            )
+            """
+        )
+        rows = set()
+        for plant_id, english_name, canonical_name in conn.execute(
+            "SELECT id, english_name, canonical_name FROM plants"
+        ):
+            rows.add((sql_lower(english_name or ""), plant_id))
+            if canonical_name is not None:
+                rows.add((sql_lower(canonical_name), plant_id))
+        conn.executemany("INSERT INTO plant_names (name_norm, plant_id) VALUES (?, ?)", sorted(rows))
+        conn.execute("CREATE INDEX idx_plant_names_name ON plant_names(name_norm, plant_id)")
+        return len(rows)
+
+    def _matrix_regulation_rows(self, matrix, entries: Iterable[int]) -> List[Dict]:
+        """Rows shaped like the regulation SELECTs below, built from matrix entries."""
+        plants = matrix.plants
+        jurisdictions = matrix.jurisdictions
+        results = []
+        for entry in entries:
+            p = matrix.entry_plant[entry]
+            j = matrix.entry_jurisdiction[entry]
+            canonical_name = plants["canonical_name"][p]
+            english_name = sql_trim(plants["english_name"][p])
+            results.append(
+                {
+                    "species_id": plants["species_id"][p],
+                    "usage_key": plants["gbif_usage_key"][p],
+                    "canonical_name": canonical_name,
+                    "common_name": self._primary_common_name(english_name or canonical_name, canonical_name),
+                    "family_name": plants["family_name"][p],
+                    "synonyms": plants["synonyms"][p],
+                    "country": jurisdictions["country"][j],
+                    "region": jurisdictions["region"][j],
+                    "jurisdiction": jurisdictions["jurisdiction_type"][j],
+                    "jurisdiction_group": jurisdictions["jurisdiction_group"][j],
+                    "classification": matrix.classification[entry],
+                    "note": matrix.note[entry],
+                }
+            )
+        return results
+
+    @staticmethod
+    def _jurisdiction_sort_key(*columns: str):
+        return lambda row: tuple(sql_sort_key(row[column]) for column in columns)
+
+    # Columns of the regulation SELECTs when read from serving_regulations, which
+    # holds only web-app scoped rows and the primary common name already.
+    _SERVING_REGULATION_COLUMNS = """
+                    s.species_id,
+                    s.gbif_usage_key AS usage_key,
+                    s.canonical_name,
+                    s.common_name,
+                    s.family_name,
+                    s.synonyms,
+                    s.country,
+                    s.region,
+                    s.jurisdiction_type AS jurisdiction,
+                    s.jurisdiction_group,
+                    s.classification,
+                    s.note"""
+
+    def _serving_regulation_rows(self, conn, where: str, params: tuple, order_by: str) -> List[Dict]:
+        cursor = conn.execute(
+            f"""
+            SELECT{self._SERVING_REGULATION_COLUMNS}
+            FROM serving_regulations s
+            {where}
+            ORDER BY {order_by}
+            """,
+            params,
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_all_weeds(self) -> List[Dict]:
+        matrix = self._matrix()
+        if matrix is not None:
+            entries = matrix.in_regulation_order(range(len(matrix)))
+            return sorted(
+                self._matrix_regulation_rows(matrix, entries),
+                key=self._jurisdiction_sort_key("country", "jurisdiction", "region", "canonical_name"),
+            )
+
         conn = self.get_connection()
         try:
+            if self._table_exists(conn, "serving_regulations"):
+                return self._serving_regulation_rows(
+                    conn,
+                    "",
+                    (),
+                    "s.country, s.jurisdiction_type, s.region, s.canonical_name, s.regulation_id",
+                )
+
             cursor = conn.execute(
                 """
                 SELECT
@@ -37,8 +263,8 @@ class SpeciesDatabase(DatabaseBase):
                 FROM regulations r
                 JOIN plants p ON p.id = r.plant_id
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
-                ORDER BY j.country, j.jurisdiction_type, j.region, p.canonical_name
+                WHERE +r.is_webapp_scoped = 1
+                ORDER BY j.country, j.jurisdiction_type, j.region, p.canonical_name, r.id
                 """
             )
             results = [dict(row) for row in cursor.fetchall()]
@@ -51,20 +277,7 @@ class SpeciesDatabase(DatabaseBase):
         finally:
             conn.close()
 
-    def search_weeds(self, query: str) -> List[Dict]:
-        query = (query or "").strip().lower()
-        if not query:
-            return []
-
-        conn = self.get_connection()
-        try:
-            exact_match = query
-            starts_with = f"{query}%"
-            contains = f"%{query}%"
-
-            cursor = conn.execute(
-                """
-                SELECT
+    _SEARCH_COLUMNS = """
                     COALESCE(NULLIF(TRIM(p.english_name), ''), p.canonical_name) AS common_name,
                     p.species_id,
                     p.canonical_name,
@@ -74,33 +287,162 @@ class SpeciesDatabase(DatabaseBase):
                     p.lifeform_final,
                     p.lifespan_final,
                     p.habitat_final,
-                    p.woodiness_final,
+                    p.woodiness_final"""
+
+    def _plant_columns(self, conn) -> set:
+        if self._plant_columns_cache is not None:
+            return self._plant_columns_cache
+        rows = conn.execute("PRAGMA table_info(plants)").fetchall()
+        self._plant_columns_cache = {row["name"] for row in rows}
+        return self._plant_columns_cache
+
+    def _search_columns(self, conn) -> str:
+        """_SEARCH_COLUMNS, with a NULL species_id for releases without the column (the sample)."""
+        if "species_id" in self._plant_columns(conn):
+            return self._SEARCH_COLUMNS
+        return self._SEARCH_COLUMNS.replace("p.species_id,", "NULL AS species_id,")
+
+    # Exact name, then name prefix, then anything else; parameters are
+    # (query, query, query%, query%).
+    _SEARCH_PRIORITY = """
                     CASE
                         WHEN LOWER(COALESCE(p.english_name, '')) = ? OR LOWER(p.canonical_name) = ? THEN 3
                         WHEN LOWER(COALESCE(p.english_name, '')) LIKE ? OR LOWER(p.canonical_name) LIKE ? THEN 2
                         ELSE 1
-                    END AS search_priority
-                FROM plants p
-                WHERE p.has_current_regulation = 1
-                  AND (
-                      LOWER(COALESCE(p.english_name, '')) LIKE ?
-                      OR LOWER(p.canonical_name) LIKE ?
-                      OR LOWER(COALESCE(p.synonyms, '')) LIKE ?
-                  )
-                ORDER BY search_priority DESC, common_name ASC
-                LIMIT 20
-                """,
-                (
-                    exact_match,
-                    exact_match,
-                    starts_with,
-                    starts_with,
-                    contains,
-                    contains,
-                    contains,
-                ),
+                    END AS search_priority"""
+
+    # bm25 column weights for species_search_fts (canonical_name, english_name,
+    # synonyms, family_name): a family-name hit ranks below a name hit.
+    _FTS_WEIGHTS = (4.0, 4.0, 1.0, 0.5)
+
+    def materialize_species_search_fts(self, conn) -> int:
+        """
+        Write species_search_fts on `conn`: an FTS5 index over the plants name
+        columns (external content, rowid = plants.id), tokenized with unicode61
+        and diacritics removed, with prefix indexes for the two to four letters
+        people type before picking a species. Run at release compile; skipped
+        for schemas without the columns. Raises sqlite3.OperationalError when
+        SQLite is built without FTS5.
+        """
+        conn.execute("DROP TABLE IF EXISTS species_search_fts")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(plants)").fetchall()}
+        if not {"id", "canonical_name", "english_name", "synonyms", "family_name"} <= columns:
+            return 0
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE species_search_fts USING fts5(
+                canonical_name,
+                english_name,
+                synonyms,
+                family_name,
+                content='plants',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3 4'
             )
-            results = [dict(row) for row in cursor.fetchall()]
+            """
+        )
+        conn.execute("INSERT INTO species_search_fts(species_search_fts) VALUES ('rebuild')")
+        return conn.execute("SELECT COUNT(*) FROM plants").fetchone()[0]
+
+    @staticmethod
+    def fts_match_expression(query: str) -> Optional[str]:
+        """Every word of `query` as a quoted FTS5 prefix term, or None when it has no words."""
+        words = re.findall(r"[^\W_]+", query)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    def _search_index(self):
+        """The release's SpeciesSearchIndex, or None to search with LIKE."""
+        if self.search_index is None:
+            return None
+        return self.search_index.get(self.get_connection())
+
+    def _indexed_search(self, conn, index, query: str) -> List[Dict]:
+        hits = index.search(query)
+        if not hits:
+            return []
+        rows = conn.execute(
+            f"""
+            SELECT p.id,{self._search_columns(conn)}
+            FROM plants p
+            WHERE p.id IN ({', '.join('?' for _ in hits)})
+            """,
+            [plant_id for plant_id, _ in hits],
+        ).fetchall()
+        by_id = {row["id"]: row for row in rows}
+        results = []
+        for plant_id, priority in hits:
+            row = dict(by_id[plant_id])
+            del row["id"]
+            row["search_priority"] = priority
+            results.append(row)
+        return results
+
+    def _fts_search(self, conn, query: str) -> List[Dict]:
+        expression = self.fts_match_expression(query)
+        if expression is None:
+            return []
+        weights = ", ".join(str(weight) for weight in self._FTS_WEIGHTS)
+        cursor = conn.execute(
+            f"""
+            SELECT{self._search_columns(conn)},{self._SEARCH_PRIORITY}
+            FROM species_search_fts
+            JOIN plants p ON p.id = species_search_fts.rowid
+            WHERE species_search_fts MATCH ?
+              AND p.has_current_regulation = 1
+            ORDER BY search_priority DESC, bm25(species_search_fts, {weights}), common_name ASC, p.id ASC
+            LIMIT 20
+            """,
+            (query, query, f"{query}%", f"{query}%", expression),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def _like_search(self, conn, query: str) -> List[Dict]:
+        exact_match = query
+        starts_with = f"{query}%"
+        contains = f"%{query}%"
+
+        cursor = conn.execute(
+            f"""
+            SELECT{self._search_columns(conn)},{self._SEARCH_PRIORITY}
+            FROM plants p
+            WHERE p.has_current_regulation = 1
+              AND (
+                  LOWER(COALESCE(p.english_name, '')) LIKE ?
+                  OR LOWER(p.canonical_name) LIKE ?
+                  OR LOWER(COALESCE(p.synonyms, '')) LIKE ?
+              )
+            ORDER BY search_priority DESC, common_name ASC, p.id ASC
+            LIMIT 20
+            """,
+            (
+                exact_match,
+                exact_match,
+                starts_with,
+                starts_with,
+                contains,
+                contains,
+                contains,
+            ),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def search_weeds(self, query: str) -> List[Dict]:
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+
+        conn = self.get_connection()
+        try:
+            index = self._search_index()
+            if index is not None and index.can_answer(query):
+                results = self._indexed_search(conn, index, query)
+            elif self.search_backend == "fts5" and self._table_exists(conn, "species_search_fts"):
+                results = self._fts_search(conn, query)
+            else:
+                results = self._like_search(conn, query)
             for row in results:
                 row["common_name"] = self._primary_common_name(
                     row.get("common_name"),
@@ -110,6 +452,21 @@ class SpeciesDatabase(DatabaseBase):
         finally:
             conn.close()
 
+    def suggest_species(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Autocomplete: species with a name variant starting with `query`, from
+        the release's in-memory name list. Apart from building that list once
+        per release, no SQL runs. Until the list is built, or when it cannot be
+        (a failed build, a release without species_id), suggestions are the
+        first search_weeds rows, which carry usage_key alongside species_id.
+        """
+        index = None
+        if self.suggest_index is not None:
+            index = self.suggest_index.get(self.get_connection())
+        if index is None:
+            return [dict(row, matched_name=None) for row in self.search_weeds(query)[:limit]]
+        return index.suggest(query, limit=limit)
+
     def get_species_by_id(self, species_id: str) -> Dict:
         conn = self.get_connection()
         try:
@@ -145,8 +502,24 @@ class SpeciesDatabase(DatabaseBase):
             conn.close()
 
     def get_weeds_by_usage_key(self, usage_key: int) -> List[Dict]:
+        matrix = self._matrix()
+        if matrix is not None:
+            entries = matrix.plant_entries(matrix.plants_where("gbif_usage_key", usage_key))
+            return sorted(
+                self._matrix_regulation_rows(matrix, matrix.in_regulation_order(entries)),
+                key=self._jurisdiction_sort_key("country", "jurisdiction", "region"),
+            )
+
         conn = self.get_connection()
         try:
+            if self._table_exists(conn, "serving_regulations"):
+                return self._serving_regulation_rows(
+                    conn,
+                    "WHERE s.gbif_usage_key = ?",
+                    (usage_key,),
+                    "s.country, s.jurisdiction_type, s.region, s.regulation_id",
+                )
+
             cursor = conn.execute(
                 """
                 SELECT
@@ -162,12 +535,12 @@ class SpeciesDatabase(DatabaseBase):
                     j.jurisdiction_group,
                     r.classification,
                     r.note
-                FROM regulations r
-                JOIN plants p ON p.id = r.plant_id
+                FROM plants p
+                CROSS JOIN regulations r ON r.plant_id = p.id
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
                 WHERE p.gbif_usage_key = ?
-                  AND r.is_webapp_scoped = 1
-                ORDER BY j.country, j.jurisdiction_type, j.region
+                  AND +r.is_webapp_scoped = 1
+                ORDER BY j.country, j.jurisdiction_type, j.region, r.id
                 """,
                 (usage_key,),
             )
@@ -182,8 +555,24 @@ class SpeciesDatabase(DatabaseBase):
             conn.close()
 
     def get_weeds_by_species_id(self, species_id: str) -> List[Dict]:
+        matrix = self._matrix()
+        if matrix is not None:
+            entries = matrix.plant_entries(matrix.plants_where("species_id", species_id))
+            return sorted(
+                self._matrix_regulation_rows(matrix, matrix.in_regulation_order(entries)),
+                key=self._jurisdiction_sort_key("country", "jurisdiction", "region"),
+            )
+
         conn = self.get_connection()
         try:
+            if self._table_exists(conn, "serving_regulations"):
+                return self._serving_regulation_rows(
+                    conn,
+                    "WHERE s.species_id = ?",
+                    (species_id,),
+                    "s.country, s.jurisdiction_type, s.region, s.regulation_id",
+                )
+
             cursor = conn.execute(
                 """
                 SELECT
@@ -199,12 +588,12 @@ class SpeciesDatabase(DatabaseBase):
                     j.jurisdiction_group,
                     r.classification,
                     r.note
-                FROM regulations r
-                JOIN plants p ON p.id = r.plant_id
+                FROM plants p
+                CROSS JOIN regulations r ON r.plant_id = p.id
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
                 WHERE p.species_id = ?
-                  AND r.is_webapp_scoped = 1
-                ORDER BY j.country, j.jurisdiction_type, j.region
+                  AND +r.is_webapp_scoped = 1
+                ORDER BY j.country, j.jurisdiction_type, j.region, r.id
                 """,
                 (species_id,),
             )
@@ -219,18 +608,73 @@ class SpeciesDatabase(DatabaseBase):
             conn.close()
 
     def get_states_by_weed(self, weed_name: str) -> List[str]:
+        matrix = self._matrix()
+        if matrix is not None:
+            if weed_name is None:
+                return []
+            jurisdictions = matrix.jurisdictions
+            rows = {
+                (
+                    jurisdictions["region"][j],
+                    jurisdictions["country"][j],
+                    jurisdictions["jurisdiction_type"][j],
+                )
+                for j in (
+                    matrix.entry_jurisdiction[entry]
+                    for entry in matrix.plant_entries(matrix.plants_named(weed_name))
+                )
+            }
+            rows = [dict(zip(("region", "country", "jurisdiction"), row)) for row in rows]
+            rows.sort(key=self._jurisdiction_sort_key("country", "jurisdiction", "region"))
+            return self._format_weed_states(rows)
+
         conn = self.get_connection()
         try:
+            has_serving = self._table_exists(conn, "serving_regulations")
+            if has_serving and self._table_exists(conn, "plant_names"):
+                rows = conn.execute(
+                    """
+                    SELECT DISTINCT
+                        s.region,
+                        s.country,
+                        s.jurisdiction_type AS jurisdiction
+                    FROM plant_names n
+                    JOIN serving_regulations s ON s.plant_id = n.plant_id
+                    WHERE n.name_norm = LOWER(?)
+                    ORDER BY s.country, s.jurisdiction_type, s.region
+                    """,
+                    (weed_name,),
+                ).fetchall()
+                return self._format_weed_states(rows)
+
+            if self._table_exists(conn, "plant_names"):
+                rows = conn.execute(
+                    """
+                    SELECT DISTINCT
+                        j.region,
+                        j.country,
+                        j.jurisdiction_type AS jurisdiction
+                    FROM plant_names n
+                    JOIN regulations r ON r.plant_id = n.plant_id
+                    JOIN jurisdictions j ON j.id = r.jurisdiction_id
+                    WHERE n.name_norm = LOWER(?)
+                      AND +r.is_webapp_scoped = 1
+                    ORDER BY j.country, j.jurisdiction_type, j.region
+                    """,
+                    (weed_name,),
+                ).fetchall()
+                return self._format_weed_states(rows)
+
             rows = conn.execute(
                 """
                 SELECT DISTINCT
                     j.region,
                     j.country,
                     j.jurisdiction_type AS jurisdiction
-                FROM regulations r
-                JOIN plants p ON p.id = r.plant_id
+                FROM plants p
+                CROSS JOIN regulations r ON r.plant_id = p.id
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
+                WHERE +r.is_webapp_scoped = 1
                   AND (
                       LOWER(COALESCE(p.english_name, '')) = LOWER(?)
                       OR LOWER(p.canonical_name) = LOWER(?)
@@ -239,36 +683,71 @@ class SpeciesDatabase(DatabaseBase):
                 """,
                 (weed_name, weed_name),
             ).fetchall()
-
-            formatted = []
-            for row in rows:
-                country = row["country"]
-                jurisdiction = row["jurisdiction"]
-                region = row["region"]
-
-                if jurisdiction == "national":
-                    formatted.append(f"National ({country})")
-                elif jurisdiction == "international":
-                    formatted.append(f"International ({country})")
-                elif region:
-                    formatted.append(region)
-
-            seen = set()
-            out = []
-            for item in formatted:
-                if item not in seen:
-                    out.append(item)
-                    seen.add(item)
-            return out
+            return self._format_weed_states(rows)
         finally:
             conn.close()
 
+    @staticmethod
+    def _format_weed_states(rows) -> List[str]:
+        formatted = []
+        for row in rows:
+            country = row["country"]
+            jurisdiction = row["jurisdiction"]
+            region = row["region"]
+
+            if jurisdiction == "national":
+                formatted.append(f"National ({country})")
+            elif jurisdiction == "international":
+                formatted.append(f"International ({country})")
+            elif region:
+                formatted.append(region)
+
+        seen = set()
+        out = []
+        for item in formatted:
+            if item not in seen:
+                out.append(item)
+                seen.add(item)
+        return out
+
     def _get_states_by_plant_column(self, column: str, value) -> Dict[str, List[str]]:
         if column not in {"species_id", "gbif_usage_key"}:
             raise ValueError(f"Unsupported plant lookup column: {column}")
 
+        matrix = self._matrix()
+        if matrix is not None:
+            jurisdictions = matrix.jurisdictions
+            rows = set()
+            for entry in matrix.plant_entries(matrix.plants_where(column, value)):
+                j = matrix.entry_jurisdiction[entry]
+                jurisdiction = jurisdictions["jurisdiction_type"][j]
+                group = jurisdictions["jurisdiction_group"][j]
+                if jurisdiction == "international" and sql_trim(group or "") != "":
+                    country_key = group
+                else:
+                    country_key = jurisdictions["country"][j]
+                rows.add((country_key, jurisdiction, jurisdictions["region"][j]))
+            rows = [dict(zip(("country_key", "jurisdiction", "region"), row)) for row in rows]
+            rows.sort(key=self._jurisdiction_sort_key("country_key", "jurisdiction", "region"))
+            return self._group_states_by_country(rows)
+
         conn = self.get_connection()
         try:
+            if self._table_exists(conn, "serving_regulations"):
+                cursor = conn.execute(
+                    f"""
+                    SELECT DISTINCT
+                        s.country_key,
+                        s.jurisdiction_type AS jurisdiction,
+                        s.region
+                    FROM serving_regulations s
+                    WHERE s.{column} = ?
+                    ORDER BY country_key, jurisdiction, region
+                    """,
+                    (value,),
+                )
+                return self._group_states_by_country(cursor.fetchall())
+
             cursor = conn.execute(
                 f"""
                 SELECT DISTINCT
@@ -280,43 +759,45 @@ class SpeciesDatabase(DatabaseBase):
                     END AS country_key,
                     j.jurisdiction_type AS jurisdiction,
                     j.region
-                FROM regulations r
-                JOIN plants p ON p.id = r.plant_id
+                FROM plants p
+                CROSS JOIN regulations r ON r.plant_id = p.id
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
                 WHERE p.{column} = ?
-                  AND r.is_webapp_scoped = 1
+                  AND +r.is_webapp_scoped = 1
                 ORDER BY country_key, jurisdiction, region
                 """,
                 (value,),
             )
-            results = cursor.fetchall()
-
-            regulations_by_country: Dict[str, List[str]] = {}
-            for row in results:
-                country = row["country_key"]
-                jurisdiction = row["jurisdiction"]
-                region = row["region"]
-
-                if not country:
-                    continue
-
-                if country not in regulations_by_country:
-                    regulations_by_country[country] = []
-
-                if jurisdiction == "national":
-                    if "National Level" not in regulations_by_country[country]:
-                        regulations_by_country[country].append("National Level")
-                elif jurisdiction == "international":
-                    if "International Level" not in regulations_by_country[country]:
-                        regulations_by_country[country].append("International Level")
-                elif jurisdiction == "region" and region:
-                    if region not in regulations_by_country[country]:
-                        regulations_by_country[country].append(region)
-
-            return regulations_by_country
+            return self._group_states_by_country(cursor.fetchall())
         finally:
             conn.close()
 
+    @staticmethod
+    def _group_states_by_country(rows) -> Dict[str, List[str]]:
+        regulations_by_country: Dict[str, List[str]] = {}
+        for row in rows:
+            country = row["country_key"]
+            jurisdiction = row["jurisdiction"]
+            region = row["region"]
+
+            if not country:
+                continue
+
+            if country not in regulations_by_country:
+                regulations_by_country[country] = []
+
+            if jurisdiction == "national":
+                if "National Level" not in regulations_by_country[country]:
+                    regulations_by_country[country].append("National Level")
+            elif jurisdiction == "international":
+                if "International Level" not in regulations_by_country[country]:
+                    regulations_by_country[country].append("International Level")
+            elif jurisdiction == "region" and region:
+                if region not in regulations_by_country[country]:
+                    regulations_by_country[country].append(region)
+
+        return regulations_by_country
+
     def get_states_by_species_id(self, species_id: str) -> Dict[str, List[str]]:
         return self._get_states_by_plant_column("species_id", species_id)
 
@@ -0,0 +1,192 @@
+"""In-process trigram index for species search, one per data release.
+
+search_weeds matches the typed text as a substring of english_name,
+canonical_name or synonyms (ASCII-lowered, as SQLite LOWER() does) and ranks
+exact matches first, then prefix matches, then the rest, each by common name.
+Done with LIKE that is a scan of plants on every keystroke; here:
+
+  - plants with a current regulation get ordinals in (common_name, id) order,
+    so every list below is already in result order;
+  - exact and prefix matches on english_name/canonical_name come from a dict
+    and a sorted name list (bisect);
+  - substring matches come from trigram posting lists: the rarest trigram of
+    the query gives the candidates, the other lists are probed with bisect and
+    each survivor is checked against the names, stopping once the page is full.
+
+Fields are indexed with a trailing NUL so two-letter queries (select2 sends
+from two characters) are the prefix of at least one trigram.
+
+The SQL query stays the fallback and the reference for anything the index
+cannot answer exactly (LIKE wildcards in the query, schemas without
+species_id or has_current_regulation).
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+from app.utils.regulation_matrix import sql_lower
+from app.utils.release_structures import SharedReleaseStructure, has_columns
+
+# Characters a LIKE pattern or the field separator would interpret.
+_UNINDEXABLE = ("%", "_", "\x00")
+
+
+def _trigrams(text: str):
+    padded = f"{text}\x00"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with `prefix`."""
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(last + 1)
+
+
+# plants columns read by this index and by the suggest index.
+INDEXED_PLANT_COLUMNS = ("id", "species_id", "english_name", "canonical_name", "synonyms", "has_current_regulation")
+
+
+class SpeciesSearchIndex:
+
+    def __init__(self):
+        self.plant_ids = array("q")
+        self._documents: List[str] = []
+        self._exact = {}
+        self._prefix_names: List[str] = []
+        self._prefix_ordinals = array("i")
+        self._postings = {}
+        self._trigram_keys: List[str] = []
+
+    @classmethod
+    def from_connection(cls, conn) -> Optional["SpeciesSearchIndex"]:
+        if not has_columns(conn, "plants", INDEXED_PLANT_COLUMNS):
+            return None
+        index = cls()
+        rows = conn.execute(
+            """
+            SELECT
+                p.id,
+                p.english_name,
+                p.canonical_name,
+                p.synonyms,
+                COALESCE(NULLIF(TRIM(p.english_name), ''), p.canonical_name) AS common_name
+            FROM plants p
+            WHERE p.has_current_regulation = 1
+            ORDER BY common_name, p.id
+            """
+        ).fetchall()
+
+        exact = defaultdict(list)
+        prefix = []
+        postings = defaultdict(list)
+        for ordinal, (plant_id, english_name, canonical_name, synonyms, _) in enumerate(rows):
+            english = sql_lower(english_name or "")
+            canonical = sql_lower(canonical_name or "")
+            synonyms = sql_lower(synonyms or "")
+            index.plant_ids.append(plant_id)
+            index._documents.append(f"{english}\x00{canonical}\x00{synonyms}")
+            for name in {english, canonical}:
+                if name:
+                    exact[name].append(ordinal)
+                    prefix.append((name, ordinal))
+            trigrams = set()
+            for field in (english, canonical, synonyms):
+                if field:
+                    trigrams |= _trigrams(field)
+            for trigram in trigrams:
+                postings[trigram].append(ordinal)
+
+        prefix.sort()
+        index._exact = dict(exact)
+        index._prefix_names = [name for name, _ in prefix]
+        index._prefix_ordinals = array("i", (ordinal for _, ordinal in prefix))
+        index._postings = {trigram: array("i", ordinals) for trigram, ordinals in postings.items()}
+        index._trigram_keys = sorted(index._postings)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.plant_ids)
+
+    @staticmethod
+    def can_answer(query: str) -> bool:
+        return bool(query) and not any(char in query for char in _UNINDEXABLE)
+
+    def _prefix_matches(self, query: str) -> List[int]:
+        lo = bisect_left(self._prefix_names, query)
+        bound = _prefix_bound(query)
+        hi = bisect_left(self._prefix_names, bound) if bound is not None else len(self._prefix_names)
+        return self._prefix_ordinals[lo:hi]
+
+    def _substring_candidates(self, query: str):
+        """Ordinals that may contain `query`, ascending; a superset of the matches."""
+        if len(query) >= 3:
+            lists = []
+            for trigram in _trigrams(query):
+                if trigram.endswith("\x00"):
+                    continue
+                posting = self._postings.get(trigram)
+                if posting is None:
+                    return
+                lists.append(posting)
+            lists.sort(key=len)
+            rarest, others = lists[0], lists[1:]
+            for ordinal in rarest:
+                for posting in others:
+                    position = bisect_left(posting, ordinal)
+                    if position == len(posting) or posting[position] != ordinal:
+                        break
+                else:
+                    yield ordinal
+            return
+
+        if len(query) == 2:
+            lo = bisect_left(self._trigram_keys, query)
+            bound = _prefix_bound(query)
+            hi = bisect_left(self._trigram_keys, bound) if bound is not None else len(self._trigram_keys)
+            previous = None
+            for ordinal in heapq.merge(*(self._postings[key] for key in self._trigram_keys[lo:hi])):
+                if ordinal != previous:
+                    previous = ordinal
+                    yield ordinal
+            return
+
+        yield from range(len(self.plant_ids))
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, int]]:
+        """
+        (plant_id, search_priority) for the first `limit` matches of an already
+        lowered query, in search_weeds order. Check can_answer() first.
+        """
+        exact = sorted(set(self._exact.get(query, ())))
+        ranked = [(ordinal, 3) for ordinal in exact[:limit]]
+        taken = set(exact)
+
+        if len(ranked) < limit:
+            prefix = set(self._prefix_matches(query)) - taken
+            ranked.extend((ordinal, 2) for ordinal in heapq.nsmallest(limit - len(ranked), prefix))
+            taken |= prefix
+
+        if len(ranked) < limit:
+            documents = self._documents
+            for ordinal in self._substring_candidates(query):
+                if ordinal not in taken and query in documents[ordinal]:
+                    ranked.append((ordinal, 1))
+                    if len(ranked) == limit:
+                        break
+
+        return [(self.plant_ids[ordinal], priority) for ordinal, priority in ranked]
+
+
+class SharedSpeciesSearchIndex(SharedReleaseStructure):
+    """
+    Holds the search index for one release; None (release cannot be indexed,
+    or still building) means search_weeds uses SQL.
+    """
+
+    structure = SpeciesSearchIndex
+    label = "Species search index"
@@ -0,0 +1,120 @@
+"""In-process name list for species autocomplete, one per data release.
+
+Every name variant of a regulated plant (each comma-separated English common
+name, the canonical name, each synonym) is normalized (accents removed,
+casefolded, whitespace collapsed) into one sorted list. A typed prefix is then
+a bisect range of that list; walking it in order and keeping the first entry
+per species gives the suggestions, so a request costs O(log n + k) and never
+touches SQLite. Only building the list (once per release) reads the database.
+"""
+
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from app.utils.release_structures import SharedReleaseStructure, has_columns
+from app.utils.species_database import SpeciesDatabase
+from app.utils.species_search_index import INDEXED_PLANT_COLUMNS
+
+
+def normalize_name(value: str) -> str:
+    value = value or ""
+    if not value.isascii():
+        decomposed = unicodedata.normalize("NFKD", value)
+        value = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(value.casefold().split())
+
+
+class SpeciesSuggestIndex:
+    def __init__(self):
+        self.species_ids: List[str] = []
+        self.common_names: List[str] = []
+        self.canonical_names: List[str] = []
+        self._names: List[str] = []
+        self._matched_names: List[str] = []
+        self._entry_species = array("i")
+
+    @classmethod
+    def from_connection(cls, conn) -> Optional["SpeciesSuggestIndex"]:
+        if not has_columns(conn, "plants", INDEXED_PLANT_COLUMNS):
+            return None
+        index = cls()
+        entries = []
+        rows = conn.execute(
+            """
+            SELECT species_id, english_name, canonical_name, synonyms
+            FROM plants
+            WHERE has_current_regulation = 1
+              AND species_id IS NOT NULL
+            ORDER BY species_id, id
+            """
+        ).fetchall()
+        seen = set()
+        for species_id, english_name, canonical_name, synonyms in rows:
+            if species_id in seen:
+                continue
+            seen.add(species_id)
+            ordinal = len(index.species_ids)
+            common_name = SpeciesDatabase._primary_common_name(english_name, canonical_name)
+            index.species_ids.append(species_id)
+            index.common_names.append(common_name)
+            index.canonical_names.append(canonical_name)
+
+            variants = [part.strip() for part in (english_name or "").split(",")]
+            variants.append((canonical_name or "").strip())
+            variants.extend(part.strip() for part in (synonyms or "").split(","))
+            names = set()
+            for variant in variants:
+                name = normalize_name(variant)
+                if name and name not in names:
+                    names.add(name)
+                    entries.append((name, common_name or "", species_id, ordinal, variant))
+
+        entries.sort()
+        index._names = [entry[0] for entry in entries]
+        index._matched_names = [entry[4] for entry in entries]
+        index._entry_species = array("i", (entry[3] for entry in entries))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Up to `limit` species with a name starting with `query`, in name order
+        (so an exact name comes first), one entry per species.
+        """
+        prefix = normalize_name(query)
+        if not prefix or limit < 1:
+            return []
+        names = self._names
+        results = []
+        seen = set()
+        position = bisect_left(names, prefix)
+        while position < len(names) and names[position].startswith(prefix):
+            ordinal = self._entry_species[position]
+            if ordinal not in seen:
+                seen.add(ordinal)
+                results.append(
+                    {
+                        "species_id": self.species_ids[ordinal],
+                        "common_name": self.common_names[ordinal],
+                        "canonical_name": self.canonical_names[ordinal],
+                        "matched_name": self._matched_names[position],
+                    }
+                )
+                if len(results) == limit:
+                    break
+            position += 1
+        return results
+
+
+class SharedSpeciesSuggestIndex(SharedReleaseStructure):
+    """
+    Holds the suggest list for one release; None (release lacks species_id or
+    has_current_regulation, or still building) means no suggestions.
+    """
+
+    structure = SpeciesSuggestIndex
+    label = "Species suggest index"
@@ -1,9 +1,14 @@
+import copy
+import itertools
 import json
 import os
 import re
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from app.utils.database_base import DatabaseBase
+from app.utils.geojson_stream import iter_feature_properties
+from app.utils.plant_bitmap import PlantBitmap, PlantOrdinals
+from app.utils.regulation_matrix import sql_trim
 
 EU_MEMBERS = {
     "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czechia",
@@ -13,16 +18,58 @@ EU_MEMBERS = {
     "Slovenia", "Spain", "Sweden"
 }
 
+# International group membership used when a release has no
+# jurisdiction_group_members table (columns: jurisdiction_group, country).
+DEFAULT_GROUP_MEMBERS = {"EU": EU_MEMBERS}
+
+EMPTY_BITMAP = PlantBitmap.from_ordinals(())
+
+
+class RegulationBitmaps(NamedTuple):
+    """Scoped plant sets for one data version, shared by map counts and region detail."""
+
+    region: Dict[object, PlantBitmap]
+    national: Dict[str, PlantBitmap]
+    groups: Dict[str, PlantBitmap]
+    country_groups: Dict[str, Tuple[str, ...]]
+    international: Dict[str, PlantBitmap]
+    covered_countries: frozenset
+    mapped_region_meta: Dict[object, Dict]
+    keyed_by_geo_region_id: bool
+
 
 class StateDatabase(DatabaseBase):
     """Region-level map + table queries using normalized schema."""
 
-    def __init__(self, db_path: str = "weeds.db", geojson_dir: str = None):
-        super().__init__(db_path=db_path, geojson_dir=geojson_dir)
+    def __init__(
+        self,
+        db_path: str = "weeds.db",
+        geojson_dir: str = None,
+        immutable: bool = False,
+        pragmas: Optional[Dict[str, int]] = None,
+        memory_uri: Optional[str] = None,
+        regulation_matrix=None,
+    ):
+        super().__init__(
+            db_path=db_path,
+            geojson_dir=geojson_dir,
+            immutable=immutable,
+            pragmas=pragmas,
+            memory_uri=memory_uri,
+            regulation_matrix=regulation_matrix,
+        )
         self._geo_regions_cache: Optional[List[Dict]] = None
         self._geo_regions_signature: Optional[Tuple] = None
+        self._geo_regions_db_signature: Optional[Tuple] = None
+        self._geo_regions_by_id: Dict[str, Dict] = {}
+        self._geo_regions_by_key: Dict[Tuple[str, str], Dict] = {}
+        self._geo_regions_by_country: Dict[str, List[Dict]] = {}
         self._jurisdiction_columns_cache: Optional[set] = None
         self._plant_columns_cache: Optional[set] = None
+        self._geo_region_columns_cache: Optional[set] = None
+        self._region_counts_cache: Dict[Tuple, Tuple] = {}
+        self._bitmaps_cache: Optional[Tuple] = None
+        self._highlight_metrics_cache: Optional[Tuple] = None
 
     COUNTRY_NAME_ALIASES = {
         "federal republic of germany": "Germany",
@@ -32,6 +79,9 @@ class StateDatabase(DatabaseBase):
         "united states of america": "United States",
     }
 
+    # Every includeRegion/includeNational/includeInternational combination.
+    REGION_COUNT_TOGGLES = tuple(itertools.product((True, False), repeat=3))
+
     REGION_NAME_CANDIDATES = (
         "region",
         "REGION",
@@ -124,23 +174,20 @@ class StateDatabase(DatabaseBase):
         except OSError:
             return ("db", 0)
 
-    def _table_exists(self, conn, table_name: str) -> bool:
-        row = conn.execute(
-            """
-            SELECT 1
-            FROM sqlite_master
-            WHERE type = 'table' AND name = ?
-            LIMIT 1
-            """,
-            (table_name,),
-        ).fetchone()
-        return bool(row)
-
     def _load_geo_regions_from_db(self) -> List[Dict]:
         conn = self.get_connection()
         try:
             if not self._table_exists(conn, "geo_regions"):
-                return []
+                if not self._table_exists(conn, "geo_regions_discovered"):
+                    return []
+                rows = conn.execute(
+                    """
+                    SELECT geo_region_id, geojson_slug, country, region, display_name, jurisdiction_uid
+                    FROM geo_regions_discovered
+                    ORDER BY position ASC
+                    """
+                ).fetchall()
+                return [dict(row) for row in rows]
             rows = conn.execute(
                 """
                 SELECT
@@ -178,26 +225,37 @@ class StateDatabase(DatabaseBase):
 
     def _load_geo_regions(self) -> List[Dict]:
         db_signature = self._geo_regions_signature_for_db()
-        if db_signature == self._geo_regions_signature and self._geo_regions_cache is not None:
-            return self._geo_regions_cache
+        if self._geo_regions_cache is not None:
+            if db_signature == self._geo_regions_signature:
+                return self._geo_regions_cache
+            # Loaded from GeoJSON: an unchanged release DB still has no
+            # geo_regions table, so only the directory needs re-checking.
+            if db_signature == self._geo_regions_db_signature:
+                signature = self._geo_regions_signature_for_dir(self.geojson_dir or "")
+                if signature == self._geo_regions_signature:
+                    return self._geo_regions_cache
 
         db_regions = self._load_geo_regions_from_db()
         if db_regions:
-            self._geo_regions_cache = db_regions
-            self._geo_regions_signature = db_signature
+            self._set_geo_regions(db_regions, db_signature, db_signature)
             return db_regions
 
         geojson_dir = self.geojson_dir or ""
         signature = self._geo_regions_signature_for_dir(geojson_dir)
         if signature == self._geo_regions_signature and self._geo_regions_cache is not None:
+            self._geo_regions_db_signature = db_signature
             return self._geo_regions_cache
 
+        regions = self._discover_geo_regions(geojson_dir)
+        self._set_geo_regions(regions, signature, db_signature)
+        return regions
+
+    def _discover_geo_regions(self, geojson_dir: str) -> List[Dict]:
+        """Map regions from GeoJSON feature properties, for releases without geo_regions."""
         regions: List[Dict] = []
         seen_ids = set()
         if not geojson_dir or not os.path.isdir(geojson_dir):
-            self._geo_regions_cache = []
-            self._geo_regions_signature = signature
-            return []
+            return regions
 
         for filename in sorted(os.listdir(geojson_dir)):
             if not filename.lower().endswith(".geojson"):
@@ -207,13 +265,12 @@ class StateDatabase(DatabaseBase):
             file_path = os.path.join(geojson_dir, filename)
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    payload = json.load(f)
+                # Properties only; geometry is skipped without being decoded.
+                feature_properties = list(iter_feature_properties(file_path))
             except Exception:
                 continue
 
-            for feature in payload.get("features", []):
-                props = feature.get("properties") or {}
+            for props in feature_properties:
                 region = self._extract_region_name_from_props(props, country)
                 if not country or not region:
                     continue
@@ -232,12 +289,76 @@ class StateDatabase(DatabaseBase):
                     }
                 )
 
+        return regions
+
+    def materialize_discovered_geo_regions(self, conn) -> int:
+        """
+        Store the GeoJSON-discovered region list in geo_regions_discovered on
+        `conn`, so workers read it instead of scanning boundary files. Releases
+        that ship their own geo_regions mapping are left alone. Run at release install.
+        """
+        if self._table_exists(conn, "geo_regions"):
+            return 0
+        regions = self._discover_geo_regions(self.geojson_dir or "")
+
+        conn.execute("DROP TABLE IF EXISTS geo_regions_discovered")
+        conn.execute(
+            """
+            CREATE TABLE geo_regions_discovered (
+                position INTEGER PRIMARY KEY,
+                geo_region_id TEXT NOT NULL,
+                geojson_slug TEXT,
+                country TEXT,
+                region TEXT,
+                display_name TEXT,
+                jurisdiction_uid TEXT
+            )
+            """
+        )
+        conn.executemany(
+            """
+            INSERT INTO geo_regions_discovered (
+                position, geo_region_id, geojson_slug, country, region, display_name, jurisdiction_uid
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    position,
+                    row["geo_region_id"],
+                    row["geojson_slug"],
+                    row["country"],
+                    row["region"],
+                    row["display_name"],
+                    row["jurisdiction_uid"],
+                )
+                for position, row in enumerate(regions)
+            ],
+        )
+        return len(regions)
+
+    def _set_geo_regions(self, regions: List[Dict], signature: Optional[Tuple], db_signature: Optional[Tuple]):
+        """Cache the region list with its lookup indexes; all share one signature."""
+        by_key: Dict[Tuple[str, str], Dict] = {}
+        by_country: Dict[str, List[Dict]] = defaultdict(list)
+        for row in regions:
+            by_key.setdefault(self._region_key(row["country"], row["region"]), row)
+            by_country[row["country"]].append(row)
+
         self._geo_regions_cache = regions
         self._geo_regions_signature = signature
-        return regions
+        self._geo_regions_db_signature = db_signature
+        self._geo_regions_by_id = {row["geo_region_id"]: row for row in regions}
+        self._geo_regions_by_key = by_key
+        self._geo_regions_by_country = dict(by_country)
 
     def _geo_region_index(self) -> Dict[str, Dict]:
-        return {row["geo_region_id"]: row for row in self._load_geo_regions()}
+        self._load_geo_regions()
+        return self._geo_regions_by_id
+
+    def geo_regions_for_country(self, country: str) -> List[Dict]:
+        self._load_geo_regions()
+        return list(self._geo_regions_by_country.get(self._canonical_country_name(country), []))
 
     def _jurisdiction_columns(self, conn) -> set:
         if self._jurisdiction_columns_cache is not None:
@@ -259,392 +380,789 @@ class StateDatabase(DatabaseBase):
     def _supports_plant_column(self, conn, name: str) -> bool:
         return name in self._plant_columns(conn)
 
+    def _geo_region_columns(self, conn) -> set:
+        if self._geo_region_columns_cache is not None:
+            return self._geo_region_columns_cache
+        rows = conn.execute("PRAGMA table_info(geo_regions)").fetchall()
+        self._geo_region_columns_cache = {row["name"] for row in rows}
+        return self._geo_region_columns_cache
+
+    def _has_normalized_uids(self, conn) -> bool:
+        """True when release install added indexed jurisdiction_uid_norm columns."""
+        return (
+            self._supports_jurisdiction_column(conn, "jurisdiction_uid_norm")
+            and "jurisdiction_uid_norm" in self._geo_region_columns(conn)
+        )
+
+    def _geo_region_uid_join(self, conn) -> str:
+        if self._has_normalized_uids(conn):
+            return "j.jurisdiction_uid_norm = gr.jurisdiction_uid_norm"
+        return "LOWER(TRIM(j.jurisdiction_uid)) = LOWER(TRIM(gr.jurisdiction_uid))"
+
+    def _jurisdiction_uid_match(self, conn, value_expr: str = "?") -> str:
+        if self._supports_jurisdiction_column(conn, "jurisdiction_uid_norm"):
+            return f"j.jurisdiction_uid_norm = LOWER(TRIM({value_expr}))"
+        return f"LOWER(TRIM(j.jurisdiction_uid)) = LOWER(TRIM({value_expr}))"
+
+    def uid_match_queries(self, conn) -> Dict[str, Tuple[str, tuple]]:
+        """The uid predicates used by map counts and region detail, for plan checks."""
+        return {
+            "geo_region_join": (
+                f"""
+                SELECT gr.geo_region_id, r.plant_id
+                FROM geo_regions gr
+                CROSS JOIN jurisdictions j
+                  ON {self._geo_region_uid_join(conn)}
+                 AND j.jurisdiction_type = 'region'
+                JOIN regulations r
+                  ON r.jurisdiction_id = j.id
+                 AND +r.is_webapp_scoped = 1
+                """,
+                (),
+            ),
+            "region_uid_lookup": (
+                f"""
+                WITH wanted(uid) AS (VALUES (?))
+                SELECT j.id
+                FROM wanted
+                JOIN jurisdictions j
+                  ON {self._jurisdiction_uid_match(conn, "wanted.uid")}
+                 AND j.jurisdiction_type = 'region'
+                """,
+                ("",),
+            ),
+        }
+
+    @staticmethod
+    def normalize_jurisdiction_uids(conn) -> List[str]:
+        """
+        Add indexed jurisdiction_uid_norm = LOWER(TRIM(jurisdiction_uid)) columns
+        to jurisdictions and geo_regions on `conn`, so uid matches can be served
+        by an index. Run at release install; returns the tables updated.
+        """
+        updated = []
+        for table, index_name, index_columns in (
+            ("jurisdictions", "idx_jurisdictions_uid_norm", "jurisdiction_uid_norm, jurisdiction_type"),
+            ("geo_regions", "idx_geo_regions_uid_norm", "jurisdiction_uid_norm"),
+        ):
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+            if "jurisdiction_uid" not in columns:
+                continue
+            if "jurisdiction_uid_norm" not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN jurisdiction_uid_norm TEXT")
+            conn.execute(f"UPDATE {table} SET jurisdiction_uid_norm = LOWER(TRIM(jurisdiction_uid))")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({index_columns})")
+            updated.append(table)
+        return updated
+
     def _fallback_jurisdiction_uid(self, country: str, region: str, j_type: str) -> str:
         country_part = self._slugify(country)
         region_part = self._slugify(region) if region else "country"
         return f"{j_type}:{country_part}:{region_part}"
 
+    HIGHLIGHT_COUNT_KEYS = ("species_count", "regulation_count", "jurisdiction_count")
+
     def get_highlight_metrics(self, include_counts: bool = True) -> Dict:
+        """
+        Home-page highlight metrics. Computed once per data version (read from
+        the release_highlight_metrics table written at install, else queried)
+        and served from memory afterwards.
+        """
+        signature = self._geo_regions_signature_for_db()
+        if self._highlight_metrics_cache is None or self._highlight_metrics_cache[0] != signature:
+            metrics = self._load_materialized_highlight_metrics()
+            if metrics is None:
+                conn = self.get_connection()
+                try:
+                    metrics = self._compute_highlight_metrics(conn)
+                finally:
+                    conn.close()
+            self._highlight_metrics_cache = (signature, metrics)
+
+        metrics = copy.deepcopy(self._highlight_metrics_cache[1])
+        if not include_counts:
+            for key in self.HIGHLIGHT_COUNT_KEYS:
+                metrics[key] = None
+        return metrics
+
+    def materialize_highlight_metrics(self, conn) -> Dict:
+        """Store the highlight metrics snapshot on `conn`. Run at release install."""
+        metrics = self._compute_highlight_metrics(conn)
+        conn.execute("DROP TABLE IF EXISTS release_highlight_metrics")
+        conn.execute(
+            """
+            CREATE TABLE release_highlight_metrics (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                metrics TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO release_highlight_metrics (id, metrics) VALUES (1, ?)",
+            (json.dumps(metrics),),
+        )
+        return metrics
+
+    def _load_materialized_highlight_metrics(self) -> Optional[Dict]:
         conn = self.get_connection()
         try:
-            species_count = None
-            regulation_count = None
-            jurisdiction_count = None
-
-            if include_counts:
-                species_count = conn.execute(
-                    """
-                    SELECT COUNT(*) AS count
-                    FROM plants
-                    """
-                ).fetchone()["count"] or 0
-
-                regulation_count = conn.execute(
-                    """
-                    SELECT COUNT(*) AS count
-                    FROM regulations
-                    WHERE is_webapp_scoped = 1
-                    """
-                ).fetchone()["count"] or 0
-
-                region_j = conn.execute(
-                    """
-                    SELECT COUNT(DISTINCT j.country || '::' || j.region) AS count
-                    FROM jurisdictions j
-                    WHERE j.jurisdiction_type = 'region'
-                      AND j.country IS NOT NULL AND TRIM(j.country) != ''
-                      AND j.region IS NOT NULL AND TRIM(j.region) != ''
-                      AND EXISTS (
-                          SELECT 1
-                          FROM regulations r
-                          WHERE r.jurisdiction_id = j.id
-                            AND r.is_webapp_scoped = 1
-                      )
-                    """
-                ).fetchone()["count"] or 0
-
-                national_j = conn.execute(
-                    """
-                    SELECT COUNT(DISTINCT j.country) AS count
-                    FROM jurisdictions j
-                    WHERE j.jurisdiction_type = 'national'
-                      AND j.country IS NOT NULL AND TRIM(j.country) != ''
-                      AND EXISTS (
-                          SELECT 1
-                          FROM regulations r
-                          WHERE r.jurisdiction_id = j.id
-                            AND r.is_webapp_scoped = 1
-                      )
-                    """
-                ).fetchone()["count"] or 0
-
-                international_j = conn.execute(
-                    """
-                    SELECT COUNT(
-                        DISTINCT COALESCE(NULLIF(TRIM(j.jurisdiction_group), ''), NULLIF(TRIM(j.country), ''), 'International')
-                    ) AS count
-                    FROM jurisdictions j
-                    WHERE j.jurisdiction_type = 'international'
-                      AND EXISTS (
-                          SELECT 1
-                          FROM regulations r
-                          WHERE r.jurisdiction_id = j.id
-                            AND r.is_webapp_scoped = 1
-                      )
-                    """
-                ).fetchone()["count"] or 0
+            if not self._table_exists(conn, "release_highlight_metrics"):
+                return None
+            row = conn.execute("SELECT metrics FROM release_highlight_metrics WHERE id = 1").fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        try:
+            metrics = json.loads(row["metrics"])
+        except ValueError:
+            return None
+        return metrics if isinstance(metrics, dict) else None
 
-                jurisdiction_count = region_j + national_j + international_j
+    def _compute_highlight_metrics(self, conn) -> Dict:
+        # Jurisdiction counts and the latest country come from one pass over
+        # jurisdictions that carry at least one web-app regulation.
+        summary = conn.execute(
+            """
+            WITH active AS (
+                SELECT j.id, j.country, j.region, j.jurisdiction_type, j.jurisdiction_group
+                FROM jurisdictions j
+                WHERE EXISTS (
+                    SELECT 1
+                    FROM regulations r
+                    WHERE r.jurisdiction_id = j.id
+                      AND +r.is_webapp_scoped = 1
+                )
+            )
+            SELECT
+                (SELECT COUNT(*) FROM plants) AS species_count,
+                (SELECT COUNT(*) FROM regulations WHERE is_webapp_scoped = 1) AS regulation_count,
+                COUNT(DISTINCT CASE
+                    WHEN jurisdiction_type = 'region'
+                     AND country IS NOT NULL AND TRIM(country) != ''
+                     AND region IS NOT NULL AND TRIM(region) != ''
+                    THEN country || '::' || region
+                END) AS region_count,
+                COUNT(DISTINCT CASE
+                    WHEN jurisdiction_type = 'national'
+                     AND country IS NOT NULL AND TRIM(country) != ''
+                    THEN country
+                END) AS national_count,
+                COUNT(DISTINCT CASE
+                    WHEN jurisdiction_type = 'international'
+                    THEN COALESCE(NULLIF(TRIM(jurisdiction_group), ''), NULLIF(TRIM(country), ''), 'International')
+                END) AS international_count,
+                (
+                    SELECT country
+                    FROM active
+                    WHERE country IS NOT NULL AND TRIM(country) != ''
+                    ORDER BY id DESC
+                    LIMIT 1
+                ) AS latest_country
+            FROM active
+            """
+        ).fetchone()
+        latest_country = summary["latest_country"]
 
-            latest_country_row = conn.execute(
+        latest_country_regions = 0
+        latest_country_region = None
+        if latest_country:
+            row = conn.execute(
                 """
-                SELECT j.country
+                SELECT COUNT(DISTINCT j.region) AS count, MIN(j.region) AS first_region
                 FROM jurisdictions j
-                WHERE j.country IS NOT NULL AND TRIM(j.country) != ''
+                WHERE j.jurisdiction_type = 'region'
+                  AND j.country = ?
+                  AND j.region IS NOT NULL AND TRIM(j.region) != ''
                   AND EXISTS (
                       SELECT 1
                       FROM regulations r
                       WHERE r.jurisdiction_id = j.id
-                        AND r.is_webapp_scoped = 1
+                        AND +r.is_webapp_scoped = 1
                   )
-                ORDER BY j.id DESC
-                LIMIT 1
-                """
+                """,
+                (latest_country,),
             ).fetchone()
-            latest_country = latest_country_row["country"] if latest_country_row else None
+            latest_country_regions = row["count"] or 0
+            latest_country_region = row["first_region"]
 
-            latest_country_regions = 0
-            latest_country_region = None
-            if latest_country:
-                latest_country_regions = conn.execute(
-                    """
-                    SELECT COUNT(DISTINCT j.region) AS count
-                    FROM jurisdictions j
-                    WHERE j.jurisdiction_type = 'region'
-                      AND j.country = ?
-                      AND j.region IS NOT NULL AND TRIM(j.region) != ''
-                      AND EXISTS (
-                          SELECT 1
-                          FROM regulations r
-                          WHERE r.jurisdiction_id = j.id
-                            AND r.is_webapp_scoped = 1
-                      )
-                    """,
-                    (latest_country,),
-                ).fetchone()["count"] or 0
-
-                row = conn.execute(
-                    """
-                    SELECT j.region
-                    FROM jurisdictions j
-                    WHERE j.jurisdiction_type = 'region'
-                      AND j.country = ?
-                      AND j.region IS NOT NULL AND TRIM(j.region) != ''
-                      AND EXISTS (
-                          SELECT 1
-                          FROM regulations r
-                          WHERE r.jurisdiction_id = j.id
-                            AND r.is_webapp_scoped = 1
-                      )
-                    ORDER BY j.region ASC
-                    LIMIT 1
-                    """,
-                    (latest_country,),
-                ).fetchone()
-                latest_country_region = row["region"] if row else None
+        top_species_row = conn.execute(
+            """
+            SELECT
+                p.canonical_name,
+                COUNT(DISTINCT j.country || '::' || j.region) AS jurisdiction_count
+            FROM regulations r
+            JOIN plants p ON p.id = r.plant_id
+            JOIN jurisdictions j ON j.id = r.jurisdiction_id
+            WHERE +r.is_webapp_scoped = 1
+              AND j.jurisdiction_type = 'region'
+              AND j.country IS NOT NULL AND TRIM(j.country) != ''
+              AND j.region IS NOT NULL AND TRIM(j.region) != ''
+            GROUP BY p.canonical_name
+            ORDER BY jurisdiction_count DESC, p.canonical_name ASC
+            LIMIT 1
+            """
+        ).fetchone()
 
-            top_species_row = conn.execute(
+        top_species = None
+        if top_species_row:
+            common_name_row = conn.execute(
                 """
-                SELECT
-                    p.canonical_name,
-                    COUNT(DISTINCT j.country || '::' || j.region) AS jurisdiction_count
-                FROM regulations r
-                JOIN plants p ON p.id = r.plant_id
-                JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
-                  AND j.jurisdiction_type = 'region'
-                  AND j.country IS NOT NULL AND TRIM(j.country) != ''
-                  AND j.region IS NOT NULL AND TRIM(j.region) != ''
-                GROUP BY p.canonical_name
-                ORDER BY jurisdiction_count DESC, p.canonical_name ASC
+                SELECT english_name
+                FROM plants
+                WHERE canonical_name = ?
+                  AND english_name IS NOT NULL
+                  AND TRIM(english_name) != ''
                 LIMIT 1
-                """
+                """,
+                (top_species_row["canonical_name"],),
             ).fetchone()
+            common_name = None
+            if common_name_row and common_name_row["english_name"]:
+                common_name = common_name_row["english_name"].split(",")[0].strip()
+
+            top_species = {
+                "name": top_species_row["canonical_name"],
+                "common_name": common_name,
+                "jurisdiction_count": top_species_row["jurisdiction_count"],
+            }
 
-            top_species = None
-            if top_species_row:
-                common_name_row = conn.execute(
-                    """
-                    SELECT english_name
-                    FROM plants
-                    WHERE canonical_name = ?
-                      AND english_name IS NOT NULL
-                      AND TRIM(english_name) != ''
-                    LIMIT 1
-                    """,
-                    (top_species_row["canonical_name"],),
-                ).fetchone()
-                common_name = None
-                if common_name_row and common_name_row["english_name"]:
-                    common_name = common_name_row["english_name"].split(",")[0].strip()
-
-                top_species = {
-                    "name": top_species_row["canonical_name"],
-                    "common_name": common_name,
-                    "jurisdiction_count": top_species_row["jurisdiction_count"],
-                }
+        top_j_row = conn.execute(
+            """
+            SELECT
+                j.country,
+                j.region,
+                COUNT(DISTINCT p.id) AS species_count
+            FROM regulations r
+            JOIN plants p ON p.id = r.plant_id
+            JOIN jurisdictions j ON j.id = r.jurisdiction_id
+            WHERE +r.is_webapp_scoped = 1
+              AND j.jurisdiction_type = 'region'
+              AND j.country IS NOT NULL AND TRIM(j.country) != ''
+              AND j.region IS NOT NULL AND TRIM(j.region) != ''
+            GROUP BY j.country, j.region
+            ORDER BY species_count DESC, j.region ASC
+            LIMIT 1
+            """
+        ).fetchone()
 
-            top_j_row = conn.execute(
-                """
+        top_jurisdiction = None
+        if top_j_row:
+            top_jurisdiction = {
+                "name": top_j_row["region"],
+                "country": top_j_row["country"],
+                "species_count": top_j_row["species_count"],
+            }
+
+        return {
+            "species_count": summary["species_count"] or 0,
+            "regulation_count": summary["regulation_count"] or 0,
+            "jurisdiction_count": (
+                (summary["region_count"] or 0)
+                + (summary["national_count"] or 0)
+                + (summary["international_count"] or 0)
+            ),
+            "latest_country": latest_country,
+            "latest_country_regions": latest_country_regions,
+            "latest_country_region": latest_country_region,
+            "top_species": top_species,
+            "top_jurisdiction": top_jurisdiction,
+        }
+
+    def get_weeds_for_geo_region(
+        self,
+        geo_region_id: str,
+        include_region: bool = True,
+        include_national: bool = True,
+        include_international: bool = True,
+    ) -> Dict:
+        if not geo_region_id:
+            return {"weeds": [], "has_any_data": False, "geo_region": None}
+
+        payloads = self.get_weeds_for_geo_regions(
+            [geo_region_id],
+            include_region=include_region,
+            include_national=include_national,
+            include_international=include_international,
+        )
+        return payloads.get(geo_region_id) or {"weeds": [], "has_any_data": False, "geo_region": None}
+
+    def get_weeds_for_geo_regions(
+        self,
+        geo_region_ids: List[str],
+        include_region: bool = True,
+        include_national: bool = True,
+        include_international: bool = True,
+    ) -> Dict[str, Dict]:
+        """
+        Region detail for many mapped geo regions, keyed by geo_region_id.
+        Unknown ids are left out. All regions share one query per regulation
+        level (chunked for SQLite's parameter limit) instead of one per region.
+        """
+        index = self._geo_region_index()
+        geo_regions = []
+        for geo_region_id in dict.fromkeys(geo_region_ids or []):
+            geo_region = index.get(geo_region_id)
+            if geo_region:
+                geo_regions.append(geo_region)
+        if not geo_regions:
+            return {}
+
+        matrix = self._matrix()
+        conn = self.get_connection()
+        try:
+            has_uid_column = self._supports_jurisdiction_column(conn, "jurisdiction_uid")
+            if matrix is not None:
+                region_rows, national_rows, international_rows = self._matrix_geo_region_rows(
+                    matrix, geo_regions, has_uid_column, include_region, include_national, include_international
+                )
+            else:
+                region_rows, national_rows, international_rows = self._sql_geo_region_rows(
+                    conn, geo_regions, has_uid_column, include_region, include_national, include_international
+                )
+        finally:
+            conn.close()
+
+        payloads = {}
+        for geo_region in geo_regions:
+            country = geo_region["country"]
+            jurisdiction_uid = geo_region.get("jurisdiction_uid")
+            if jurisdiction_uid and has_uid_column:
+                rows = list(region_rows.get(("uid", jurisdiction_uid), []))
+            else:
+                rows = list(region_rows.get(("name", country, geo_region["region"]), []))
+            rows.extend(national_rows.get(country, []))
+            if include_international:
+                for group in self.international_groups_for_country(country):
+                    rows.extend(international_rows.get(group, []))
+
+            payloads[geo_region["geo_region_id"]] = {
+                "weeds": self._region_weed_results(rows, has_exact_region_mapping=bool(jurisdiction_uid)),
+                "has_any_data": self.country_has_data(country),
+                "geo_region": geo_region,
+            }
+        return payloads
+
+    def _sql_geo_region_rows(
+        self,
+        conn,
+        geo_regions: List[Dict],
+        has_uid_column: bool,
+        include_region: bool,
+        include_national: bool,
+        include_international: bool,
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        Region rows keyed by uid/name match, national rows by country and
+        international rows by group, each in regulation id order so the lowest
+        regulation wins ties, as in get_weeds_page_for_geo_region.
+        """
+        species_id_expr = "p.species_id" if self._supports_plant_column(conn, "species_id") else "NULL"
+
+        region_rows = defaultdict(list)
+        if include_region:
+            uids = [g["jurisdiction_uid"] for g in geo_regions if g.get("jurisdiction_uid") and has_uid_column]
+            names = [
+                (g["country"], g["region"])
+                for g in geo_regions
+                if not (g.get("jurisdiction_uid") and has_uid_column)
+            ]
+            for chunk in self._chunks(list(dict.fromkeys(uids))):
+                rows = conn.execute(
+                    f"""
+                    WITH wanted(uid) AS (VALUES {", ".join("(?)" for _ in chunk)})
+                    SELECT
+                        wanted.uid AS match_uid,
+                        {self._region_weed_columns(species_id_expr, "region")}
+                    FROM wanted
+                    JOIN jurisdictions j
+                      ON {self._jurisdiction_uid_match(conn, "wanted.uid")}
+                     AND j.jurisdiction_type = 'region'
+                    JOIN regulations r
+                      ON r.jurisdiction_id = j.id
+                     AND +r.is_webapp_scoped = 1
+                    JOIN plants p ON p.id = r.plant_id
+                    ORDER BY r.id
+                    """,
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    region_rows[("uid", row["match_uid"])].append(row)
+            for chunk in self._chunks(list(dict.fromkeys(names))):
+                rows = conn.execute(
+                    f"""
+                    WITH wanted(country, region) AS (VALUES {", ".join("(?, ?)" for _ in chunk)})
+                    SELECT
+                        wanted.country AS match_country,
+                        wanted.region AS match_region,
+                        {self._region_weed_columns(species_id_expr, "region")}
+                    FROM wanted
+                    JOIN jurisdictions j
+                      ON j.country = wanted.country
+                     AND j.region = wanted.region
+                     AND j.jurisdiction_type = 'region'
+                    JOIN regulations r
+                      ON r.jurisdiction_id = j.id
+                     AND +r.is_webapp_scoped = 1
+                    JOIN plants p ON p.id = r.plant_id
+                    ORDER BY r.id
+                    """,
+                    [value for pair in chunk for value in pair],
+                ).fetchall()
+                for row in rows:
+                    region_rows[("name", row["match_country"], row["match_region"])].append(row)
+
+        national_rows = defaultdict(list)
+        if include_national:
+            countries = list(dict.fromkeys(g["country"] for g in geo_regions))
+            for chunk in self._chunks(countries):
+                rows = conn.execute(
+                    f"""
+                    WITH wanted(country) AS (VALUES {", ".join("(?)" for _ in chunk)})
+                    SELECT
+                        wanted.country AS match_country,
+                        {self._region_weed_columns(species_id_expr, "national")}
+                    FROM wanted
+                    JOIN jurisdictions j
+                      ON j.country = wanted.country
+                     AND j.jurisdiction_type = 'national'
+                     AND (j.region IS NULL OR TRIM(j.region) = '')
+                    JOIN regulations r
+                      ON r.jurisdiction_id = j.id
+                     AND +r.is_webapp_scoped = 1
+                    JOIN plants p ON p.id = r.plant_id
+                    ORDER BY r.id
+                    """,
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    national_rows[row["match_country"]].append(row)
+
+        international_rows = defaultdict(list)
+        groups = []
+        if include_international:
+            groups = list(
+                dict.fromkeys(
+                    group
+                    for g in geo_regions
+                    for group in self.international_groups_for_country(g["country"])
+                )
+            )
+        for chunk in self._chunks(groups):
+            rows = conn.execute(
+                f"""
                 SELECT
-                    j.country,
-                    j.region,
-                    COUNT(DISTINCT p.id) AS species_count
+                    j.jurisdiction_group AS match_group,
+                    {self._region_weed_columns(species_id_expr, "international")}
                 FROM regulations r
                 JOIN plants p ON p.id = r.plant_id
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
-                  AND j.jurisdiction_type = 'region'
-                  AND j.country IS NOT NULL AND TRIM(j.country) != ''
-                  AND j.region IS NOT NULL AND TRIM(j.region) != ''
-                GROUP BY j.country, j.region
-                ORDER BY species_count DESC, j.region ASC
-                LIMIT 1
-                """
-            ).fetchone()
+                WHERE +r.is_webapp_scoped = 1
+                  AND j.jurisdiction_type = 'international'
+                  AND j.jurisdiction_group IN ({", ".join("?" for _ in chunk)})
+                ORDER BY r.id
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                international_rows[row["match_group"]].append(row)
+        return region_rows, national_rows, international_rows
 
-            top_jurisdiction = None
-            if top_j_row:
-                top_jurisdiction = {
-                    "name": top_j_row["region"],
-                    "country": top_j_row["country"],
-                    "species_count": top_j_row["species_count"],
-                }
+    def _matrix_geo_region_rows(
+        self,
+        matrix,
+        geo_regions: List[Dict],
+        has_uid_column: bool,
+        include_region: bool,
+        include_national: bool,
+        include_international: bool,
+    ) -> Tuple[Dict, Dict, Dict]:
+        """_sql_geo_region_rows answered from the release's RegulationMatrix."""
+        jurisdiction_type = matrix.jurisdictions["jurisdiction_type"]
+        jurisdiction_region = matrix.jurisdictions["region"]
+
+        region_rows = {}
+        if include_region:
+            for g in geo_regions:
+                jurisdiction_uid = g.get("jurisdiction_uid")
+                if jurisdiction_uid and has_uid_column:
+                    key = ("uid", jurisdiction_uid)
+                    candidates = matrix.jurisdictions_by_uid(jurisdiction_uid)
+                else:
+                    key = ("name", g["country"], g["region"])
+                    candidates = [
+                        j for j in matrix.jurisdictions_where("country", g["country"])
+                        if jurisdiction_region[j] == g["region"]
+                    ]
+                if key not in region_rows:
+                    entries = matrix.jurisdiction_entries_for(j for j in candidates if jurisdiction_type[j] == "region")
+                    region_rows[key] = self._matrix_region_weed_rows(
+                        matrix, matrix.in_regulation_order(entries), "region"
+                    )
 
-            return {
-                "species_count": species_count,
-                "regulation_count": regulation_count,
-                "jurisdiction_count": jurisdiction_count,
-                "latest_country": latest_country,
-                "latest_country_regions": latest_country_regions,
-                "latest_country_region": latest_country_region,
-                "top_species": top_species,
-                "top_jurisdiction": top_jurisdiction,
-            }
-        finally:
-            conn.close()
+        national_rows = {}
+        if include_national:
+            for country in dict.fromkeys(g["country"] for g in geo_regions):
+                entries = matrix.jurisdiction_entries_for(
+                    j
+                    for j in matrix.jurisdictions_where("country", country)
+                    if jurisdiction_type[j] == "national" and not sql_trim(jurisdiction_region[j] or "")
+                )
+                national_rows[country] = self._matrix_region_weed_rows(
+                    matrix, matrix.in_regulation_order(entries), "national"
+                )
 
-    def get_weeds_for_geo_region(
+        international_rows = {}
+        if include_international:
+            for g in geo_regions:
+                for group in self.international_groups_for_country(g["country"]):
+                    if group in international_rows:
+                        continue
+                    entries = matrix.jurisdiction_entries_for(
+                        j for j in matrix.jurisdictions_where("jurisdiction_group", group)
+                        if jurisdiction_type[j] == "international"
+                    )
+                    international_rows[group] = self._matrix_region_weed_rows(
+                        matrix, matrix.in_regulation_order(entries), "international"
+                    )
+        return region_rows, national_rows, international_rows
+
+    @staticmethod
+    def _matrix_region_weed_rows(matrix, entries: List[int], level: str) -> List[Dict]:
+        """Rows shaped like _region_weed_columns, built from matrix entries."""
+        plants = matrix.plants
+        authority_name = matrix.jurisdictions["authority_name"]
+        rows = []
+        for entry in entries:
+            p = matrix.entry_plant[entry]
+            source_authority = authority_name[matrix.entry_jurisdiction[entry]]
+            rows.append(
+                {
+                    "canonical_name": plants["canonical_name"][p],
+                    "common_name": plants["english_name"][p],
+                    "family_name": plants["family_name"][p],
+                    "species_id": plants["species_id"][p],
+                    "usage_key": plants["gbif_usage_key"][p],
+                    "source_authority": sql_trim(source_authority) or "Unknown",
+                    "count_source_level": level,
+                }
+            )
+        return rows
+
+    def get_weeds_page_for_geo_region(
         self,
         geo_region_id: str,
+        limit: int,
+        cursor: str = None,
         include_region: bool = True,
         include_national: bool = True,
         include_international: bool = True,
     ) -> Dict:
-        if not geo_region_id:
-            return {"weeds": [], "has_any_data": False, "geo_region": None}
-
-        geo_region = self._geo_region_index().get(geo_region_id)
+        """
+        One page of a region's species, ordered by canonical_name.
+
+        Same rows as get_weeds_for_geo_region, but dedup, ordering, the keyset
+        cursor (species after `cursor`), the limit and the total species count
+        all run in SQL, so a short page never loads the whole region list.
+        `next_cursor` is the canonical_name to pass back for the following page,
+        or None on the last page.
+        """
+        empty = {"weeds": [], "has_any_data": False, "geo_region": None, "total_count": 0, "next_cursor": None}
+        geo_region = self._geo_region_index().get(geo_region_id) if geo_region_id else None
         if not geo_region:
-            return {"weeds": [], "has_any_data": False, "geo_region": None}
+            return empty
 
         country = geo_region["country"]
-        region = geo_region["region"]
         jurisdiction_uid = geo_region.get("jurisdiction_uid")
-        has_exact_region_mapping = bool(jurisdiction_uid)
+        limit = max(0, int(limit))
 
         conn = self.get_connection()
         try:
-            clauses = []
-            params = []
-            has_uid_column = self._supports_jurisdiction_column(conn, "jurisdiction_uid")
             species_id_expr = "p.species_id" if self._supports_plant_column(conn, "species_id") else "NULL"
-
+            branches = []
+            params: List = []
             if include_region:
-                if jurisdiction_uid and has_uid_column:
-                    clauses.append(
-                        f"""
-                        SELECT
-                            p.canonical_name,
-                            p.english_name AS common_name,
-                            p.family_name,
-                            {species_id_expr} AS species_id,
-                            p.gbif_usage_key AS usage_key,
-                            COALESCE(NULLIF(TRIM(j.authority_name), ''), 'Unknown') AS source_authority,
-                            'region' AS count_source_level
-                        FROM regulations r
-                        JOIN plants p ON p.id = r.plant_id
-                        JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                        WHERE r.is_webapp_scoped = 1
-                          AND j.jurisdiction_type = 'region'
-                          AND LOWER(TRIM(j.jurisdiction_uid)) = LOWER(TRIM(?))
-                        """
-                    )
+                if jurisdiction_uid and self._supports_jurisdiction_column(conn, "jurisdiction_uid"):
+                    match = self._jurisdiction_uid_match(conn)
                     params.append(jurisdiction_uid)
                 else:
-                    clauses.append(
-                        f"""
-                        SELECT
-                            p.canonical_name,
-                            p.english_name AS common_name,
-                            p.family_name,
-                            {species_id_expr} AS species_id,
-                            p.gbif_usage_key AS usage_key,
-                            COALESCE(NULLIF(TRIM(j.authority_name), ''), 'Unknown') AS source_authority,
-                            'region' AS count_source_level
-                        FROM regulations r
-                        JOIN plants p ON p.id = r.plant_id
-                        JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                        WHERE r.is_webapp_scoped = 1
-                          AND j.jurisdiction_type = 'region'
-                          AND j.country = ?
-                          AND j.region = ?
-                        """
-                    )
-                    params.extend([country, region])
-
+                    match = "j.country = ? AND j.region = ?"
+                    params.extend([country, geo_region["region"]])
+                branches.append(
+                    f"""
+                    SELECT {self._region_weed_columns(species_id_expr, "region")}, 3 AS priority, r.id AS regulation_id
+                    FROM jurisdictions j
+                    CROSS JOIN regulations r ON r.jurisdiction_id = j.id AND +r.is_webapp_scoped = 1
+                    JOIN plants p ON p.id = r.plant_id
+                    WHERE {match}
+                      AND j.jurisdiction_type = 'region'
+                    """
+                )
             if include_national:
-                clauses.append(
+                params.append(country)
+                branches.append(
                     f"""
-                    SELECT
-                        p.canonical_name,
-                        p.english_name AS common_name,
-                        p.family_name,
-                        {species_id_expr} AS species_id,
-                        p.gbif_usage_key AS usage_key,
-                        COALESCE(NULLIF(TRIM(j.authority_name), ''), 'Unknown') AS source_authority,
-                        'national' AS count_source_level
-                    FROM regulations r
+                    SELECT {self._region_weed_columns(species_id_expr, "national")}, 2 AS priority, r.id AS regulation_id
+                    FROM jurisdictions j
+                    CROSS JOIN regulations r ON r.jurisdiction_id = j.id AND +r.is_webapp_scoped = 1
                     JOIN plants p ON p.id = r.plant_id
-                    JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                    WHERE r.is_webapp_scoped = 1
+                    WHERE j.country = ?
                       AND j.jurisdiction_type = 'national'
-                      AND j.country = ?
                       AND (j.region IS NULL OR TRIM(j.region) = '')
                     """
                 )
-                params.append(country)
-
-            if include_international and country in EU_MEMBERS:
-                clauses.append(
+            groups = self.international_groups_for_country(country) if include_international else ()
+            if groups:
+                params.extend(groups)
+                branches.append(
                     f"""
-                    SELECT
-                        p.canonical_name,
-                        p.english_name AS common_name,
-                        p.family_name,
-                        {species_id_expr} AS species_id,
-                        p.gbif_usage_key AS usage_key,
-                        COALESCE(NULLIF(TRIM(j.authority_name), ''), 'Unknown') AS source_authority,
-                        'international' AS count_source_level
-                    FROM regulations r
+                    SELECT {self._region_weed_columns(species_id_expr, "international")}, 1 AS priority, r.id AS regulation_id
+                    FROM jurisdictions j
+                    CROSS JOIN regulations r ON r.jurisdiction_id = j.id AND +r.is_webapp_scoped = 1
                     JOIN plants p ON p.id = r.plant_id
-                    JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                    WHERE r.is_webapp_scoped = 1
-                      AND j.jurisdiction_type = 'international'
-                      AND j.jurisdiction_group = 'EU'
+                    WHERE j.jurisdiction_type = 'international'
+                      AND j.jurisdiction_group IN ({", ".join("?" for _ in groups)})
                     """
                 )
 
-            if not clauses:
-                return {"weeds": [], "has_any_data": self.country_has_data(country), "geo_region": geo_region}
-
-            rows = conn.execute(f"{' UNION ALL '.join(clauses)}", params).fetchall()
-
-            priority = {"region": 3, "national": 2, "international": 1}
-            chosen = {}
-            scopes = {}
-
-            for row in rows:
-                data = dict(row)
-                canonical_name = data["canonical_name"]
-                jurisdiction = data["count_source_level"]
-
-                if canonical_name not in scopes:
-                    scopes[canonical_name] = set()
-                scopes[canonical_name].add(jurisdiction)
-
-                existing = chosen.get(canonical_name)
-                if not existing:
-                    chosen[canonical_name] = data
-                    continue
+            rows = []
+            total_count = 0
+            if branches:
+                keyset = "AND canonical_name > ?" if cursor else ""
+                page_params = params + ([cursor] if cursor else []) + [limit + 1]
+                rows = conn.execute(
+                    f"""
+                    WITH matched AS ({" UNION ALL ".join(branches)}),
+                    ranked AS (
+                        SELECT
+                            matched.*,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY canonical_name ORDER BY priority DESC, regulation_id
+                            ) AS species_rank,
+                            MAX(count_source_level = 'national') OVER (PARTITION BY canonical_name) AS has_national,
+                            MAX(count_source_level = 'international') OVER (PARTITION BY canonical_name) AS has_international
+                        FROM matched
+                    ),
+                    species AS (SELECT * FROM ranked WHERE species_rank = 1)
+                    SELECT totals.total_count, page.*
+                    FROM (SELECT COUNT(*) AS total_count FROM species) totals
+                    LEFT JOIN (
+                        SELECT * FROM species
+                        WHERE 1 = 1 {keyset}
+                        ORDER BY canonical_name
+                        LIMIT ?
+                    ) page ON 1 = 1
+                    """,
+                    page_params,
+                ).fetchall()
+                if rows:
+                    total_count = rows[0]["total_count"]
+                rows = [row for row in rows if row["count_source_level"] is not None]
+        finally:
+            conn.close()
 
-                existing_priority = priority.get(existing["count_source_level"], 0)
-                new_priority = priority.get(jurisdiction, 0)
-                if new_priority > existing_priority:
-                    chosen[canonical_name] = data
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        weeds = [
+            self._region_weed_entry(
+                dict(row),
+                has_exact_region_mapping=bool(jurisdiction_uid),
+                has_national=bool(row["has_national"]),
+                has_international=bool(row["has_international"]),
+            )
+            for row in rows
+        ]
+        return {
+            "weeds": weeds,
+            "has_any_data": self.country_has_data(country),
+            "geo_region": geo_region,
+            "total_count": total_count,
+            "next_cursor": weeds[-1]["canonical_name"] if has_more and weeds else None,
+        }
+
+    # Keeps every chunked region query under SQLite's default 999 parameters.
+    REGION_QUERY_CHUNK_SIZE = 400
+
+    @classmethod
+    def _chunks(cls, values: List) -> List[List]:
+        size = cls.REGION_QUERY_CHUNK_SIZE
+        return [values[i:i + size] for i in range(0, len(values), size)]
 
-            level_map = {"region": "Regional", "national": "National", "international": "International"}
+    @staticmethod
+    def _region_weed_columns(species_id_expr: str, level: str) -> str:
+        return f"""
+            p.canonical_name,
+            p.english_name AS common_name,
+            p.family_name,
+            {species_id_expr} AS species_id,
+            p.gbif_usage_key AS usage_key,
+            COALESCE(NULLIF(TRIM(j.authority_name), ''), 'Unknown') AS source_authority,
+            '{level}' AS count_source_level
+        """
+
+    def _region_weed_results(self, rows, has_exact_region_mapping: bool) -> List[Dict]:
+        """Collapse region/national/international rows to one entry per species."""
+        priority = {"region": 3, "national": 2, "international": 1}
+        chosen = {}
+        scopes = {}
+
+        for row in rows:
+            data = dict(row)
+            canonical_name = data["canonical_name"]
+            jurisdiction = data["count_source_level"]
+
+            if canonical_name not in scopes:
+                scopes[canonical_name] = set()
+            scopes[canonical_name].add(jurisdiction)
+
+            existing = chosen.get(canonical_name)
+            if not existing:
+                chosen[canonical_name] = data
+                continue
 
-            results = []
-            for species in chosen.values():
-                canonical_name = species["canonical_name"]
-                species_scopes = scopes.get(canonical_name, set())
-                results.append(
-                    {
-                        "canonical_name": canonical_name,
-                        "common_name": self._primary_common_name(
-                            species.get("common_name"),
-                            canonical_name,
-                        ),
-                        "family_name": species.get("family_name"),
-                        "species_id": species.get("species_id"),
-                        "usage_key": species.get("usage_key"),
-                        "level": level_map.get(species["count_source_level"], "Unknown"),
-                        "count_source_level": species["count_source_level"],
-                        "jurisdiction_match": "exact_mapped" if has_exact_region_mapping else "country_overlay",
-                        "source_authority": species.get("source_authority"),
-                        "has_national_regulation": "national" in species_scopes,
-                        "has_international_regulation": "international" in species_scopes,
-                    }
+            existing_priority = priority.get(existing["count_source_level"], 0)
+            new_priority = priority.get(jurisdiction, 0)
+            if new_priority > existing_priority:
+                chosen[canonical_name] = data
+
+        results = []
+        for species in chosen.values():
+            species_scopes = scopes.get(species["canonical_name"], set())
+            results.append(
+                self._region_weed_entry(
+                    species,
+                    has_exact_region_mapping,
+                    has_national="national" in species_scopes,
+                    has_international="international" in species_scopes,
                 )
+            )
+        return sorted(results, key=lambda x: x["canonical_name"] or "")
 
-            return {
-                "weeds": sorted(results, key=lambda x: x["canonical_name"] or ""),
-                "has_any_data": self.country_has_data(country),
-                "geo_region": geo_region,
-            }
-        finally:
-            conn.close()
+    def _region_weed_entry(
+        self,
+        species: Dict,
+        has_exact_region_mapping: bool,
+        has_national: bool,
+        has_international: bool,
+    ) -> Dict:
+        level_map = {"region": "Regional", "national": "National", "international": "International"}
+        canonical_name = species["canonical_name"]
+        return {
+            "canonical_name": canonical_name,
+            "common_name": self._primary_common_name(
+                species.get("common_name"),
+                canonical_name,
+            ),
+            "family_name": species.get("family_name"),
+            "species_id": species.get("species_id"),
+            "usage_key": species.get("usage_key"),
+            "level": level_map.get(species["count_source_level"], "Unknown"),
+            "count_source_level": species["count_source_level"],
+            "jurisdiction_match": "exact_mapped" if has_exact_region_mapping else "country_overlay",
+            "source_authority": species.get("source_authority"),
+            "has_national_regulation": has_national,
+            "has_international_regulation": has_international,
+        }
 
     def get_weeds_for_region(
         self,
@@ -656,54 +1174,49 @@ class StateDatabase(DatabaseBase):
     ) -> List[Dict]:
         country = self._canonical_country_name(country)
         region = self._canonical_region_name(region)
-        for geo_region in self._load_geo_regions():
-            if self._region_key(geo_region["country"], geo_region["region"]) == (country, region):
-                payload = self.get_weeds_for_geo_region(
-                    geo_region["geo_region_id"],
-                    include_region=include_region,
-                    include_national=include_national,
-                    include_international=include_international,
-                )
-                return payload.get("weeds", [])
-        return []
+        self._load_geo_regions()
+        geo_region = self._geo_regions_by_key.get((country, region))
+        if not geo_region:
+            return []
+        payload = self.get_weeds_for_geo_region(
+            geo_region["geo_region_id"],
+            include_region=include_region,
+            include_national=include_national,
+            include_international=include_international,
+        )
+        return payload.get("weeds", [])
 
     def country_has_data(self, country: str) -> bool:
         if not country:
             return False
 
-        conn = self.get_connection()
-        try:
-            if country in EU_MEMBERS:
-                row = conn.execute(
-                    """
-                    SELECT 1
-                    FROM regulations r
-                    JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                    WHERE r.is_webapp_scoped = 1
-                      AND (
-                          j.country = ?
-                          OR (j.jurisdiction_type = 'international' AND j.jurisdiction_group = 'EU')
-                      )
-                    LIMIT 1
-                    """,
-                    (country,),
-                ).fetchone()
-                return bool(row)
+        return country in self._regulation_bitmaps().covered_countries
 
-            row = conn.execute(
+    def countries_with_data(self) -> List[str]:
+        """Countries with web-app scoped regulations, own or inherited from a group."""
+        return sorted(self._regulation_bitmaps().covered_countries)
+
+    def international_groups_for_country(self, country: str) -> Tuple[str, ...]:
+        return self._regulation_bitmaps().country_groups.get(country, ())
+
+    def _load_group_membership(self, conn) -> Dict[str, Tuple[str, ...]]:
+        """Country -> international groups it belongs to, from the release when it says."""
+        members = defaultdict(set)
+        if self._table_exists(conn, "jurisdiction_group_members"):
+            for row in conn.execute(
                 """
-                SELECT 1
-                FROM regulations r
-                JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
-                  AND j.country = ?
-                LIMIT 1
-                """,
-                (country,),
-            ).fetchone()
-            return bool(row)
-        finally:
-            conn.close()
+                SELECT jurisdiction_group, country
+                FROM jurisdiction_group_members
+                WHERE jurisdiction_group IS NOT NULL AND TRIM(jurisdiction_group) != ''
+                  AND country IS NOT NULL AND TRIM(country) != ''
+                """
+            ):
+                members[self._canonical_country_name(row["country"])].add(row["jurisdiction_group"])
+        else:
+            for group, countries in DEFAULT_GROUP_MEMBERS.items():
+                for country in countries:
+                    members[country].add(group)
+        return {country: tuple(sorted(groups)) for country, groups in members.items()}
 
     def get_region_weed_counts(
         self,
@@ -715,47 +1228,200 @@ class StateDatabase(DatabaseBase):
         if not geo_regions:
             return []
 
+        toggles = (bool(include_region), bool(include_national), bool(include_international))
+        cached = self._region_counts_cache.get(toggles)
+        if cached is not None and cached[0] == self._geo_regions_signature:
+            return cached[1]
+
+        results = self._load_materialized_region_weed_counts(toggles)
+        if results is None:
+            results = self._compute_region_weed_counts(geo_regions, [toggles])[toggles]
+        self._region_counts_cache[toggles] = (self._geo_regions_signature, results)
+        return results
+
+    def materialize_region_weed_counts(self, conn) -> int:
+        """
+        Write map rows for every toggle combination into geo_region_weed_counts
+        on `conn`, so serving the map becomes a keyed read. Run at release install.
+        """
+        geo_regions = self._load_geo_regions()
+        results = self._compute_region_weed_counts(geo_regions, self.REGION_COUNT_TOGGLES)
+
+        conn.execute("DROP TABLE IF EXISTS geo_region_weed_counts")
+        conn.execute(
+            """
+            CREATE TABLE geo_region_weed_counts (
+                include_region INTEGER NOT NULL,
+                include_national INTEGER NOT NULL,
+                include_international INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                geo_region_id TEXT NOT NULL,
+                geojson_slug TEXT,
+                country TEXT,
+                region TEXT,
+                count INTEGER NOT NULL,
+                count_source_level TEXT,
+                jurisdiction_match TEXT,
+                regulation_status TEXT,
+                jurisdiction_uid TEXT,
+                canonical_display_name TEXT,
+                PRIMARY KEY (include_region, include_national, include_international, position)
+            )
+            """
+        )
+        written = 0
+        for toggles, rows in results.items():
+            conn.executemany(
+                """
+                INSERT INTO geo_region_weed_counts (
+                    include_region, include_national, include_international, position,
+                    geo_region_id, geojson_slug, country, region, count,
+                    count_source_level, jurisdiction_match, regulation_status,
+                    jurisdiction_uid, canonical_display_name
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        int(toggles[0]),
+                        int(toggles[1]),
+                        int(toggles[2]),
+                        position,
+                        row["geo_region_id"],
+                        row["geojson_slug"],
+                        row["country"],
+                        row["region"],
+                        row["count"],
+                        row["count_source_level"],
+                        row["jurisdiction_match"],
+                        row["regulation_status"],
+                        row.get("jurisdiction_uid"),
+                        row.get("canonical_display_name"),
+                    )
+                    for position, row in enumerate(rows)
+                ],
+            )
+            written += len(rows)
+        return written
+
+    def _load_materialized_region_weed_counts(self, toggles: Tuple[bool, bool, bool]) -> Optional[List[Dict]]:
         conn = self.get_connection()
         try:
-            if not include_region and not include_national and not include_international:
-                return [
-                    {
-                        "geo_region_id": row["geo_region_id"],
-                        "geojson_slug": row["geojson_slug"],
-                        "country": row["country"],
-                        "region": row["region"],
-                        "count": 0,
-                        "count_source_level": "none",
-                        "jurisdiction_match": "none",
-                        "regulation_status": "unknown",
-                    }
-                    for row in geo_regions
-                ]
+            if not self._table_exists(conn, "geo_region_weed_counts"):
+                return None
+            rows = conn.execute(
+                """
+                SELECT
+                    geo_region_id,
+                    geojson_slug,
+                    country,
+                    region,
+                    count,
+                    count_source_level,
+                    jurisdiction_match,
+                    regulation_status,
+                    jurisdiction_uid,
+                    canonical_display_name
+                FROM geo_region_weed_counts
+                WHERE include_region = ?
+                  AND include_national = ?
+                  AND include_international = ?
+                ORDER BY position ASC
+                """,
+                tuple(int(value) for value in toggles),
+            ).fetchall()
+
+            results = []
+            for row in rows:
+                data = dict(row)
+                # The all-off rows never carried these fields; keep the payload shape.
+                for key in ("jurisdiction_uid", "canonical_display_name"):
+                    if data[key] is None:
+                        data.pop(key)
+                results.append(data)
+            return results
+        finally:
+            conn.close()
+
+    def _compute_region_weed_counts(self, geo_regions: List[Dict], toggle_sets) -> Dict[Tuple, List[Dict]]:
+        results = {}
+        pending = []
+        for toggles in toggle_sets:
+            if any(toggles):
+                pending.append(toggles)
+                continue
+            results[toggles] = [
+                {
+                    "geo_region_id": row["geo_region_id"],
+                    "geojson_slug": row["geojson_slug"],
+                    "country": row["country"],
+                    "region": row["region"],
+                    "count": 0,
+                    "count_source_level": "none",
+                    "jurisdiction_match": "none",
+                    "regulation_status": "unknown",
+                }
+                for row in geo_regions
+            ]
+        if not pending or not geo_regions:
+            for toggles in pending:
+                results[toggles] = []
+            return results
+
+        bitmaps = self._regulation_bitmaps()
+        for toggles in pending:
+            results[toggles] = self._region_weed_count_rows(geo_regions, toggles, bitmaps)
+        return results
+
+    def _regulation_bitmaps(self) -> RegulationBitmaps:
+        """
+        Build the per-version plant bitmaps behind map counts and
+        country_has_data. Plants get dense ordinals, most-regulated first, so
+        the common plants share the low bits of every bitmap.
+        """
+        signature = self._geo_regions_signature_for_db()
+        if self._bitmaps_cache is not None and self._bitmaps_cache[0] == signature:
+            return self._bitmaps_cache[1]
+
+        conn = self.get_connection()
+        try:
+            ordinals = PlantOrdinals()
+            for row in conn.execute(
+                """
+                SELECT plant_id
+                FROM regulations
+                WHERE is_webapp_scoped = 1
+                GROUP BY plant_id
+                ORDER BY COUNT(*) DESC, plant_id ASC
+                """
+            ):
+                ordinals.ordinal(row["plant_id"])
 
             national_rows = conn.execute(
                 """
                 SELECT j.country, r.plant_id
                 FROM regulations r
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
+                WHERE +r.is_webapp_scoped = 1
                   AND j.jurisdiction_type = 'national'
                   AND j.country IS NOT NULL AND TRIM(j.country) != ''
                   AND (j.region IS NULL OR TRIM(j.region) = '')
                 """
             ).fetchall()
 
-            eu_rows = conn.execute(
+            group_rows = conn.execute(
                 """
-                SELECT r.plant_id
+                SELECT j.jurisdiction_group, r.plant_id
                 FROM regulations r
                 JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                WHERE r.is_webapp_scoped = 1
+                WHERE +r.is_webapp_scoped = 1
                   AND j.jurisdiction_type = 'international'
-                  AND j.jurisdiction_group = 'EU'
+                  AND j.jurisdiction_group IS NOT NULL
                 """
             ).fetchall()
+            country_groups = self._load_group_membership(conn)
 
-            region_sets = defaultdict(set)
+            region_sets = defaultdict(list)
             mapped_region_meta = {}
 
             has_geo_regions = self._table_exists(conn, "geo_regions")
@@ -763,20 +1429,21 @@ class StateDatabase(DatabaseBase):
             has_status = self._supports_jurisdiction_column(conn, "regulation_status")
 
             if has_geo_regions and has_uid:
+                uid_join = self._geo_region_uid_join(conn)
                 region_rows = conn.execute(
-                    """
+                    f"""
                     SELECT gr.geo_region_id, r.plant_id
                     FROM geo_regions gr
-                    JOIN jurisdictions j
-                      ON LOWER(TRIM(j.jurisdiction_uid)) = LOWER(TRIM(gr.jurisdiction_uid))
+                    CROSS JOIN jurisdictions j
+                      ON {uid_join}
                      AND j.jurisdiction_type = 'region'
                     JOIN regulations r
                       ON r.jurisdiction_id = j.id
-                     AND r.is_webapp_scoped = 1
+                     AND +r.is_webapp_scoped = 1
                     """
                 ).fetchall()
                 for row in region_rows:
-                    region_sets[row["geo_region_id"]].add(row["plant_id"])
+                    region_sets[row["geo_region_id"]].append(ordinals.ordinal(row["plant_id"]))
 
                 status_expr = (
                     "COALESCE(NULLIF(TRIM(j.regulation_status), ''), 'no_regulation')"
@@ -793,7 +1460,7 @@ class StateDatabase(DatabaseBase):
                         {status_expr} AS regulation_status
                     FROM geo_regions gr
                     LEFT JOIN jurisdictions j
-                      ON LOWER(TRIM(j.jurisdiction_uid)) = LOWER(TRIM(gr.jurisdiction_uid))
+                      ON {uid_join}
                      AND j.jurisdiction_type = 'region'
                     """
                 ).fetchall()
@@ -810,7 +1477,7 @@ class StateDatabase(DatabaseBase):
                     SELECT j.country, j.region, r.plant_id
                     FROM regulations r
                     JOIN jurisdictions j ON j.id = r.jurisdiction_id
-                    WHERE r.is_webapp_scoped = 1
+                    WHERE +r.is_webapp_scoped = 1
                       AND j.jurisdiction_type = 'region'
                       AND j.country IS NOT NULL AND TRIM(j.country) != ''
                       AND j.region IS NOT NULL AND TRIM(j.region) != ''
@@ -818,7 +1485,7 @@ class StateDatabase(DatabaseBase):
                 ).fetchall()
                 for row in region_rows:
                     key = self._region_key(row["country"], row["region"])
-                    region_sets[key].add(row["plant_id"])
+                    region_sets[key].append(ordinals.ordinal(row["plant_id"]))
 
                 status_expr = (
                     "COALESCE(NULLIF(TRIM(j.regulation_status), ''), 'regulated')"
@@ -850,93 +1517,142 @@ class StateDatabase(DatabaseBase):
                         "regulation_status": (row["regulation_status"] or "regulated").lower(),
                     }
 
-            national_sets = defaultdict(set)
+            national_sets = defaultdict(list)
             for row in national_rows:
                 country = self._canonical_country_name(row["country"])
-                national_sets[country].add(row["plant_id"])
-
-            eu_set = {row["plant_id"] for row in eu_rows}
+                national_sets[country].append(ordinals.ordinal(row["plant_id"]))
 
-            results = []
-            for geo in geo_regions:
-                country = self._canonical_country_name(geo["country"])
-                region = self._canonical_region_name(geo["region"])
-                region_key = (country, region)
-                geo_lookup_key = geo["geo_region_id"] if (has_geo_regions and has_uid) else region_key
-
-                selected_sets = []
-                count_source_level = "none"
-
-                region_set = region_sets.get(geo_lookup_key, set())
-                if include_region and region_set:
-                    selected_sets.append(region_set)
-                    count_source_level = "region"
-
-                national_set = national_sets.get(country, set())
-                if include_national and national_set:
-                    selected_sets.append(national_set)
-                    if count_source_level == "none":
-                        count_source_level = "national"
-
-                international_set = eu_set if (include_international and country in EU_MEMBERS) else set()
-                if international_set:
-                    selected_sets.append(international_set)
-                    if count_source_level == "none":
-                        count_source_level = "international"
-
-                if selected_sets:
-                    merged = set()
-                    for s in selected_sets:
-                        merged.update(s)
-                    count = len(merged)
-                else:
-                    count = 0
+            covered_countries = {
+                row["country"]
+                for row in conn.execute(
+                    """
+                    SELECT DISTINCT j.country
+                    FROM jurisdictions j
+                    WHERE j.country IS NOT NULL AND TRIM(j.country) != ''
+                      AND EXISTS (
+                          SELECT 1
+                          FROM regulations r
+                          WHERE r.jurisdiction_id = j.id
+                            AND +r.is_webapp_scoped = 1
+                      )
+                    """
+                )
+            }
 
-                mapped_meta = mapped_region_meta.get(geo_lookup_key)
-                if mapped_meta and mapped_meta.get("has_region_jurisdiction"):
-                    jurisdiction_match = "exact_mapped"
-                    regulation_status = mapped_meta.get("regulation_status") or (
-                        "regulated" if region_set else "no_regulation"
-                    )
-                    jurisdiction_uid = (
-                        mapped_meta.get("jurisdiction_uid")
-                        or geo.get("jurisdiction_uid")
-                        or self._fallback_jurisdiction_uid(country, region, "region")
-                    )
-                elif (has_geo_regions and has_uid) and geo.get("jurisdiction_uid") and (
-                    national_set or international_set
-                ):
-                    jurisdiction_match = "country_overlay"
-                    regulation_status = "no_regulation"
-                    jurisdiction_uid = geo.get("jurisdiction_uid")
-                elif national_set or international_set:
-                    jurisdiction_match = "country_overlay"
-                    regulation_status = "no_regulation"
-                    jurisdiction_uid = self._fallback_jurisdiction_uid(country, region, "region")
-                else:
-                    jurisdiction_match = "none"
-                    regulation_status = "unknown"
-                    jurisdiction_uid = self._fallback_jurisdiction_uid(country, region, "region")
+            group_sets = defaultdict(list)
+            for row in group_rows:
+                group_sets[row["jurisdiction_group"]].append(ordinals.ordinal(row["plant_id"]))
 
-                results.append(
-                    {
-                        "geo_region_id": geo["geo_region_id"],
-                        "geojson_slug": geo["geojson_slug"],
-                        "country": country,
-                        "region": region,
-                        "count": count,
-                        "count_source_level": count_source_level,
-                        "jurisdiction_match": jurisdiction_match,
-                        "regulation_status": regulation_status,
-                        "jurisdiction_uid": jurisdiction_uid,
-                        "canonical_display_name": region if region != country else country,
-                    }
+            # Countries sharing the same groups share one precomputed union.
+            international_by_groups = {
+                groups: PlantBitmap.from_ordinals(
+                    ordinal for group in groups for ordinal in group_sets.get(group, ())
                 )
+                for groups in set(country_groups.values())
+            }
 
-            return results
+            international = {
+                country: international_by_groups[groups] for country, groups in country_groups.items()
+            }
+            covered_countries.update(country for country, bitmap in international.items() if bitmap)
+
+            bitmaps = RegulationBitmaps(
+                region={key: PlantBitmap.from_ordinals(values) for key, values in region_sets.items()},
+                national={key: PlantBitmap.from_ordinals(values) for key, values in national_sets.items()},
+                groups={key: PlantBitmap.from_ordinals(values) for key, values in group_sets.items()},
+                country_groups=country_groups,
+                international=international,
+                covered_countries=frozenset(covered_countries),
+                mapped_region_meta=mapped_region_meta,
+                keyed_by_geo_region_id=has_geo_regions and has_uid,
+            )
+            self._bitmaps_cache = (signature, bitmaps)
+            return bitmaps
         finally:
             conn.close()
 
+    def _region_weed_count_rows(
+        self,
+        geo_regions: List[Dict],
+        toggles: Tuple[bool, bool, bool],
+        bitmaps: RegulationBitmaps,
+    ) -> List[Dict]:
+        include_region, include_national, include_international = toggles
+        keyed_by_geo_region_id = bitmaps.keyed_by_geo_region_id
+        results = []
+        for geo in geo_regions:
+            country = self._canonical_country_name(geo["country"])
+            region = self._canonical_region_name(geo["region"])
+            region_key = (country, region)
+            geo_lookup_key = geo["geo_region_id"] if keyed_by_geo_region_id else region_key
+
+            selected_sets = []
+            count_source_level = "none"
+
+            region_set = bitmaps.region.get(geo_lookup_key, EMPTY_BITMAP)
+            if include_region and region_set:
+                selected_sets.append(region_set)
+                count_source_level = "region"
+
+            national_set = bitmaps.national.get(country, EMPTY_BITMAP)
+            if include_national and national_set:
+                selected_sets.append(national_set)
+                if count_source_level == "none":
+                    count_source_level = "national"
+
+            international_set = (
+                bitmaps.international.get(country, EMPTY_BITMAP) if include_international else EMPTY_BITMAP
+            )
+            if international_set:
+                selected_sets.append(international_set)
+                if count_source_level == "none":
+                    count_source_level = "international"
+
+            count = PlantBitmap.union_count(selected_sets)
+
+            mapped_meta = bitmaps.mapped_region_meta.get(geo_lookup_key)
+            if mapped_meta and mapped_meta.get("has_region_jurisdiction"):
+                jurisdiction_match = "exact_mapped"
+                regulation_status = mapped_meta.get("regulation_status") or (
+                    "regulated" if region_set else "no_regulation"
+                )
+                jurisdiction_uid = (
+                    mapped_meta.get("jurisdiction_uid")
+                    or geo.get("jurisdiction_uid")
+                    or self._fallback_jurisdiction_uid(country, region, "region")
+                )
+            elif keyed_by_geo_region_id and geo.get("jurisdiction_uid") and (
+                national_set or international_set
+            ):
+                jurisdiction_match = "country_overlay"
+                regulation_status = "no_regulation"
+                jurisdiction_uid = geo.get("jurisdiction_uid")
+            elif national_set or international_set:
+                jurisdiction_match = "country_overlay"
+                regulation_status = "no_regulation"
+                jurisdiction_uid = self._fallback_jurisdiction_uid(country, region, "region")
+            else:
+                jurisdiction_match = "none"
+                regulation_status = "unknown"
+                jurisdiction_uid = self._fallback_jurisdiction_uid(country, region, "region")
+
+            results.append(
+                {
+                    "geo_region_id": geo["geo_region_id"],
+                    "geojson_slug": geo["geojson_slug"],
+                    "country": country,
+                    "region": region,
+                    "count": count,
+                    "count_source_level": count_source_level,
+                    "jurisdiction_match": jurisdiction_match,
+                    "regulation_status": regulation_status,
+                    "jurisdiction_uid": jurisdiction_uid,
+                    "canonical_display_name": region if region != country else country,
+                }
+            )
+
+        return results
+
     def get_method_sources(self) -> List[Dict]:
         conn = self.get_connection()
         try:
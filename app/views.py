@@ -6,8 +6,9 @@ import requests as http_requests
 from flask import Blueprint, render_template, jsonify, current_app, request, flash, url_for, redirect, send_from_directory, abort
 from werkzeug.utils import safe_join
 
-from app import limiter, recaptcha
+from app import csrf, limiter, recaptcha
 from app.auth_helpers import account_logged_in
+from app.utils.database_base import serving_profile
 from app.utils.state_database import StateDatabase
 from app.utils.species_database import SpeciesDatabase
 from app.utils.generate_blog import BlogGenerator
@@ -30,12 +31,35 @@ blog_generator = BlogGenerator()
 # ----------------------------
 # Helpers
 # ----------------------------
+def _regulation_matrix():
+    # Installed and warmed by DataManager whenever a release is applied.
+    if not current_app.config.get("REGULATION_MATRIX_ENABLED", True):
+        return None
+    return current_app.extensions.get("regulation_matrix")
+
+
+def _species_search_index():
+    # Installed and warmed by DataManager (SPECIES_SEARCH_BACKEND=trigram only).
+    if current_app.config.get("SPECIES_SEARCH_BACKEND", "trigram") != "trigram":
+        return None
+    return current_app.extensions.get("species_search_index")
+
+
+def _species_suggest_index():
+    # Installed and warmed by DataManager whenever a release is applied.
+    return current_app.extensions.get("species_suggest_index")
+
+
 def _get_state_db() -> StateDatabase:
     db = current_app.extensions.get("state_db")
     if db is None:
         db = StateDatabase(
             db_path=current_app.config.get("DATABASE_PATH", "weeds.db"),
             geojson_dir=current_app.config.get("GEOJSON_DIR"),
+            immutable=current_app.config.get("DATABASE_IMMUTABLE", True),
+            pragmas=serving_profile(current_app.config),
+            memory_uri=current_app.config.get("DATABASE_MEMORY_URI"),
+            regulation_matrix=_regulation_matrix(),
         )
         current_app.extensions["state_db"] = db
     return db
@@ -47,6 +71,13 @@ def _get_species_db() -> SpeciesDatabase:
         db = SpeciesDatabase(
             db_path=current_app.config.get("DATABASE_PATH", "weeds.db"),
             geojson_dir=current_app.config.get("GEOJSON_DIR"),
+            immutable=current_app.config.get("DATABASE_IMMUTABLE", True),
+            pragmas=serving_profile(current_app.config),
+            memory_uri=current_app.config.get("DATABASE_MEMORY_URI"),
+            regulation_matrix=_regulation_matrix(),
+            search_index=_species_search_index(),
+            search_backend=current_app.config.get("SPECIES_SEARCH_BACKEND", "trigram"),
+            suggest_index=_species_suggest_index(),
         )
         current_app.extensions["species_db"] = db
     return db
@@ -90,24 +121,66 @@ def _data_correction_contact_message() -> str:
     )
 
 
-def _bool_arg(name: str, default: bool = True) -> bool:
-    v = request.args.get(name, str(default)).strip().lower()
+def _bool_arg(name: str, default: bool = True, source=None) -> bool:
+    source = request.args if source is None else source
+    v = source.get(name, str(default)).strip().lower()
     return v in {"1", "true", "yes", "y", "on"}
 
 
-def _toggle_params():
+def _toggle_params(source=None):
     """
     3-toggle system (all ON by default):
       includeRegion
       includeNational
       includeInternational
+    Read from the query string unless `source` (e.g. request.values) is given.
     """
-    include_region = _bool_arg("includeRegion", True)
-    include_national = _bool_arg("includeNational", True)
-    include_international = _bool_arg("includeInternational", True)
+    include_region = _bool_arg("includeRegion", True, source)
+    include_national = _bool_arg("includeNational", True, source)
+    include_international = _bool_arg("includeInternational", True, source)
     return include_region, include_national, include_international
 
 
+def _anonymous_sample_limit() -> int:
+    return max(0, int(current_app.config.get("AUTH_ANONYMOUS_SAMPLE_LIMIT", 5)))
+
+
+def _apply_sample_limit(payload: dict, authenticated: bool, sample_limit: int) -> dict:
+    """Truncate a region payload to the anonymous sample and record how much was hidden."""
+    weeds = payload.get("weeds") or []
+    total_count = len(weeds)
+    if not authenticated:
+        payload["weeds"] = weeds[:sample_limit]
+
+    payload["authenticated"] = authenticated
+    payload["sample_limit"] = sample_limit
+    payload["total_count"] = total_count
+    payload["is_sample"] = (not authenticated) and total_count > len(payload.get("weeds") or [])
+    return payload
+
+
+def _requested_geo_region_ids(max_ids: int):
+    """Distinct requested ids in request order, or None once more than `max_ids` are seen."""
+    raw = request.args.getlist("ids") + request.form.getlist("ids")
+    body = request.get_json(silent=True) if request.method == "POST" else None
+    if isinstance(body, dict):
+        body_ids = body.get("ids")
+        if isinstance(body_ids, list):
+            raw.extend(str(value) for value in body_ids)
+        elif isinstance(body_ids, str):
+            raw.append(body_ids)
+
+    ids = {}
+    for chunk in raw:
+        for part in chunk.split(","):
+            part = part.strip()
+            if part and part not in ids:
+                ids[part] = None
+                if len(ids) > max_ids:
+                    return None
+    return list(ids)
+
+
 # ----------------------------
 # Home routes
 # ----------------------------
@@ -154,6 +227,16 @@ def region_weed_counts():
     return jsonify(counts)
 
 
+@home.route("/api/countries-with-data")
+def countries_with_data():
+    """
+    Countries with regulated species in the current release, including
+    countries covered only through an international group (e.g. the EU).
+    Lets the map grey out countries without data up front.
+    """
+    return jsonify({"countries": _get_state_db().countries_with_data()})
+
+
 @home.route("/api/region")
 def region_weeds():
     """
@@ -163,36 +246,114 @@ def region_weeds():
     Query args:
       geo_region_id=<stable map region id>
       includeRegion/includeNational/includeInternational
+      limit=<page size>, cursor=<next_cursor from the previous page>  (signed-in only)
+
+    Anonymous users get the first AUTH_ANONYMOUS_SAMPLE_LIMIT species by
+    canonical_name. Signed-in users get the full list unless they ask for a
+    page, in which case the response carries `next_cursor`.
     """
     geo_region_id = request.args.get("geo_region_id", "").strip()
     if not geo_region_id:
         return jsonify({"error": "geo_region_id is required"}), 400
 
     include_region, include_national, include_international = _toggle_params()
-    payload = _get_state_db().get_weeds_for_geo_region(
-        geo_region_id=geo_region_id,
-        include_region=include_region,
-        include_national=include_national,
-        include_international=include_international,
-    )
-    if not payload.get("geo_region"):
-        return jsonify({"error": "geo_region_id not found"}), 404
-
+    toggles = {
+        "include_region": include_region,
+        "include_national": include_national,
+        "include_international": include_international,
+    }
+    state_db = _get_state_db()
     authenticated = account_logged_in()
-    sample_limit = max(0, int(current_app.config.get("AUTH_ANONYMOUS_SAMPLE_LIMIT", 5)))
-    weeds = payload.get("weeds") or []
-    total_count = len(weeds)
+    sample_limit = _anonymous_sample_limit()
+    limit_arg = request.args.get("limit", "").strip()
+    cursor = request.args.get("cursor", "").strip() or None
+
     if not authenticated:
-        payload["weeds"] = weeds[:sample_limit]
+        # The sample is always the first page; cursors are a signed-in feature.
+        payload = state_db.get_weeds_page_for_geo_region(geo_region_id, limit=sample_limit, **toggles)
+        payload.pop("next_cursor", None)
+    elif limit_arg or cursor:
+        max_limit = max(1, int(current_app.config.get("REGION_PAGE_MAX_LIMIT", 500)))
+        try:
+            limit = int(limit_arg) if limit_arg else max_limit
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        limit = max(1, min(limit, max_limit))
+        payload = state_db.get_weeds_page_for_geo_region(geo_region_id, limit=limit, cursor=cursor, **toggles)
+    else:
+        payload = state_db.get_weeds_for_geo_region(geo_region_id=geo_region_id, **toggles)
+        payload["total_count"] = len(payload.get("weeds") or [])
+
+    if not payload.get("geo_region"):
+        return jsonify({"error": "geo_region_id not found"}), 404
 
     payload["authenticated"] = authenticated
     payload["sample_limit"] = sample_limit
-    payload["total_count"] = total_count
-    payload["is_sample"] = (not authenticated) and total_count > len(payload.get("weeds") or [])
-
+    payload["is_sample"] = (not authenticated) and payload["total_count"] > len(payload["weeds"])
     return jsonify(payload)
 
 
+@home.route("/api/regions", methods=["GET", "POST"])
+@csrf.exempt
+@limiter.limit("60 per hour")
+def regions_weeds():
+    """
+    Returns weeds for many mapped geo regions in one call.
+
+    Query args (GET) or form/JSON body (POST, for long lists):
+      ids=<geo_region_id>,<geo_region_id>,...  (comma-separated or repeated)
+      country=<country name>  (adds every mapped region of that country)
+      includeRegion/includeNational/includeInternational
+    Each region payload matches /api/region, including the anonymous sample limit.
+    Anonymous callers may request fewer regions per call than signed-in users.
+    """
+    authenticated = account_logged_in()
+    if authenticated:
+        max_ids = max(1, int(current_app.config.get("REGION_BATCH_MAX_IDS", 1000)))
+    else:
+        max_ids = max(1, int(current_app.config.get("REGION_BATCH_MAX_IDS_ANONYMOUS", 100)))
+    too_many = {"error": f"At most {max_ids} regions can be requested at once"}
+    geo_region_ids = _requested_geo_region_ids(max_ids)
+    if geo_region_ids is None:
+        return jsonify(too_many), 400
+    state_db = _get_state_db()
+    country = (request.values.get("country") or "").strip()
+    if country:
+        geo_region_ids = dict.fromkeys(geo_region_ids)
+        for geo_region in state_db.geo_regions_for_country(country):
+            geo_region_ids[geo_region["geo_region_id"]] = None
+        geo_region_ids = list(geo_region_ids)
+    if not geo_region_ids:
+        return jsonify({"error": "ids or country is required"}), 400
+    if len(geo_region_ids) > max_ids:
+        return jsonify(too_many), 400
+
+    # Toggles may come in a POST form body here, unlike the GET-only endpoints.
+    include_region, include_national, include_international = _toggle_params(request.values)
+    payloads = state_db.get_weeds_for_geo_regions(
+        geo_region_ids,
+        include_region=include_region,
+        include_national=include_national,
+        include_international=include_international,
+    )
+
+    sample_limit = _anonymous_sample_limit()
+    regions = []
+    for geo_region_id in geo_region_ids:
+        payload = payloads.get(geo_region_id)
+        if payload:
+            regions.append(_apply_sample_limit(payload, authenticated, sample_limit))
+
+    return jsonify(
+        {
+            "regions": regions,
+            "not_found": [geo_region_id for geo_region_id in geo_region_ids if geo_region_id not in payloads],
+            "authenticated": authenticated,
+            "sample_limit": sample_limit,
+        }
+    )
+
+
 @home.route("/api/geojson-files")
 def geojson_files():
     """
@@ -329,6 +490,27 @@ def search_species():
     return jsonify(results)
 
 
+@species.route("/api/suggest")
+@limiter.limit("600 per hour")
+def suggest_species():
+    """
+    Autocomplete while typing: up to `limit` species (default 10) whose common
+    name, canonical name or synonym starts with `q`, with species_id and the
+    primary common name. Answered from memory once the release's name list
+    is built; until then, and for releases without species_id (the sample),
+    from species search, so rows may carry only usage_key. The species picker calls it on every pause in typing, hence its own limit.
+    """
+    query = request.args.get("q", "")
+    limit_arg = request.args.get("limit", "").strip()
+    max_limit = max(1, int(current_app.config.get("SPECIES_SUGGEST_MAX_LIMIT", 20)))
+    try:
+        limit = int(limit_arg) if limit_arg else min(10, max_limit)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, max_limit))
+    return jsonify(_get_species_db().suggest_species(query, limit=limit))
+
+
 @species.route("/api/by-species-id/<species_id>")
 def species_by_id(species_id: str):
     result = _get_species_db().get_species_by_id(species_id)
@@ -0,0 +1,353 @@
+"""Microbenchmarks for the StateDatabase/SpeciesDatabase hot paths.
+
+Runs each method against the tracked sample and a synthetic production-sized
+release (generated once into --synthetic-dir, see generate_synthetic_release.py),
+both compiled into serving databases and opened the way the app opens them.
+Per-version builds (plant bitmaps, regulation matrix, species search and
+suggest indexes) are timed on their own; for every case it records the first
+call, p50/p95 of the following calls and tracemalloc allocations of one call,
+then writes JSON that can be diffed or passed back with --compare to flag
+regressions. Per-instance response caches (map counts, highlight metrics) are
+dropped before each of those calls, so they time the work a request does
+after a release swap; p50/p95 of the same calls answered from those caches
+are reported separately.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.config import Config
+from app.utils.database_base import serving_profile
+from app.utils.regulation_matrix import SharedRegulationMatrix
+from app.utils.species_search_index import SharedSpeciesSearchIndex
+from app.utils.species_suggest_index import SharedSpeciesSuggestIndex
+from app.utils.release_install import install_release
+from app.utils.species_database import SpeciesDatabase
+from app.utils.state_database import StateDatabase
+from check_query_plans import drop_response_caches
+from generate_synthetic_release import build_release
+
+TOGGLES = tuple(itertools.product((True, False), repeat=3))
+
+
+def _toggle_label(toggles) -> str:
+    return "".join(flag if enabled else "-" for flag, enabled in zip("RNI", toggles))
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _timed_calls(call, repeat: int, reset=None):
+    timings = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def measure(call, repeat: int, reset) -> dict:
+    """
+    Time one call cold, `repeat` calls warm with `reset` (dropping the response
+    caches) before each, `repeat` calls answered from those caches, and trace
+    the allocations of one more uncached call.
+    """
+    reset()
+    started = time.perf_counter()
+    call()
+    first_ms = (time.perf_counter() - started) * 1000
+
+    timings = _timed_calls(call, repeat, reset)
+    cached_timings = _timed_calls(call, repeat)
+
+    reset()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        snapshot = tracemalloc.take_snapshot()
+        call()
+        after, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "first_ms": round(first_ms, 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "min_ms": round(min(timings), 3),
+        "cached_p50_ms": round(statistics.median(cached_timings), 3),
+        "cached_p95_ms": round(_percentile(cached_timings, 0.95), 3),
+        "alloc_peak_kib": round((peak - before) / 1024, 1),
+        "alloc_retained_kib": round((after - before) / 1024, 1),
+        "alloc_blocks": sum(stat.count_diff for stat in stats if stat.count_diff > 0),
+    }
+
+
+def _region_count_cases(state_db):
+    return [
+        (f"get_region_weed_counts[{_toggle_label(toggles)}]", lambda t=toggles: state_db.get_region_weed_counts(*t))
+        for toggles in TOGGLES
+    ]
+
+
+def _lookup_cases(state_db, species_db):
+    """(case name, callable) for the per-region and per-species lookups, on representative inputs."""
+    cases = []
+    counts = sorted(
+        state_db.get_region_weed_counts(True, True, True),
+        key=lambda row: (row["count"], row["geo_region_id"]),
+    )
+    if counts:
+        for label, row in (("largest", counts[-1]), ("median", counts[len(counts) // 2])):
+            geo_region_id = row["geo_region_id"]
+            cases.append(
+                (f"get_weeds_for_geo_region[{label}]", lambda g=geo_region_id: state_db.get_weeds_for_geo_region(g))
+            )
+
+    cases.append(("get_highlight_metrics", lambda: state_db.get_highlight_metrics(include_counts=True)))
+    cases.append(("get_method_sources", state_db.get_method_sources))
+
+    conn = sqlite3.connect(f"file:{species_db.db_path}?mode=ro", uri=True)
+    try:
+        plants = conn.execute(
+            """
+            SELECT p.canonical_name, r.plant_id, COUNT(*) AS regulation_count
+            FROM regulations r
+            JOIN plants p ON p.id = r.plant_id
+            WHERE r.is_webapp_scoped = 1
+            GROUP BY r.plant_id
+            ORDER BY regulation_count DESC, r.plant_id
+            """
+        ).fetchall()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(plants)")}
+        species_ids = {}
+        if plants and "species_id" in columns:
+            for label, plant in (("widest", plants[0]), ("median", plants[len(plants) // 2])):
+                species_ids[label] = conn.execute("SELECT species_id FROM plants WHERE id = ?", (plant[1],)).fetchone()[0]
+    finally:
+        conn.close()
+
+    if plants:
+        name = plants[0][0].lower()
+        # What someone types into a name search, from two characters on.
+        for query in (name[:2], name[:4], name, name.split()[-1][:5], "zzzq"):
+            cases.append((f"search_weeds[{query}]", lambda q=query: species_db.search_weeds(q)))
+        for query in (name[:2], name[:4], name):
+            cases.append((f"suggest_species[{query}]", lambda q=query: species_db.suggest_species(q)))
+    if species_ids:
+        for label, species_id in species_ids.items():
+            cases.append(
+                (f"get_states_by_species_id[{label}]", lambda s=species_id: species_db.get_states_by_species_id(s))
+            )
+    else:
+        cases.append(("get_states_by_species_id", lambda: species_db.get_states_by_species_id("")))
+    return cases
+
+
+def run_dataset(name, source_path, geojson_dir, work_dir, repeat, use_matrix, search_backend):
+    serving_path = os.path.join(work_dir, f"{name}_serving.db")
+    started = time.perf_counter()
+    install_release(source_path, serving_path, geojson_dir=geojson_dir)
+    compile_s = time.perf_counter() - started
+
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    matrix = SharedRegulationMatrix() if use_matrix else None
+    options = dict(immutable=True, pragmas=serving_profile(config), regulation_matrix=matrix)
+    search_index = SharedSpeciesSearchIndex() if search_backend == "trigram" else None
+    state_db = StateDatabase(serving_path, geojson_dir, **options)
+    species_db = SpeciesDatabase(
+        serving_path,
+        geojson_dir,
+        search_index=search_index,
+        search_backend=search_backend,
+        suggest_index=SharedSpeciesSuggestIndex(),
+        **options,
+    )
+
+    conn = sqlite3.connect(f"file:{serving_path}?mode=ro", uri=True)
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("plants", "jurisdictions", "regulations")
+    }
+    conn.close()
+
+    # Once per data version in a worker; timed on their own so they do not
+    # land in whichever case happens to run first.
+    builds = {}
+    build_calls = [("regulation_bitmaps", state_db._regulation_bitmaps)]
+    if use_matrix:
+        build_calls.append(("regulation_matrix", state_db._matrix))
+    if search_index is not None:
+        build_calls.append(("species_search_index", species_db._search_index))
+    build_calls.append(("species_suggest_index", lambda: species_db.suggest_index.get(species_db.get_connection())))
+    for build, call in build_calls:
+        started = time.perf_counter()
+        call()
+        builds[build] = round((time.perf_counter() - started) * 1000, 1)
+        print(f"  {name:9} build {build:42} {builds[build]:9.1f} ms")
+
+    results = {}
+    # measure() drops the response caches, so picking representative regions
+    # in _lookup_cases does not warm the count cases.
+    for cases in (lambda: _region_count_cases(state_db), lambda: _lookup_cases(state_db, species_db)):
+        for case, call in cases():
+            try:
+                results[case] = measure(call, repeat, lambda: drop_response_caches(state_db))
+            except Exception as exc:
+                # e.g. the sample schema predates species_id.
+                results[case] = {"error": f"{type(exc).__name__}: {exc}"}
+            print(f"  {name:9} {case:48} {_summary(results[case])}")
+
+    return {
+        "source": os.path.relpath(source_path, PROJECT_ROOT),
+        "rows": counts,
+        "compile_s": round(compile_s, 2),
+        "builds_ms": builds,
+        "cases": results,
+    }
+
+
+def _summary(result) -> str:
+    if "error" in result:
+        return f"error: {result['error'][:60]}"
+    return (
+        f"first {result['first_ms']:9.2f}  p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}"
+        f"  cached p50 {result['cached_p50_ms']:8.2f} ms  peak {result['alloc_peak_kib']:9.1f} KiB"
+    )
+
+
+def compare(previous, current, threshold):
+    """Print uncached p50 ratios against an earlier run; returns the regressed cases."""
+    regressions = []
+    print(
+        f"\nCompared with {previous['meta'].get('git_commit') or 'previous run'} "
+        f"(threshold x{threshold} on uncached p50):"
+    )
+    for dataset, data in current["datasets"].items():
+        old_cases = previous.get("datasets", {}).get(dataset, {}).get("cases", {})
+        for case, result in data["cases"].items():
+            old = old_cases.get(case)
+            if not old or "error" in old or "error" in result:
+                continue
+            # p95 of a few dozen calls is too noisy to gate on; sub-millisecond
+            # cases are compared against a 0.1 ms floor for the same reason.
+            ratio = max(result["p50_ms"], 0.1) / max(old["p50_ms"], 0.1)
+            change = (
+                f"p50 {old['p50_ms']:.2f} -> {result['p50_ms']:.2f} ms, "
+                f"p95 {old['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+            )
+            if ratio >= threshold:
+                regressions.append(f"{dataset}:{case}")
+                print(f"  REGRESSED {dataset:9} {case:48} {change}")
+            elif ratio <= 1 / threshold:
+                print(f"  improved  {dataset:9} {case:48} {change}")
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StateDatabase/SpeciesDatabase hot paths.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file.")
+    parser.add_argument("--compare", help="Earlier results JSON; exit non-zero on p50 regressions.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p50 ratio counted as a regression.")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed calls per case after the first.")
+    parser.add_argument("--work-dir", default=os.path.join("data_cache", "benchmarks"), help="Serving databases.")
+    parser.add_argument("--synthetic-dir", default="data_synthetic", help="Synthetic release; generated if missing.")
+    parser.add_argument("--plants", type=int, default=100_000, help="Size of a newly generated synthetic release.")
+    parser.add_argument("--jurisdictions", type=int, default=10_000)
+    parser.add_argument("--regulations", type=int, default=2_000_000)
+    parser.add_argument("--geojson-regions", type=int, default=3_000)
+    parser.add_argument("--skip-sample", action="store_true")
+    parser.add_argument("--skip-synthetic", action="store_true")
+    parser.add_argument("--no-matrix", action="store_true", help="Benchmark the SQL paths (REGULATION_MATRIX_ENABLED=0).")
+    parser.add_argument(
+        "--search-backend",
+        choices=("trigram", "fts5", "like"),
+        default=Config.SPECIES_SEARCH_BACKEND,
+        help="search_weeds backend (SPECIES_SEARCH_BACKEND).",
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    datasets = []
+    if not args.skip_sample:
+        datasets.append(
+            (
+                "sample",
+                os.path.join(PROJECT_ROOT, Config.LOCAL_SAMPLE_DB_PATH),
+                os.path.join(PROJECT_ROOT, Config.LOCAL_SAMPLE_GEOJSON_DIR),
+            )
+        )
+    if not args.skip_synthetic:
+        synthetic_db = os.path.join(args.synthetic_dir, "weeds.db")
+        if not os.path.exists(synthetic_db):
+            print(f"Generating synthetic release in {args.synthetic_dir} ...")
+            build_release(
+                args.synthetic_dir,
+                plants=args.plants,
+                jurisdictions=args.jurisdictions,
+                regulations=args.regulations,
+                geojson_regions=args.geojson_regions,
+            )
+        datasets.append(("synthetic", os.path.abspath(synthetic_db), os.path.abspath(os.path.join(args.synthetic_dir, "geojson"))))
+
+    results = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "repeat": args.repeat,
+            "regulation_matrix": not args.no_matrix,
+            "search_backend": args.search_backend,
+        },
+        "datasets": {},
+    }
+    for name, source_path, geojson_dir in datasets:
+        results["datasets"][name] = run_dataset(
+            name, source_path, geojson_dir, args.work_dir, args.repeat, not args.no_matrix, args.search_backend
+        )
+
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            previous = json.load(handle)
+        if compare(previous, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,351 @@
+"""Query-plan and latency regression check for the release read paths.
+
+Builds a synthetic release (or takes --db), compiles its serving database the
+way the app does, then calls every StateDatabase/SpeciesDatabase read method a
+request can reach, with every include-toggle combination, on the SQL path (no
+regulation matrix). Every statement they issue is captured and run through
+EXPLAIN QUERY PLAN; the check fails if any of them scans `regulations` or
+`jurisdictions` in full, or if a method's p95 latency is over its budget.
+
+It does so twice: on the serving database, then on the release file itself,
+which workers serve while the serving database is built or when installs are
+off. The release file has none of the precomputed tables, so the second pass
+covers the fallback SQL: the species lookups joining regulations, plants and
+jurisdictions, and the map counts, highlight metrics and plant bitmaps
+computed from regulations. It has no ANALYZE statistics either, so it is where
+a plan goes wrong.
+
+Per-release builds (plant bitmaps, geo region list) are warmed up before
+capture starts: they run once per data version, not per request. The release
+pass also captures and times the bitmap build. Per-instance response caches
+(map counts, highlight metrics) are dropped before every call, so the timings
+are of the uncached path a worker takes after a release swap.
+"""
+
+import argparse
+import itertools
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.utils.release_install import install_release
+from app.utils.species_database import SpeciesDatabase
+from app.utils.state_database import StateDatabase
+from generate_synthetic_release import build_release
+
+TOGGLES = tuple(itertools.product((True, False), repeat=3))
+GUARDED_TABLES = ("regulations", "jurisdictions")
+
+# p95 budgets in milliseconds for one call on the default synthetic release; species
+# lookups use its most widely regulated plant.
+LATENCY_BUDGETS_MS = {
+    "get_region_weed_counts": 25,
+    "get_weeds_for_geo_region": 50,
+    "get_weeds_for_geo_regions": 500,
+    "get_weeds_page_for_geo_region": 50,
+    "get_highlight_metrics": 5,
+    "country_has_data": 1,
+    "search_weeds": 150,
+    "get_species_by_id": 10,
+    # The skewed generator's most widely regulated plant has about a thousand
+    # scoped regulations, and these two return one dict per regulation.
+    "get_weeds_by_species_id": 25,
+    "get_weeds_by_usage_key": 25,
+    "get_states_by_species_id": 10,
+    "get_states_by_usage_key": 10,
+    "get_states_by_weed": 25,
+    "get_method_sources": 150,
+}
+
+# p95 budgets in milliseconds on the release file, where map counts, highlight
+# metrics and the plant bitmaps are computed from regulations and the species
+# lookups join the release tables.
+RELEASE_LATENCY_BUDGETS_MS = {
+    **LATENCY_BUDGETS_MS,
+    # Matches geo regions to jurisdictions on LOWER(TRIM(uid)) with no index
+    # to seek; once per release.
+    "_regulation_bitmaps": 5000,
+    # Computed once per release, then cached.
+    "get_highlight_metrics": 2000,
+    "get_region_weed_counts": 100,
+    "get_states_by_species_id": 50,
+    "get_states_by_usage_key": 50,
+    "get_states_by_weed": 50,
+}
+
+# Scans that are expected, as (method, statement pattern, plan line pattern, reason).
+# A scan is allowed only when all three match; it is reported with its reason.
+ALLOWED_SCANS = (
+    (
+        "get_method_sources",
+        r"FROM jurisdictions j\s+WHERE EXISTS",
+        r"^SCAN j\b",
+        "lists every jurisdiction with regulations",
+    ),
+    # Release file only: the serving database has these precomputed or indexed.
+    (
+        "_regulation_bitmaps",
+        r"regulations",
+        r"",
+        "built from every scoped regulation, once per release",
+    ),
+    (
+        "get_highlight_metrics",
+        r"regulations",
+        r"",
+        "computed from every scoped regulation without release_highlight_metrics, then cached",
+    ),
+    (
+        "get_weeds_page_for_geo_region",
+        r"LOWER\(TRIM\(j\.jurisdiction_uid\)\)",
+        r"^SCAN j\b",
+        "matches the region uid without jurisdiction_uid_norm",
+    ),
+)
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+# A search on the is_webapp_scoped flag alone reads most of the table.
+_FLAG_SEARCH = re.compile(r"^SEARCH (\w+) USING (?:COVERING )?INDEX \w+ \(is_webapp_scoped=\?\)")
+_TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.I)
+_NOT_ALIASES = {"on", "where", "join", "left", "inner", "cross", "group", "order", "limit", "using", "natural"}
+
+
+def _aliases(sql: str) -> dict:
+    aliases = {}
+    for table, alias in _TABLE_ALIAS.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in _NOT_ALIASES:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(conn, sql: str):
+    """Plan lines that scan a guarded table (or one of its indexes) end to end."""
+    aliases = _aliases(sql)
+    scans = []
+    for line in StateDatabase.query_plan(conn, sql):
+        match = _SCAN.match(line) or _FLAG_SEARCH.match(line)
+        if match and aliases.get(match.group(1)) in GUARDED_TABLES:
+            scans.append(line)
+    return scans
+
+
+def allowed_scan(method: str, sql: str, line: str):
+    """The reason `line` of `sql` (issued by `method`) is an expected scan, else None."""
+    for allowed_method, statement, plan_line, reason in ALLOWED_SCANS:
+        if method == allowed_method and re.search(statement, sql) and re.search(plan_line, line):
+            return reason
+    return None
+
+
+def drop_response_caches(state_db):
+    """Forget cached request results, keeping the per-release builds."""
+    state_db._region_counts_cache = {}
+    state_db._highlight_metrics_cache = None
+
+
+def _rebuild_bitmaps(state_db):
+    state_db._bitmaps_cache = None
+    return state_db._regulation_bitmaps()
+
+
+def _hot_calls(state_db, species_db, sample, builds=False):
+    """
+    (method name, callable) for every request-time read, with toggle variants;
+    with `builds`, the per-release plant bitmap build too.
+    """
+    geo_region_id = sample["geo_region_id"]
+    calls = [("_regulation_bitmaps", lambda: _rebuild_bitmaps(state_db))] if builds else []
+    for toggles in TOGGLES:
+        calls += [
+            ("get_region_weed_counts", lambda t=toggles: state_db.get_region_weed_counts(*t)),
+            ("get_weeds_for_geo_region", lambda t=toggles: state_db.get_weeds_for_geo_region(geo_region_id, *t)),
+            (
+                "get_weeds_for_geo_regions",
+                lambda t=toggles: state_db.get_weeds_for_geo_regions(sample["geo_region_ids"], *t),
+            ),
+            (
+                "get_weeds_page_for_geo_region",
+                lambda t=toggles: state_db.get_weeds_page_for_geo_region(geo_region_id, 50, None, *t),
+            ),
+            (
+                "get_weeds_page_for_geo_region",
+                lambda t=toggles: state_db.get_weeds_page_for_geo_region(geo_region_id, 50, "Genus", *t),
+            ),
+        ]
+    calls += [
+        ("get_highlight_metrics", lambda: state_db.get_highlight_metrics(include_counts=True)),
+        ("get_highlight_metrics", lambda: state_db.get_highlight_metrics(include_counts=False)),
+        ("country_has_data", lambda: state_db.country_has_data(sample["country"])),
+        ("get_method_sources", state_db.get_method_sources),
+        ("search_weeds", lambda: species_db.search_weeds(sample["query"])),
+        ("get_species_by_id", lambda: species_db.get_species_by_id(sample["species_id"])),
+        ("get_weeds_by_species_id", lambda: species_db.get_weeds_by_species_id(sample["species_id"])),
+        ("get_weeds_by_usage_key", lambda: species_db.get_weeds_by_usage_key(sample["usage_key"])),
+        ("get_states_by_species_id", lambda: species_db.get_states_by_species_id(sample["species_id"])),
+        ("get_states_by_usage_key", lambda: species_db.get_states_by_usage_key(sample["usage_key"])),
+        ("get_states_by_weed", lambda: species_db.get_states_by_weed(sample["weed_name"])),
+    ]
+    return calls
+
+
+def _sample(conn, state_db):
+    plant = conn.execute(
+        """
+        SELECT p.species_id, p.gbif_usage_key, p.canonical_name
+        FROM plants p
+        JOIN regulations r ON r.plant_id = p.id AND r.is_webapp_scoped = 1
+        GROUP BY p.id
+        ORDER BY COUNT(*) DESC
+        LIMIT 1
+        """
+    ).fetchone()
+    geo_regions = state_db._load_geo_regions()
+    if plant is None or not geo_regions:
+        raise SystemExit("Release has no scoped regulations or no geo regions to check.")
+    return {
+        "species_id": plant[0],
+        "usage_key": plant[1],
+        "weed_name": plant[2],
+        "query": plant[2][:3],
+        "geo_region_id": geo_regions[0]["geo_region_id"],
+        "geo_region_ids": [
+            region["geo_region_id"] for region in state_db.geo_regions_for_country(geo_regions[0]["country"])
+        ],
+        "country": geo_regions[0]["country"],
+    }
+
+
+def check_database(label, db_path, geojson_dir, args, budgets, repeat, builds=False):
+    """Capture, plan and time every read path on one database; returns the number of problems."""
+    state_db = StateDatabase(db_path, geojson_dir, immutable=True)
+    species_db = SpeciesDatabase(db_path, geojson_dir, immutable=True)
+    plan_conn = sqlite3.connect(f"file:{db_path}?immutable=1", uri=True)
+    sample = _sample(plan_conn, state_db)
+
+    # Per-version builds, not per-request work.
+    state_db._regulation_bitmaps()
+    state_db._load_group_membership(state_db.get_connection())
+
+    statements = {}
+    current = {"method": None}
+
+    def capture(sql):
+        if current["method"] and sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.setdefault(sql, current["method"])
+
+    for db in (state_db, species_db):
+        db.get_connection().set_trace_callback(capture)
+
+    timings = {}
+    for method, call in _hot_calls(state_db, species_db, sample, builds=builds):
+        drop_response_caches(state_db)
+        current["method"] = method
+        call()
+        current["method"] = None
+        if args.no_latency:
+            continue
+        for _ in range(repeat):
+            drop_response_caches(state_db)
+            started = time.perf_counter()
+            call()
+            timings.setdefault(method, []).append((time.perf_counter() - started) * 1000)
+
+    failures = 0
+    print(f"\n{label}: EXPLAIN QUERY PLAN for {len(statements)} statements:")
+    for sql, method in sorted(statements.items(), key=lambda item: item[1]):
+        unexpected = []
+        for line in full_scans(plan_conn, sql):
+            reason = allowed_scan(method, sql, line)
+            if reason:
+                print(f"  allowed  {method}: {line} ({reason})")
+            else:
+                unexpected.append(line)
+        if not unexpected:
+            continue
+        failures += 1
+        print(f"  FAIL     {method}: {'; '.join(unexpected)}")
+        print(f"           {' '.join(sql.split())[:240]}")
+    if not failures:
+        print("  no unexpected full scans of regulations or jurisdictions")
+
+    if timings:
+        print(f"\n{label}: latency (ms): method, p50, p95, budget")
+        for method in sorted(timings):
+            values = sorted(timings[method])
+            p50 = statistics.median(values)
+            p95 = values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+            budget = budgets.get(method, 100) * args.budget_scale
+            status = "ok" if p95 <= budget else "FAIL"
+            failures += status == "FAIL"
+            print(f"  {status:4} {method:32} {p50:8.2f} {p95:8.2f} {budget:8.1f}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fail if a request-time query scans regulations/jurisdictions or misses its latency budget."
+    )
+    parser.add_argument("--db", help="v1.1 release weeds.db to check instead of building a synthetic one.")
+    parser.add_argument("--geojson-dir", help="GeoJSON directory for --db.")
+    parser.add_argument("--work-dir", help="Where to write the synthetic release and serving copy (default: temp).")
+    parser.add_argument("--plants", type=int, default=20_000)
+    parser.add_argument("--jurisdictions", type=int, default=2_000)
+    parser.add_argument("--regulations", type=int, default=200_000)
+    parser.add_argument("--geojson-regions", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per method variant.")
+    parser.add_argument(
+        "--release-repeat", type=int, default=5, help="Timed calls per method variant on the release file."
+    )
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every latency budget.")
+    parser.add_argument("--no-latency", action="store_true", help="Check plans only.")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="query-plans-")
+    if args.db:
+        source_path, geojson_dir = args.db, args.geojson_dir
+    else:
+        started = time.perf_counter()
+        source_path, geojson_dir = build_release(
+            os.path.join(work_dir, "release"),
+            plants=args.plants,
+            jurisdictions=args.jurisdictions,
+            regulations=args.regulations,
+            geojson_regions=args.geojson_regions,
+            seed=args.seed,
+        )
+        print(f"Built synthetic release in {time.perf_counter() - started:.1f}s: {source_path}")
+
+    serving_path = os.path.join(work_dir, "serving.db")
+    started = time.perf_counter()
+    install_release(source_path, serving_path, geojson_dir=geojson_dir)
+    print(f"Compiled serving database in {time.perf_counter() - started:.1f}s: {serving_path}")
+
+    failures = check_database(
+        "serving database", serving_path, geojson_dir, args, LATENCY_BUDGETS_MS, repeat=args.repeat
+    )
+    failures += check_database(
+        "release file",
+        source_path,
+        geojson_dir,
+        args,
+        RELEASE_LATENCY_BUDGETS_MS,
+        repeat=args.release_repeat,
+        builds=True,
+    )
+
+    print(f"\n{'FAILED' if failures else 'PASSED'}: {failures} problem(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
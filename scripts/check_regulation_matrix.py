@@ -0,0 +1,116 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.utils.regulation_matrix import SharedRegulationMatrix
+from app.utils.species_database import SpeciesDatabase
+from app.utils.state_database import StateDatabase
+
+TOGGLES = tuple(itertools.product((True, False), repeat=3))
+
+
+def _row_key(row):
+    return json.dumps(row, sort_keys=True, default=str)
+
+
+def _compare(label, expected, actual, mismatches, ties):
+    if expected == actual:
+        return
+    # SQL leaves the order of ORDER BY ties unspecified; same rows in another
+    # tie order are reported separately from real differences.
+    if isinstance(expected, list) and isinstance(actual, list):
+        if sorted(map(_row_key, expected)) == sorted(map(_row_key, actual)):
+            ties.append(label)
+            return
+    mismatches.append(label)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare regulation-matrix answers with the SQL reference for every species and region."
+    )
+    parser.add_argument("--db", required=True, help="Release database (installed copy or source).")
+    parser.add_argument("--geojson-dir", help="GeoJSON directory of the release, for region discovery.")
+    parser.add_argument("--show", type=int, default=10, help="Mismatching lookups to print.")
+    args = parser.parse_args()
+
+    shared = SharedRegulationMatrix()
+    sql_species = SpeciesDatabase(args.db, args.geojson_dir)
+    matrix_species = SpeciesDatabase(args.db, args.geojson_dir, regulation_matrix=shared)
+    sql_state = StateDatabase(args.db, args.geojson_dir)
+    matrix_state = StateDatabase(args.db, args.geojson_dir, regulation_matrix=shared)
+
+    matrix = matrix_species._matrix()
+    if matrix is None:
+        print("Release schema is not supported by the regulation matrix; SQL serves every lookup.")
+        return 0
+    print(f"Matrix: {len(matrix.plants['id'])} plants, {len(matrix.jurisdictions['id'])} jurisdictions, {len(matrix)} entries")
+
+    conn = sql_species.get_connection()
+    plants = conn.execute("SELECT species_id, gbif_usage_key, canonical_name, english_name FROM plants").fetchall()
+
+    mismatches, ties = [], []
+    checked = 0
+    _compare("get_all_weeds", sql_species.get_all_weeds(), matrix_species.get_all_weeds(), mismatches, ties)
+    checked += 1
+    for species_id in sorted({row["species_id"] for row in plants if row["species_id"] is not None}):
+        for method in ("get_weeds_by_species_id", "get_states_by_species_id"):
+            _compare(
+                f"{method}({species_id!r})",
+                getattr(sql_species, method)(species_id),
+                getattr(matrix_species, method)(species_id),
+                mismatches,
+                ties,
+            )
+            checked += 1
+    for usage_key in sorted({row["gbif_usage_key"] for row in plants if row["gbif_usage_key"] is not None}):
+        for method in ("get_weeds_by_usage_key", "get_states_by_usage_key"):
+            _compare(
+                f"{method}({usage_key!r})",
+                getattr(sql_species, method)(usage_key),
+                getattr(matrix_species, method)(usage_key),
+                mismatches,
+                ties,
+            )
+            checked += 1
+    names = {row["canonical_name"] for row in plants} | {row["english_name"] for row in plants}
+    for name in sorted(name for name in names if name):
+        _compare(
+            f"get_states_by_weed({name!r})",
+            sql_species.get_states_by_weed(name),
+            matrix_species.get_states_by_weed(name),
+            mismatches,
+            ties,
+        )
+        checked += 1
+
+    geo_region_ids = list(sql_state._geo_region_index())
+    for toggles in TOGGLES:
+        expected = sql_state.get_weeds_for_geo_regions(geo_region_ids, *toggles)
+        actual = matrix_state.get_weeds_for_geo_regions(geo_region_ids, *toggles)
+        for geo_region_id in geo_region_ids:
+            _compare(
+                f"get_weeds_for_geo_regions({geo_region_id!r}, {toggles})",
+                expected.get(geo_region_id),
+                actual.get(geo_region_id),
+                mismatches,
+                ties,
+            )
+            checked += 1
+
+    print(f"Checked {checked} lookups: {len(mismatches)} mismatches, {len(ties)} differ only in tie order.")
+    for label in mismatches[:args.show]:
+        print(f"  mismatch: {label}")
+    for label in ties[:args.show]:
+        print(f"  tie order: {label}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+import argparse
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.utils.release_install import install_release
+from app.utils.species_database import SpeciesDatabase
+from app.utils.species_search_index import SharedSpeciesSearchIndex
+from app.utils.species_suggest_index import SharedSpeciesSuggestIndex
+
+DEFAULT_DB = os.path.join(PROJECT_ROOT, "app", "static", "data", "sample", "weeds_sample.db")
+DEFAULT_GEOJSON_DIR = os.path.join(PROJECT_ROOT, "app", "static", "data", "sample", "geojson")
+
+
+class _WarmingSuggestIndex:
+    """A suggest index holder whose background build has not finished."""
+
+    def get(self, conn):
+        return None
+
+
+def _queries(db):
+    """First letters and first words of every regulated plant's names."""
+    conn = db.get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT english_name, canonical_name FROM plants WHERE has_current_regulation = 1"
+        ).fetchall()
+    finally:
+        conn.close()
+    queries = set()
+    for row in rows:
+        for value in (row["english_name"], row["canonical_name"]):
+            text = (value or "").strip().lower()
+            if text:
+                queries.update((text[:1], text[:3], text.split()[0]))
+    return sorted(queries)
+
+
+def _check_picker(label, db, queries):
+    """What the species picker does: suggest, then states by species_id or usage_key."""
+    failures = []
+    for query in queries:
+        suggestions = db.suggest_species(query, limit=10)
+        if not suggestions:
+            failures.append(f"{label}: no suggestions for {query!r}")
+            continue
+        for suggestion in suggestions:
+            if suggestion.get("species_id"):
+                states = db.get_states_by_species_id(suggestion["species_id"])
+            elif suggestion.get("usage_key") is not None:
+                states = db.get_states_by_usage_key(suggestion["usage_key"])
+            else:
+                failures.append(f"{label}: suggestion for {query!r} has neither species_id nor usage_key")
+                continue
+            if not states:
+                failures.append(f"{label}: no regulations for {suggestion.get('canonical_name')!r}")
+    return failures
+
+
+def _check_database(label, db_path, geojson_dir):
+    failures = []
+    plain = SpeciesDatabase(db_path, geojson_dir=geojson_dir)
+    queries = _queries(plain)
+    if not queries:
+        return [f"{label}: no regulated plants"]
+
+    for backend in ("like", "fts5", "trigram"):
+        db = SpeciesDatabase(
+            db_path,
+            geojson_dir=geojson_dir,
+            search_backend=backend,
+            search_index=SharedSpeciesSearchIndex() if backend == "trigram" else None,
+        )
+        for query in queries:
+            if not db.search_weeds(query):
+                failures.append(f"{label} ({backend}): no search results for {query!r}")
+
+    for state, suggest_index in (
+        ("no suggest index", None),
+        ("suggest index warming", _WarmingSuggestIndex()),
+        ("suggest index", SharedSpeciesSuggestIndex()),
+    ):
+        db = SpeciesDatabase(db_path, geojson_dir=geojson_dir, suggest_index=suggest_index)
+        failures.extend(_check_picker(f"{label} ({state})", db, queries))
+
+    print(f"{label}: {len(queries)} queries checked.")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check species search and the species picker against the sample release schema."
+    )
+    parser.add_argument("--db", default=DEFAULT_DB, help="Release database (default: the tracked sample).")
+    parser.add_argument("--geojson-dir", default=DEFAULT_GEOJSON_DIR)
+    args = parser.parse_args()
+
+    failures = _check_database("release file", args.db, args.geojson_dir)
+    with tempfile.TemporaryDirectory() as work_dir:
+        installed_path = os.path.join(work_dir, "weeds.db")
+        install_release(args.db, installed_path, args.geojson_dir)
+        failures.extend(_check_database("installed copy", installed_path, args.geojson_dir))
+
+    for failure in failures:
+        print(f"  {failure}")
+    print("FAILED" if failures else "PASSED")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+import argparse
+import os
+import random
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.utils.species_database import SpeciesDatabase
+from app.utils.species_search_index import SharedSpeciesSearchIndex
+
+
+def _queries(plants, rng, sample):
+    """What people type: prefixes of names, pieces of names and synonyms, stray letter pairs."""
+    queries = set()
+    for row in rng.sample(plants, min(sample, len(plants))):
+        for value in (row["english_name"], row["canonical_name"], row["synonyms"]):
+            text = (value or "").strip().lower()
+            if not text:
+                continue
+            for length in (1, 2, 3, 5, 8):
+                queries.add(text[:length])
+            queries.add(text)
+            start = rng.randrange(len(text))
+            for length in (2, 3, 4, 7):
+                queries.add(text[start : start + length])
+    letters = "abcdefghijklmnopqrstuvwxyz "
+    for _ in range(200):
+        queries.add(rng.choice(letters) + rng.choice(letters))
+    queries.update(("zzzq", "x", "é", "a%b", "a_b"))
+    return sorted(query for query in queries if query.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare indexed species search (SPECIES_SEARCH_BACKEND) with the LIKE reference."
+    )
+    parser.add_argument("--db", required=True, help="Installed release database (has_current_regulation).")
+    parser.add_argument("--sample", type=int, default=500, help="Plants to derive queries from.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--show", type=int, default=10, help="Mismatching queries to print.")
+    args = parser.parse_args()
+
+    reference = SpeciesDatabase(args.db)
+    indexed = SpeciesDatabase(args.db, search_index=SharedSpeciesSearchIndex())
+    if indexed._search_index() is None:
+        print("Release schema is not supported by the search index; LIKE serves every search.")
+        return 0
+
+    conn = reference.get_connection()
+    plants = conn.execute("SELECT english_name, canonical_name, synonyms FROM plants").fetchall()
+    queries = _queries(plants, random.Random(args.seed), args.sample)
+
+    mismatches = []
+    for query in queries:
+        if reference.search_weeds(query) != indexed.search_weeds(query):
+            mismatches.append(query)
+
+    print(f"Checked {len(queries)} queries: {len(mismatches)} mismatches.")
+    for query in mismatches[:args.show]:
+        print(f"  mismatch: {query!r}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,571 @@
+"""Write a production-sized synthetic release (weeds.db + geojson/) for benchmarks and load tests.
+
+The database follows the v1.1 release schema: the sample's plants/jurisdictions/
+regulations columns plus species_id, jurisdiction_uid, regulation_status and a
+geo_regions table, with the release's own indexes. Sizes are skewed the way real
+releases are: a few weeds are listed almost everywhere, national and EU lists are
+long, most regions list tens to hundreds of species, and some list none.
+
+Point the app at the output with
+    LOCAL_SAMPLE_DB_PATH=<output>/weeds.db LOCAL_SAMPLE_GEOJSON_DIR=<output>/geojson
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.utils.state_database import EU_MEMBERS
+
+# Names that survive the filename -> country round trip the app and map.js use
+# (united_kingdom.geojson -> "United Kingdom").
+COUNTRIES = sorted(EU_MEMBERS) + [
+    "United States", "Canada", "Mexico", "Brazil", "Argentina", "Chile", "Peru", "Colombia",
+    "Australia", "New Zealand", "South Africa", "Kenya", "Tanzania", "Ethiopia", "Nigeria",
+    "Morocco", "Egypt", "India", "China", "Japan", "Indonesia", "Philippines", "Vietnam",
+    "Thailand", "Malaysia", "Turkey", "Israel", "Norway", "Switzerland", "United Kingdom",
+    "Ukraine", "Kazakhstan", "Mongolia", "Pakistan", "Bangladesh", "Uruguay", "Paraguay",
+    "Bolivia", "Ecuador", "Venezuela", "Cuba", "Jamaica", "Iceland", "Georgia", "Armenia",
+]
+
+FAMILY_STEMS = (
+    "Aster", "Poa", "Fab", "Ros", "Lami", "Brassic", "Solan", "Api", "Cyper", "Euphorbi",
+    "Malv", "Polygon", "Amaranth", "Convolvul", "Boragin", "Caryophyll", "Ranuncul", "Scrophulari",
+    "Onagr", "Myrt", "Anacardi", "Simaroub", "Bignoni", "Verben", "Hydrocharit", "Pontederi",
+    "Halorag", "Salvini", "Zygophyll", "Tamaric", "Elaeagn", "Berberid", "Caprifoli", "Ole",
+)
+GENUS_SYLLABLES = (
+    "ac", "ae", "al", "am", "an", "ar", "bra", "cal", "car", "cen", "chon", "cir", "cy", "dra",
+    "el", "eu", "gal", "hed", "hel", "hy", "lan", "lyth", "mi", "my", "nar", "nas", "phal",
+    "phrag", "po", "ru", "sal", "sen", "so", "tam", "tri", "ul", "ver", "xan",
+)
+GENUS_ENDINGS = ("a", "ia", "um", "us", "is", "on", "ium", "ella", "ops", "anthus", "ago", "ex")
+EPITHETS = (
+    "vulgare", "arvensis", "officinalis", "repens", "japonica", "maculosa", "altissima",
+    "aquatica", "spinosa", "palustris", "montana", "europaeus", "canadensis", "crassipes",
+    "molesta", "pratense", "sylvestris", "rigidum", "virgatum", "hirsuta", "nigrum", "album",
+    "tinctoria", "fallopia", "glandulosa", "radicans", "serotina", "rubiginosa", "lanceolata",
+    "salicaria", "spicatum", "verticillata", "dulcamara", "cathartica", "aculeata", "procera",
+)
+INFRA_RANKS = ("", "", "", " subsp.", " var.", " f.")
+COMMON_ADJECTIVES = (
+    "Spotted", "Diffuse", "Common", "Giant", "Creeping", "Japanese", "Canada", "Yellow",
+    "Purple", "Water", "Field", "Hairy", "Prickly", "Russian", "Scotch", "Tree", "Marsh",
+    "Sweet", "Wild", "Dwarf", "Silverleaf", "Tall", "Leafy", "Cape", "Mile-a-minute",
+)
+COMMON_NOUNS = (
+    "Knapweed", "Thistle", "Loosestrife", "Knotweed", "Hogweed", "Ivy", "Broom", "Gorse",
+    "Hyacinth", "Milfoil", "Spurge", "Toadflax", "Nightshade", "Bindweed", "Dock", "Tansy",
+    "Ragwort", "Starthistle", "Barberry", "Privet", "Buckthorn", "Olive", "Bamboo", "Grass",
+    "Sedge", "Rush", "Vine", "Mallow", "Mustard", "Cress",
+)
+PLACE_PARTS = (
+    ("Nor", "Sou", "Kes", "Al", "Bran", "Cor", "Dun", "El", "Fair", "Glen", "Har", "Ivers",
+     "Kil", "Lang", "Mar", "Ost", "Pen", "Ros", "Sil", "Tor", "Val", "West", "Wick", "Ash"),
+    ("vale", "moor", "field", "ford", "mere", "wood", "land", "shire", "burg", "dale",
+     "haven", "mouth", "ridge", "stead", "water", "holm", "wick", "ton", "brook", "cliff"),
+)
+CLASSIFICATIONS = (
+    "Noxious weed", "Prohibited", "Restricted", "Class A", "Class B", "Class C", "Quarantine",
+    "Watch list", "Regulated non-quarantine pest", "Declared pest", "Environmental weed",
+)
+EU_CLASSIFICATIONS = ("Union concern", "Union concern (widely spread)")
+NOTES = ("", "", "", "", "", "Seeds only", "Except sterile cultivars", "Aquatic forms only", "Sale prohibited")
+LIFEFORMS = ("herb", "grass", "shrub", "tree", "vine", "aquatic herb", "shrub, tree")
+LIFESPANS = ("annual", "biennial", "perennial", "pluriennial")
+
+
+def slugify(value: str) -> str:
+    """Same slug as StateDatabase._slugify, so ids match what the app derives from GeoJSON."""
+    text = re.sub(r"[^a-z0-9]+", "-", str(value or "").strip().lower())
+    return text.strip("-")
+
+
+def _genus_names(rng, count):
+    names = set()
+    while len(names) < count:
+        stem = "".join(rng.choice(GENUS_SYLLABLES) for _ in range(rng.randint(1, 3)))
+        names.add((stem + rng.choice(GENUS_ENDINGS)).capitalize())
+    return sorted(names)
+
+
+def _common_names(rng):
+    names = []
+    for _ in range(rng.choice((1, 1, 2, 2, 3, 4, 6))):
+        name = f"{rng.choice(COMMON_ADJECTIVES)} {rng.choice(COMMON_NOUNS)}"
+        if name not in names:
+            names.append(name)
+    return ", ".join(names)
+
+
+def _synonyms(rng, genus, epithet, genera):
+    # Long tail: most taxa have a handful of synonyms, a few have dozens.
+    count = min(60, int(rng.paretovariate(1.3)) - 1) if rng.random() < 0.85 else 0
+    synonyms = []
+    for _ in range(count):
+        other_genus = genus if rng.random() < 0.6 else rng.choice(genera)
+        base = f"{other_genus} {rng.choice(EPITHETS) if rng.random() < 0.5 else epithet}"
+        rank = rng.choice(INFRA_RANKS)
+        synonyms.append(f"{base}{rank} {rng.choice(EPITHETS)}" if rank or rng.random() < 0.3 else base)
+    return ", ".join(dict.fromkeys(synonyms))
+
+
+def _place_names(rng, count):
+    names = []
+    seen = set()
+    for combo in itertools.count():
+        if len(names) >= count:
+            return names
+        name = f"{rng.choice(PLACE_PARTS[0])}{rng.choice(PLACE_PARTS[1])}"
+        if name in seen:
+            name = f"{name} {combo}"
+        seen.add(name)
+        names.append(name)
+
+
+def _polygon(rng, center_lon, center_lat, radius, vertices):
+    ring = []
+    for step in range(vertices):
+        angle = 2 * math.pi * step / vertices
+        r = radius * rng.uniform(0.75, 1.0)
+        ring.append([round(center_lon + r * math.cos(angle), 5), round(center_lat + r * math.sin(angle), 5)])
+    ring.append(ring[0])
+    return [ring]
+
+
+def _create_schema(conn):
+    conn.executescript(
+        """
+        CREATE TABLE plants (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            species_id TEXT,
+            gbif_usage_key INTEGER NOT NULL,
+            canonical_name TEXT NOT NULL,
+            traits_species_name TEXT,
+            family_name TEXT,
+            taxon_level TEXT,
+            genus_i TEXT,
+            english_name TEXT,
+            synonyms TEXT,
+            is_aquatic INTEGER,
+            aquatic_type TEXT,
+            lifeform_final TEXT,
+            woodiness_final TEXT,
+            lifespan_final TEXT,
+            habitat_final TEXT,
+            terrestrial INTEGER,
+            freshwater INTEGER,
+            marine INTEGER,
+            traits_present INTEGER NOT NULL DEFAULT 0,
+            trait_payload_json TEXT,
+            has_current_regulation INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE jurisdictions (
+            id INTEGER PRIMARY KEY,
+            jurisdiction_uid TEXT,
+            country TEXT NOT NULL,
+            region TEXT,
+            jurisdiction_type TEXT NOT NULL,
+            jurisdiction_group TEXT,
+            boundary_level TEXT NOT NULL,
+            geojson_required INTEGER NOT NULL,
+            geojson_slug TEXT,
+            geojson_status TEXT NOT NULL,
+            geojson_notes TEXT,
+            authority_name TEXT,
+            authority_type TEXT,
+            source_url TEXT,
+            last_updated TEXT,
+            last_updated_year INTEGER,
+            source_notes TEXT,
+            methodology_notes TEXT,
+            regulation_status TEXT,
+            UNIQUE(country, region, jurisdiction_type, jurisdiction_group)
+        );
+        CREATE TABLE regulations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plant_id INTEGER NOT NULL,
+            jurisdiction_id INTEGER NOT NULL,
+            pref_name_snapshot TEXT,
+            classification TEXT,
+            note TEXT,
+            is_webapp_scoped INTEGER NOT NULL,
+            source_file TEXT,
+            source_row INTEGER,
+            condition_fingerprint TEXT NOT NULL,
+            UNIQUE(plant_id, jurisdiction_id, condition_fingerprint),
+            FOREIGN KEY (plant_id) REFERENCES plants(id),
+            FOREIGN KEY (jurisdiction_id) REFERENCES jurisdictions(id)
+        );
+        CREATE TABLE regions_country (
+            country TEXT NOT NULL,
+            region TEXT NOT NULL,
+            PRIMARY KEY (country, region)
+        );
+        CREATE TABLE geo_regions (
+            geo_region_id TEXT PRIMARY KEY,
+            geojson_slug TEXT,
+            country TEXT,
+            region TEXT,
+            jurisdiction_uid TEXT
+        );
+        """
+    )
+
+
+def _create_indexes(conn):
+    conn.executescript(
+        """
+        CREATE INDEX idx_plants_gbif ON plants(gbif_usage_key);
+        CREATE INDEX idx_plants_reg_flag ON plants(has_current_regulation);
+        CREATE INDEX idx_jurisdictions_country ON jurisdictions(country);
+        CREATE INDEX idx_regulations_plant ON regulations(plant_id);
+        CREATE INDEX idx_regulations_jurisdiction ON regulations(jurisdiction_id);
+        CREATE INDEX idx_regulations_webapp_scoped ON regulations(is_webapp_scoped);
+        CREATE INDEX idx_regions_country_country ON regions_country(country);
+        """
+    )
+
+
+def _insert_plants(conn, rng, plants):
+    genera = _genus_names(rng, max(1, plants // 8))
+    families = [f"{stem}aceae" for stem in FAMILY_STEMS]
+    genus_family = {genus: rng.choice(families) for genus in genera}
+    seen_names = set()
+
+    def rows():
+        for index in range(1, plants + 1):
+            genus = rng.choice(genera)
+            epithet = rng.choice(EPITHETS)
+            genus_level = rng.random() < 0.03
+            name = genus if genus_level else f"{genus} {epithet}"
+            if name in seen_names:
+                name = f"{name} {rng.choice(EPITHETS)}" if genus_level else f"{genus} {epithet}{index}"
+            seen_names.add(name)
+            # GBIF keys are not unique across releases; about 1% collide.
+            usage_key = 2_000_000 + (index if rng.random() > 0.01 else rng.randint(1, index))
+            aquatic = rng.random() < 0.08
+            yield (
+                f"sp{index:07d}",
+                usage_key,
+                name,
+                None if genus_level else name,
+                genus_family[genus],
+                "genus" if genus_level else "species",
+                genus,
+                _common_names(rng) if rng.random() < 0.75 else "",
+                _synonyms(rng, genus, epithet, genera),
+                int(aquatic),
+                "submerged" if aquatic else "",
+                rng.choice(LIFEFORMS),
+                rng.choice(("W", "H", "")),
+                rng.choice(LIFESPANS),
+                "aquatic" if aquatic else "terrestrial",
+                int(not aquatic),
+                int(aquatic),
+                0,
+                1,
+                json.dumps({"gbif_match_type": "EXACT", "gbif_match_name": name}),
+            )
+
+    conn.executemany(
+        """
+        INSERT INTO plants (
+            species_id, gbif_usage_key, canonical_name, traits_species_name, family_name, taxon_level,
+            genus_i, english_name, synonyms, is_aquatic, aquatic_type, lifeform_final, woodiness_final,
+            lifespan_final, habitat_final, terrestrial, freshwater, marine, traits_present, trait_payload_json
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows(),
+    )
+
+
+def _plan_jurisdictions(rng, countries, jurisdictions):
+    """One national jurisdiction per country, the EU, and regions spread Zipf-like across countries."""
+    planned = []
+    for country in countries:
+        planned.append({"country": country, "region": None, "type": "national", "group": ""})
+    planned.append({"country": "European Union", "region": None, "type": "international", "group": "EU"})
+
+    region_total = max(0, jurisdictions - len(planned))
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(countries))]
+    per_country = [0] * len(countries)
+    for index in rng.choices(range(len(countries)), weights=weights, k=region_total):
+        per_country[index] += 1
+    for country, count in zip(countries, per_country):
+        for region in _place_names(rng, count):
+            planned.append({"country": country, "region": region, "type": "region", "group": ""})
+    return planned
+
+
+def _insert_jurisdictions(conn, rng, planned):
+    rows = []
+    for jurisdiction_id, item in enumerate(planned, start=1):
+        country, region, j_type = item["country"], item["region"], item["type"]
+        uid = f"{j_type}:{slugify(country)}:{slugify(region) if region else 'country'}"
+        # Some releases carry uids with stray case/whitespace; install normalizes them.
+        if rng.random() < 0.02:
+            uid = f" {uid.upper()} "
+        item["id"] = jurisdiction_id
+        item["uid"] = uid
+        item["status"] = "no_regulation" if j_type == "region" and rng.random() < 0.05 else "regulated"
+        year = rng.randint(2005, 2025)
+        rows.append(
+            (
+                jurisdiction_id,
+                uid,
+                country,
+                region,
+                j_type,
+                item["group"],
+                {"national": "country", "international": "supranational"}.get(j_type, "state_province"),
+                int(j_type == "region"),
+                country.lower().replace(" ", "_") if j_type != "international" else None,
+                "ready",
+                "",
+                f"{region or country} Department of Agriculture",
+                "State Gov" if j_type == "region" else "National Gov",
+                f"https://example.org/{slugify(country)}/{slugify(region or 'national')}",
+                f"01/0{rng.randint(1, 9)}/{year}",
+                year,
+                "",
+                "",
+                item["status"],
+            )
+        )
+    conn.executemany(
+        """
+        INSERT INTO jurisdictions (
+            id, jurisdiction_uid, country, region, jurisdiction_type, jurisdiction_group, boundary_level,
+            geojson_required, geojson_slug, geojson_status, geojson_notes, authority_name, authority_type,
+            source_url, last_updated, last_updated_year, source_notes, methodology_notes, regulation_status
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.executemany(
+        "INSERT INTO regions_country (country, region) VALUES (?, ?)",
+        [(item["country"], item["region"]) for item in planned if item["type"] == "region"],
+    )
+
+
+def _insert_regulations(conn, rng, planned, plants, regulations, scoped_fraction):
+    # Plant popularity: a few weeds are listed nearly everywhere.
+    plant_order = list(range(1, plants + 1))
+    rng.shuffle(plant_order)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.7 for rank in range(plants)))
+
+    weights = []
+    for item in planned:
+        if item["status"] == "no_regulation":
+            weights.append(0.0)
+        elif item["type"] == "international":
+            weights.append(40.0)
+        elif item["type"] == "national":
+            weights.append(rng.uniform(5.0, 30.0))
+        else:
+            weights.append(min(50.0, rng.paretovariate(1.1)))
+    total_weight = sum(weights) or 1.0
+    cap = max(1, plants // 2)
+
+    source_row = itertools.count(1)
+
+    def rows():
+        for item, weight in zip(planned, weights):
+            size = min(cap, int(round(regulations * weight / total_weight)))
+            if not size:
+                continue
+            chosen = set()
+            while len(chosen) < size:
+                for rank in rng.choices(range(plants), cum_weights=cum_weights, k=size - len(chosen)):
+                    chosen.add(plant_order[rank])
+            classifications = EU_CLASSIFICATIONS if item["type"] == "international" else CLASSIFICATIONS
+            source_file = f"{slugify(item['country'])}_{slugify(item['region'] or item['type'])}.csv"
+            for plant_id in chosen:
+                # A few listings repeat a plant under another condition.
+                for _ in range(2 if rng.random() < 0.02 else 1):
+                    classification = rng.choice(classifications)
+                    note = rng.choice(NOTES)
+                    fingerprint = hashlib.sha256(
+                        f"{plant_id}|{item['id']}|{classification}|{note}".encode()
+                    ).hexdigest()
+                    yield (
+                        plant_id,
+                        item["id"],
+                        classification,
+                        note,
+                        int(rng.random() < scoped_fraction),
+                        source_file,
+                        next(source_row),
+                        fingerprint,
+                    )
+
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO regulations (
+            plant_id, jurisdiction_id, classification, note, is_webapp_scoped, source_file, source_row,
+            condition_fingerprint
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows(),
+    )
+    conn.execute(
+        """
+        UPDATE plants
+        SET has_current_regulation = 1
+        WHERE id IN (SELECT plant_id FROM regulations WHERE is_webapp_scoped = 1)
+        """
+    )
+    conn.execute(
+        """
+        UPDATE regulations
+        SET pref_name_snapshot = (SELECT canonical_name FROM plants WHERE plants.id = regulations.plant_id)
+        """
+    )
+
+
+def _write_geojson(conn, rng, planned, countries, geojson_dir, geojson_regions, vertices):
+    """GeoJSON files per country plus matching geo_regions rows; regions beyond the budget stay unmapped."""
+    regions = [item for item in planned if item["type"] == "region"]
+    mapped = rng.sample(regions, min(geojson_regions, len(regions)))
+    features_by_country = {country: [] for country in countries}
+    for item in mapped:
+        features_by_country[item["country"]].append((item["region"], item["uid"]))
+    # Extra budget becomes mapped areas without a regulating jurisdiction.
+    extra_names = _place_names(rng, max(0, geojson_regions - len(mapped)))
+    for name in extra_names:
+        features_by_country[rng.choice(countries)].append((f"{name} District", ""))
+
+    geo_rows = []
+    columns = math.ceil(math.sqrt(len(countries)))
+    for index, country in enumerate(countries):
+        features = features_by_country[country] or [(country, "")]
+        slug = country.lower().replace(" ", "_")
+        origin_lon = -170 + (index % columns) * (340 / columns)
+        origin_lat = -55 + (index // columns) * (110 / columns)
+        cells = math.ceil(math.sqrt(len(features)))
+        cell = (300 / columns) / cells
+        collection = {"type": "FeatureCollection", "features": []}
+        for position, (region, uid) in enumerate(features):
+            center_lon = origin_lon + (position % cells + 0.5) * cell
+            center_lat = origin_lat + (position // cells + 0.5) * cell * 0.3
+            collection["features"].append(
+                {
+                    "type": "Feature",
+                    "properties": {"name": region},
+                    "geometry": {"type": "Polygon", "coordinates": _polygon(rng, center_lon, center_lat, cell * 0.15, vertices)},
+                }
+            )
+            geo_rows.append((f"geo:{slug}:{slugify(region)}", slug, country, region, uid.strip().lower()))
+        with open(os.path.join(geojson_dir, f"{slug}.geojson"), "w", encoding="utf-8") as handle:
+            json.dump(collection, handle, separators=(",", ":"))
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO geo_regions (geo_region_id, geojson_slug, country, region, jurisdiction_uid) VALUES (?, ?, ?, ?, ?)",
+        geo_rows,
+    )
+    return len(geo_rows)
+
+
+def build_release(
+    output_dir: str,
+    plants: int = 100_000,
+    jurisdictions: int = 10_000,
+    regulations: int = 2_000_000,
+    geojson_regions: int = 3_000,
+    countries: int = 60,
+    vertices: int = 48,
+    scoped_fraction: float = 0.9,
+    seed: int = 1,
+):
+    """Write `output_dir/weeds.db` and `output_dir/geojson/`; returns (db_path, geojson_dir)."""
+    rng = random.Random(seed)
+    geojson_dir = os.path.join(output_dir, "geojson")
+    os.makedirs(geojson_dir, exist_ok=True)
+    for name in os.listdir(geojson_dir):
+        if name.lower().endswith(".geojson"):
+            os.remove(os.path.join(geojson_dir, name))
+    db_path = os.path.join(output_dir, "weeds.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    country_names = COUNTRIES[:max(1, countries)]
+    country_names += [f"Territory {index}" for index in range(1, countries - len(country_names) + 1)]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        _create_schema(conn)
+        _insert_plants(conn, rng, plants)
+        planned = _plan_jurisdictions(rng, country_names, jurisdictions)
+        _insert_jurisdictions(conn, rng, planned)
+        _insert_regulations(conn, rng, planned, plants, regulations, scoped_fraction)
+        _write_geojson(conn, rng, planned, country_names, geojson_dir, geojson_regions, vertices)
+        _create_indexes(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return db_path, geojson_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a production-sized synthetic release for benchmarks.")
+    parser.add_argument("--output", required=True, help="Directory for weeds.db and geojson/.")
+    parser.add_argument("--plants", type=int, default=100_000)
+    parser.add_argument("--jurisdictions", type=int, default=10_000)
+    parser.add_argument("--regulations", type=int, default=2_000_000, help="Approximate regulation rows.")
+    parser.add_argument("--geojson-regions", type=int, default=3_000, help="GeoJSON features across all countries.")
+    parser.add_argument("--countries", type=int, default=60)
+    parser.add_argument("--vertices", type=int, default=48, help="Points per region polygon (GeoJSON size).")
+    parser.add_argument("--scoped-fraction", type=float, default=0.9, help="Share of regulations in web-app scope.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing release in --output.")
+    args = parser.parse_args()
+
+    if os.path.exists(os.path.join(args.output, "weeds.db")) and not args.force:
+        print(f"{args.output} already has a weeds.db; pass --force to overwrite it.")
+        return 1
+
+    started = time.perf_counter()
+    db_path, geojson_dir = build_release(
+        args.output,
+        plants=args.plants,
+        jurisdictions=args.jurisdictions,
+        regulations=args.regulations,
+        geojson_regions=args.geojson_regions,
+        countries=args.countries,
+        vertices=args.vertices,
+        scoped_fraction=args.scoped_fraction,
+        seed=args.seed,
+    )
+
+    conn = sqlite3.connect(db_path)
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("plants", "jurisdictions", "regulations", "geo_regions")
+    }
+    conn.close()
+    geojson_bytes = sum(os.path.getsize(os.path.join(geojson_dir, name)) for name in os.listdir(geojson_dir))
+    print(f"Wrote {db_path} ({os.path.getsize(db_path) / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s")
+    print("  " + ", ".join(f"{count} {table}" for table, count in counts.items()))
+    print(f"  {len(os.listdir(geojson_dir))} GeoJSON files in {geojson_dir} ({geojson_bytes / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
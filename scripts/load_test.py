@@ -0,0 +1,368 @@
+"""HTTP load test for the public endpoints under gunicorn.
+
+Compiles the serving database for a local release (a synthetic one from
+generate_synthetic_release.py by default), starts `gunicorn "app:create_app()"`
+with N workers against it, then has C client threads replay a weighted mix of
+what browsers do: map bootstrap, layer toggles, region clicks, species search
+while typing, species detail and GeoJSON downloads. Reports throughput, latency
+percentiles and error rates per endpoint.
+
+gunicorn runs with the Procfile's settings (its default 30 s worker timeout)
+unless --worker-timeout is given, so a request that stalls a worker shows up as
+errors rather than latency. Releases without plants.species_id have no species
+pages, so search and species detail are dropped from the mix for them.
+
+Rate limits are switched off for the run (RATELIMIT_ENABLED=0): every request
+comes from one address here, unlike real traffic. GBIF photos are not part of
+the mix, since they call GBIF.
+"""
+
+import argparse
+import json
+import os
+import random
+import signal
+import sqlite3
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.config import Config
+
+# Relative weight of each user action.
+DEFAULT_MIX = {
+    "map_bootstrap": 5,
+    "toggle": 15,
+    "region_click": 30,
+    "search_typing": 25,
+    "species_detail": 15,
+    "geojson": 10,
+}
+TOGGLE_PARAMS = ("includeRegion", "includeNational", "includeInternational")
+# Actions that need plants.species_id in the release.
+SPECIES_ACTIONS = ("search_typing", "species_detail")
+
+
+class Recorder:
+    """Latencies and statuses per endpoint, shared by the client threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def add(self, endpoint, elapsed_ms, status):
+        with self.lock:
+            self.latencies[endpoint].append(elapsed_ms)
+            self.statuses[endpoint][status] += 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors[endpoint] += 1
+
+    def summary(self, duration_s):
+        endpoints = {}
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            count = len(values)
+            endpoints[endpoint] = {
+                "requests": count,
+                "rps": round(count / duration_s, 2),
+                "p50_ms": round(statistics.median(values), 1),
+                "p90_ms": round(_percentile(values, 0.90), 1),
+                "p99_ms": round(_percentile(values, 0.99), 1),
+                "max_ms": round(values[-1], 1),
+                "error_rate": round(self.errors[endpoint] / count, 4),
+                "statuses": {str(status): n for status, n in sorted(self.statuses[endpoint].items(), key=str)},
+            }
+        total = sum(item["requests"] for item in endpoints.values())
+        errors = sum(self.errors.values())
+        all_values = sorted(value for values in self.latencies.values() for value in values)
+        return {
+            "duration_s": round(duration_s, 1),
+            "requests": total,
+            "rps": round(total / duration_s, 2) if duration_s else 0,
+            "error_rate": round(errors / total, 4) if total else 0,
+            "p50_ms": round(statistics.median(all_values), 1) if all_values else None,
+            "p99_ms": round(_percentile(all_values, 0.99), 1) if all_values else None,
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class Client:
+    """One simulated browser: a session replaying actions from the mix."""
+
+    def __init__(self, base_url, inputs, recorder, rng, timeout):
+        self.base_url = base_url
+        self.inputs = inputs
+        self.recorder = recorder
+        self.rng = rng
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, endpoint, path, params=None):
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            response.content
+            status = response.status_code
+        except requests.RequestException as exc:
+            status = type(exc).__name__
+        self.recorder.add(endpoint, (time.perf_counter() - started) * 1000, status)
+
+    def _toggles(self):
+        return {name: self.rng.choice(("true", "false")) for name in TOGGLE_PARAMS}
+
+    def map_bootstrap(self):
+        self.get("page:/", "/")
+        self.get("/api/region-weed-counts", "/api/region-weed-counts")
+        self.get("/api/countries-with-data", "/api/countries-with-data")
+        self.get("/api/home-highlights", "/api/home-highlights")
+        self.get("/api/geojson-files", "/api/geojson-files")
+
+    def toggle(self):
+        self.get("/api/region-weed-counts", "/api/region-weed-counts", self._toggles())
+
+    def region_click(self):
+        params = self._toggles()
+        params["geo_region_id"] = self.rng.choice(self.inputs["geo_region_ids"])
+        self.get("/api/region", "/api/region", params)
+
+    def search_typing(self):
+        # The species picker asks for suggestions per keystroke once two characters are typed.
+        name = self.rng.choice(self.inputs["names"])
+        for length in range(2, min(len(name), 8) + 1):
+            self.get("/species/api/suggest", "/species/api/suggest", {"q": name[:length]})
+
+    def species_detail(self):
+        species_id = self.rng.choice(self.inputs["species_ids"])
+        self.get("/species/api/by-species-id", f"/species/api/by-species-id/{species_id}")
+        self.get("/species/api/weed-states/by-species-id", f"/species/api/weed-states/by-species-id/{species_id}")
+
+    def geojson(self):
+        filename = self.rng.choice(self.inputs["geojson_files"])
+        self.get("/data/geojson", f"/data/geojson/{filename}")
+
+
+def _run_clients(base_url, inputs, mix, concurrency, duration_s, seed, timeout, think_ms):
+    recorder = Recorder()
+    actions, weights = zip(*[(name, weight) for name, weight in mix.items() if weight > 0])
+    deadline = time.monotonic() + duration_s
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        client = Client(base_url, inputs, recorder, rng, timeout)
+        while time.monotonic() < deadline:
+            getattr(client, rng.choices(actions, weights=weights)[0])()
+            if think_ms:
+                time.sleep(rng.expovariate(1000 / think_ms))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.summary(time.monotonic() - started)
+
+
+def _release_paths(data_dir):
+    if data_dir == "sample":
+        return (
+            os.path.join(PROJECT_ROOT, Config.LOCAL_SAMPLE_DB_PATH),
+            os.path.join(PROJECT_ROOT, Config.LOCAL_SAMPLE_GEOJSON_DIR),
+        )
+    return os.path.abspath(os.path.join(data_dir, "weeds.db")), os.path.abspath(os.path.join(data_dir, "geojson"))
+
+
+def _species_inputs(db_path, limit=2000):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(plants)")}
+        if "species_id" not in columns:
+            return {"species_ids": [], "names": []}
+        rows = conn.execute(
+            """
+            SELECT species_id, canonical_name, english_name
+            FROM plants
+            WHERE has_current_regulation = 1
+            ORDER BY RANDOM()
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+    finally:
+        conn.close()
+    names = []
+    for _, canonical_name, english_name in rows:
+        names.append(canonical_name.lower())
+        if english_name and english_name.strip():
+            names.append(english_name.split(",")[0].strip().lower())
+    return {"species_ids": [row[0] for row in rows if row[0]], "names": names}
+
+
+def _wait_until_ready(base_url, timeout_s, process=None):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if requests.get(base_url + "/api/countries-with-data", timeout=5).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{base_url} did not become ready within {timeout_s}s")
+
+
+def _parse_mix(value):
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (value or "").split(",")):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown action {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def _print_summary(title, summary):
+    print(f"\n{title}: {summary['requests']} requests in {summary['duration_s']}s, "
+          f"{summary['rps']} req/s, errors {summary['error_rate']:.2%}, "
+          f"p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms")
+    print(f"  {'endpoint':42} {'req':>7} {'req/s':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'err':>7}")
+    for endpoint, item in summary["endpoints"].items():
+        print(
+            f"  {endpoint:42} {item['requests']:7} {item['rps']:8.1f} {item['p50_ms']:8.1f} {item['p90_ms']:8.1f}"
+            f" {item['p99_ms']:8.1f} {item['max_ms']:8.1f} {item['error_rate']:7.2%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the public endpoints under gunicorn.")
+    parser.add_argument("--data-dir", default="data_synthetic", help="Release with weeds.db and geojson/, or 'sample'.")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Simulated browsers.")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds.")
+    parser.add_argument("--warmup", type=float, default=15, help="Unmeasured seconds first (per-worker builds).")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between actions (0 = closed loop).")
+    parser.add_argument("--mix", help="Override action weights, e.g. 'region_click=50,geojson=0'.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Test an already running server instead of starting gunicorn.")
+    parser.add_argument("--preload", action="store_true", help="Start gunicorn with --preload.")
+    parser.add_argument(
+        "--worker-timeout",
+        type=int,
+        help="gunicorn --timeout in seconds (default: gunicorn's own, as in the Procfile).",
+    )
+    parser.add_argument("--work-dir", default=os.path.join("data_cache", "load_test"), help="Serving DB and logs.")
+    parser.add_argument("--timeout", type=float, default=30, help="Client request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the measured summary as JSON.")
+    args = parser.parse_args()
+
+    db_path, geojson_dir = _release_paths(args.data_dir)
+    if not os.path.exists(db_path):
+        print(f"No release at {db_path}; generate one with scripts/generate_synthetic_release.py.")
+        return 1
+    mix = _parse_mix(args.mix)
+
+    process = None
+    log_handle = None
+    base_url = (args.url or f"http://127.0.0.1:{args.port}").rstrip("/")
+    if not args.url:
+        work_dir = os.path.abspath(args.work_dir)
+        os.makedirs(work_dir, exist_ok=True)
+        env = dict(
+            os.environ,
+            DATA_MODE="local_sample",
+            LOCAL_SAMPLE_DB_PATH=db_path,
+            LOCAL_SAMPLE_GEOJSON_DIR=geojson_dir,
+            DATA_CACHE_DIR=work_dir,
+            DATA_INSTALL_ENABLED="0",
+            RATELIMIT_ENABLED="0",
+            GBIF_PHOTOS_ENABLED="0",
+            OOZR_METRICS_ENABLED="0",
+        )
+        print("Compiling serving database ...")
+        subprocess.run(
+            [sys.executable, "-m", "flask", "--app", "main", "data", "compile"], cwd=PROJECT_ROOT, env=env, check=True
+        )
+        command = [
+            sys.executable, "-m", "gunicorn", "app:create_app()",
+            "--workers", str(args.workers),
+            "--bind", f"127.0.0.1:{args.port}",
+        ]
+        if args.worker_timeout is not None:
+            command += ["--timeout", str(args.worker_timeout)]
+        if args.preload:
+            command.append("--preload")
+        log_path = os.path.join(work_dir, "gunicorn.log")
+        log_handle = open(log_path, "w", encoding="utf-8")
+        print(f"Starting gunicorn with {args.workers} workers (log: {log_path}) ...")
+        process = subprocess.Popen(
+            command, cwd=PROJECT_ROOT, env=env, stdout=log_handle, stderr=subprocess.STDOUT, start_new_session=True
+        )
+
+    try:
+        started = time.monotonic()
+        _wait_until_ready(base_url, 300, process)
+        print(f"Ready after {time.monotonic() - started:.1f}s")
+
+        inputs = _species_inputs(db_path)
+        if not inputs["species_ids"]:
+            dropped = [action for action in SPECIES_ACTIONS if mix.get(action)]
+            if dropped:
+                print(f"Release has no regulated species with species_id; dropping {', '.join(dropped)} from the mix.")
+            for action in SPECIES_ACTIONS:
+                mix[action] = 0
+        counts = requests.get(base_url + "/api/region-weed-counts", timeout=args.timeout).json()
+        inputs["geo_region_ids"] = [row["geo_region_id"] for row in counts]
+        inputs["geojson_files"] = requests.get(base_url + "/api/geojson-files", timeout=args.timeout).json()
+        if not inputs["geo_region_ids"] or not inputs["geojson_files"]:
+            print("Release has no mapped regions or GeoJSON files to request.")
+            return 1
+
+        results = {"workers": args.workers, "concurrency": args.concurrency, "mix": mix, "data_dir": args.data_dir}
+        if args.warmup > 0:
+            warmup = _run_clients(
+                base_url, inputs, mix, args.concurrency, args.warmup, args.seed + 1, args.timeout, args.think_ms
+            )
+            _print_summary("Warm-up (not measured)", warmup)
+            results["warmup"] = warmup
+        measured = _run_clients(
+            base_url, inputs, mix, args.concurrency, args.duration, args.seed, args.timeout, args.think_ms
+        )
+        _print_summary("Measured", measured)
+        results["measured"] = measured
+    finally:
+        if process is not None:
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+        if log_handle is not None:
+            log_handle.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"\nWrote {args.output}")
+    return 1 if measured["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())